@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pygame
+
+from build_assets import MANIFEST_PATH
+from memory_budget import budget, surface_bytes
+from resource_pack import resources
+from utils import fit_size, resolution_key
+
+
+class AssetManager:
+    """Loads images through the build manifest, preferring pre-scaled variants"""
+
+    def __init__(self, resolution, manifest_path=MANIFEST_PATH):
+        self.resolution = resolution
+        # 예산 키: 한 프로세스에 Game이 여럿이어도 겹치지 않게 관리자마다 나눈다
+        self.budget_id = id(self)
+        # image -> 화면에 있는지 (Game이 정한다); 있으면 예산이 넘쳐도 비우지 않는다
+        self.in_use = lambda image: False
+        self.images = {}
+        self.loading = {}
+        try:
+            self.manifest = resources.load_json(manifest_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # 빌드 전 개발 환경: 원본 파일을 직접 읽는다
+            self.manifest = {"scaled": {}}
+        self.scaled = self.manifest.get("scaled", {}).get(resolution_key(resolution), {})
+
+    def _convert(self, image, alpha):
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+    def load_image(self, filename, alpha=True):
+        """Load an image, preferring the variant pre-scaled for this resolution"""
+        key = (filename, alpha)
+        image = self.images.get(key)
+        if image is None:
+            image = self._convert(resources.load_image(self.scaled.get(filename, filename)), alpha)
+            self.cache_image(key, image)
+        else:
+            budget.touch("surface", (self.budget_id, *key))
+        return image
+
+    async def load_image_async(self, filename, runtime, alpha=True):
+        """load_image with the file read and decode on the runtime's I/O executor"""
+        key = (filename, alpha)
+        image = self.images.get(key)
+        if image is not None:
+            budget.touch("surface", (self.budget_id, *key))
+            return image
+        # 미리 불러오기와 장면이 같은 파일을 동시에 요청하면 한 번만 읽고 변환한다
+        pending = self.loading.get(key)
+        if pending is None:
+            pending = self.loading[key] = asyncio.ensure_future(self.load_shared(key, runtime))
+        # 기다리던 쪽이 취소되어도 공유 작업은 끝까지 간다
+        return await asyncio.shield(pending)
+
+    async def load_shared(self, key, runtime):
+        filename, alpha = key
+        try:
+            image = await runtime.run_io("asset_load", resources.load_image, self.scaled.get(filename, filename))
+        finally:
+            self.loading.pop(key, None)
+        # convert()는 디스플레이가 있는 메인 스레드에서만
+        image = self._convert(image, alpha)
+        self.cache_image(key, image)
+        return image
+
+    def cache_image(self, key, image):
+        self.images[key] = image
+        budget.register("surface", (self.budget_id, *key), surface_bytes(image), lambda: self.drop(key))
+
+    def drop(self, key):
+        """Budget eviction; refused while the image is on stage"""
+        image = self.images.get(key)
+        if image is not None and self.in_use(image):
+            return False
+        self.images.pop(key, None)
+        return True
+
+    def load_background(self, filename):
+        image = self.load_image(filename, alpha=False)
+        if filename not in self.scaled:
+            # 빌드되지 않은 배경만 런타임에 한 번 스케일해서 캐시한다
+            size = fit_size(image.get_size(), *self.resolution)
+            if size != image.get_size():
+                image = pygame.transform.smoothscale(image, size)
+                self.cache_image((filename, False), image)
+        return image
+
+    def evict(self, filename):
+        for key in ((filename, True), (filename, False)):
+            self.images.pop(key, None)
+            budget.release("surface", (self.budget_id, *key))
+
+    def clear(self):
+        for key in self.images:
+            budget.release("surface", (self.budget_id, *key))
+        self.images.clear()
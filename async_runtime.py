@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+IO_WORKERS = 4
+
+
+class TaskStats:
+    """Per task name: runs, wall time, and time spent running on the loop thread"""
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, name, wall, busy, steps, max_step):
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = {"runs": 0, "wall": 0.0, "busy": 0.0, "steps": 0, "max_step": 0.0}
+        entry["runs"] += 1
+        entry["wall"] += wall
+        entry["busy"] += busy
+        entry["steps"] += steps
+        entry["max_step"] = max(entry["max_step"], max_step)
+
+    def report(self):
+        return {
+            name: {
+                "runs": entry["runs"],
+                "wall_ms": round(entry["wall"] * 1000, 3),
+                "busy_ms": round(entry["busy"] * 1000, 3),
+                "max_step_ms": round(entry["max_step"] * 1000, 3),
+            }
+            for name, entry in sorted(self.stats.items())
+        }
+
+
+class Timed:
+    """Awaitable wrapper that times every step of a coroutine on the loop thread.
+
+    A long step is a task blocking the frame; wall time includes its waits.
+    """
+
+    def __init__(self, name, coro, stats):
+        self.name = name
+        self.coro = coro
+        self.stats = stats
+
+    def __await__(self):
+        coro = self.coro
+        started = time.perf_counter()
+        busy = max_step = 0.0
+        steps = 0
+        value, error = None, None
+        try:
+            while True:
+                step_start = time.perf_counter()
+                try:
+                    if error is not None:
+                        yielded = coro.throw(error)
+                    else:
+                        yielded = coro.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    step = time.perf_counter() - step_start
+                    busy += step
+                    max_step = max(max_step, step)
+                    steps += 1
+                try:
+                    value, error = (yield yielded), None
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            self.stats.record(self.name, time.perf_counter() - started, busy, steps, max_step)
+
+
+class AsyncRuntime:
+    """Task spawning, executor-backed I/O and per-frame wakeups for Game.run_async"""
+
+    def __init__(self, workers=IO_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kvn-io")
+        self.stats = TaskStats()
+        self.tasks = set()
+        self.frame_waiters = []
+        # 게임 시간(프레임 dt의 합)과 그 시간에 깨울 sleep 타이머 힙
+        self.clock = 0.0
+        self.timers = []
+        self.timer_order = itertools.count()
+        # 실행기에서 도는 작업 수; 끝날 때마다 io_done으로 잠든 프레임 루프를 깨운다
+        self.io_pending = 0
+        self.io_done = asyncio.Event()
+
+    def spawn(self, name, coro):
+        task = asyncio.ensure_future(self.timed(name, coro))
+        self.tasks.add(task)
+        task.add_done_callback(self.task_done)
+        return task
+
+    def task_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            error = task.exception()
+            print(f"Error in task: {type(error).__name__}: {error}")
+
+    async def timed(self, name, coro):
+        return await Timed(name, coro, self.stats)
+
+    def run_io(self, name, function, *args):
+        """Run blocking I/O on the executor; returns an awaitable future.
+
+        Counted in io_pending from the call on, so an idle frame loop does not
+        fall asleep on the event queue while the job is in flight.
+        """
+        started = time.perf_counter()
+        self.io_pending += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+        def done(_):
+            self.io_pending -= 1
+            self.io_done.set()
+            self.stats.record(name, time.perf_counter() - started, 0.0, 1, 0.0)
+
+        future.add_done_callback(done)
+        return future
+
+    def next_frame(self):
+        """Future resolved after the current frame has been presented"""
+        future = asyncio.get_running_loop().create_future()
+        self.frame_waiters.append(future)
+        return future
+
+    def frame_done(self):
+        waiters, self.frame_waiters = self.frame_waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+    def sleep(self, seconds):
+        """Future resolved at the end of the frame where game time has advanced by seconds.
+
+        Unlike asyncio.sleep this follows the frame dts, so a replay with the
+        recorded dts wakes the task in the same frame.
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.timers, (self.clock + seconds, next(self.timer_order), future))
+        return future
+
+    def advance(self, dt):
+        self.clock += dt
+        while self.timers and self.timers[0][0] <= self.clock:
+            future = heapq.heappop(self.timers)[2]
+            if not future.done():
+                future.set_result(None)
+
+    def next_timer(self):
+        """Game time until the earliest sleep ends, or None"""
+        if not self.timers:
+            return None
+        return max(self.timers[0][0] - self.clock, 0.0)
+
+    def is_busy(self):
+        return bool(self.tasks)
+
+    async def shutdown(self):
+        for task in list(self.tasks):
+            task.cancel()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,391 @@
+"""Benchmarks on synthetic content, compared against a stored baseline.
+
+    python benchmark.py                      # run, write benchmark_results.json, compare
+    python benchmark.py --quick              # smaller inputs
+    python benchmark.py --save-baseline      # store this run as the baseline
+    python benchmark.py --only compile,map   # only cases whose name contains any of these are run
+
+Exits with 1 when a case is slower than the baseline by more than --tolerance.
+Baselines are per machine; store one before changing anything.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+RESULTS_PATH = "benchmark_results.json"
+BASELINE_PATH = "benchmark_baseline.json"
+TOLERANCE = 0.25
+
+SPEAKERS = ["유하람", "maria", "john", "선생님"]
+WORDS = ["오늘", "학교", "도서관", "비가", "온다", "같이", "가자", "정말", "hello", "world", "내일", "시험"]
+STATS = ["예술", "문학", "체육", "운", "눈치"]
+
+
+# ====================================================================
+# 합성 데이터 생성기
+# ====================================================================
+def sentence(rng, words=6):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate_story(scenes, lines, choices, seed=0):
+    """VnCompiler script: scenes x lines, every scene ending in a choice of choices options"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(scenes):
+        out.append(f"@scene_{i}:")
+        out.append(f"bg assets/image/background/bg_{i % 7}.png fade")
+        for j in range(lines):
+            kind = rng.random()
+            if kind < 0.7:
+                out.append(f"{rng.choice(SPEAKERS)}: {sentence(rng)} (voice_{i}_{j})")
+            elif kind < 0.85:
+                out.append(f"$: {sentence(rng)}")
+            else:
+                out.append(f"stat {rng.choice(STATS)} {rng.randint(1, 3)}")
+        out.append("choice:")
+        for k in range(choices):
+            target = rng.randrange(scenes)
+            if k % 2:
+                out.append(f"  {sentence(rng, 3)} ({rng.choice(STATS)} {rng.randint(1, 5)}) -> @scene_{target}:")
+            else:
+                out.append(f"  {sentence(rng, 3)} -> @scene_{target}:")
+    return "\n".join(out) + "\n"
+
+
+def generate_interpreter_script(scenes, lines, seed=0):
+    """Script in game_engine.VisualNovelInterpreter syntax"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(scenes):
+        out.append(f"@scene_{i}:")
+        out.append(f'var counter_{i} {i}')
+        for j in range(lines):
+            kind = rng.random()
+            if kind < 0.6:
+                out.append(f"maria: {sentence(rng)}")
+            elif kind < 0.8:
+                out.append(f"set counter_{i} counter_{i} + {rng.randint(1, 9)}")
+            else:
+                out.append(f"stat {rng.choice(['wisdom', 'charm', 'luck'])} {rng.randint(1, 3)}")
+        out.append(f'sound "scene_{i}.wav"')
+        out.append(f"goto @scene_{(i + 1) % scenes}")
+    out.append("end")
+    return "\n".join(out) + "\n"
+
+
+def generate_map(directory, width, height, structures, seed=0):
+    """Write map.json / map_data.json for a width x height map; returns their paths"""
+    rng = random.Random(seed)
+    map_data = {
+        "width": width,
+        "height": height,
+        "structures": [{"name": f"structure_{i}", "stats": [rng.choice(STATS), rng.randint(1, 10)]}
+                       for i in range(structures)],
+    }
+    tiles = [[3 if rng.random() < 0.08 else rng.randrange(3) for _ in range(width)] for _ in range(height)]
+    map_file = os.path.join(directory, "map.json")
+    tiles_file = os.path.join(directory, "map_data.json")
+    with open(map_file, 'w', encoding='utf-8') as f:
+        json.dump(map_data, f)
+    with open(tiles_file, 'w', encoding='utf-8') as f:
+        json.dump({"tiles": tiles}, f)
+    return map_file, tiles_file
+
+
+def generate_assets(directory, count, size=(400, 600), seed=0):
+    """count PNG character images of size; returns their paths"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256), 255))
+        pygame.draw.circle(surface, (255, 255, 255, 200), (size[0] // 2, size[1] // 3), size[0] // 4)
+        path = os.path.join(directory, f"asset_{i}.png")
+        pygame.image.save(surface, path)
+        paths.append(path)
+    return paths
+
+
+# ====================================================================
+# 측정
+# ====================================================================
+def measure(run, repeat, setup=None):
+    """Run run() repeat times (setup() before each, untimed); returns per-run seconds"""
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state) if setup else run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def timed(results, selected, name, run, repeat, params):
+    """Measure run() into results[name] unless --only leaves the case out"""
+    if selected(name):
+        results[name] = summarize(measure(run, repeat), params)
+
+
+def summarize(times, params):
+    return {
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "runs": len(times),
+        "params": params,
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def bench_compiler(size, repeat, selected=lambda name: True):
+    from vn_compiler import VnCompiler
+    from incremental import ScriptDocument
+    from search_index import SearchIndex
+
+    results = {}
+    params = {"scenes": size["scenes"], "lines": size["lines"], "choices": size["choices"]}
+    text = generate_story(**params)
+    compiler = VnCompiler(verbose=False)
+    timed(results, selected, "compile.full", lambda: compiler.compile(text), repeat, params)
+
+    document = ScriptDocument(text, compiler)
+    rng = random.Random(1)
+
+    def edit():
+        line = rng.randrange(1, len(document.lines) + 1)
+        document.apply_edit(line, 1, line, 1, "x")
+        document.apply_edit(line, 1, line, 2, "")
+
+    timed(results, selected, "compile.incremental_edit", edit, repeat * 20, params)
+
+    scenes = compiler.compile(text)
+    index = SearchIndex()
+    timed(results, selected, "search.index_file", lambda: index.update_file("story.txt", scenes), repeat, params)
+    queries = [sentence(rng, 2) for _ in range(20)]
+
+    def search():
+        for query in queries:
+            index.match_ids(query)
+
+    timed(results, selected, "search.query_x20", search, repeat, params)
+    return results
+
+
+def bench_interpreter(size, repeat, selected=lambda name: True):
+    with quiet():
+        from game_engine import VisualNovelInterpreter
+        interpreter = VisualNovelInterpreter()
+    params = {"scenes": size["scenes"], "lines": size["lines"]}
+    text = generate_interpreter_script(**params)
+
+    def run():
+        with quiet():
+            interpreter.run_script(text)
+
+    results = {}
+    timed(results, selected, "interpreter.run_script", run, repeat, params)
+    return results
+
+
+def bench_map(size, repeat, directory, selected=lambda name: True):
+    from main import Map, Player
+
+    params = {"width": size["map_width"], "height": size["map_height"], "structures": size["structures"]}
+    map_file, tiles_file = generate_map(directory, params["width"], params["height"], params["structures"])
+    with quiet():
+        tile_map = Map(random.Random(0), map_file, tiles_file)
+    player = Player(seed=0)
+    results = {}
+    timed(results, selected, "map.place_structure", tile_map.place_structure, repeat, params)
+    timed(results, selected, "map.get_grid", tile_map.get_grid, repeat, params)
+
+    rng = random.Random(2)
+    vectors = [rng.choice([[0, 1], [0, -1], [1, 0], [-1, 0]]) for _ in range(1000)]
+
+    def moves():
+        for vector in vectors:
+            tile_map.move(vector, player)
+
+    timed(results, selected, "map.move_x1000", moves, repeat, params)
+
+    goals = [(rng.randrange(params["width"]), rng.randrange(params["height"])) for _ in range(20)]
+
+    def paths():
+        for goal in goals:
+            tile_map.find_path(goal)
+
+    timed(results, selected, "map.find_path_x20", paths, repeat, params)
+
+    surface = pygame.Surface((1280, 720))
+
+    def cold_render():
+        tile_map.renderer.invalidate_all()
+        tile_map.render(surface)
+
+    timed(results, selected, "render.map_cold", cold_render, repeat, params)
+    timed(results, selected, "render.map_warm", lambda: tile_map.render(surface), repeat * 10, params)
+    return results
+
+
+def bench_render(size, repeat, directory, selected=lambda name: True):
+    with quiet():
+        import main
+        game = main.Game(seed=0)
+    paths = generate_assets(directory, size["assets"])
+    params = {"assets": size["assets"]}
+    results = {}
+
+    def load_all():
+        game.assets.clear()
+        for path in paths:
+            game.assets.load_image(path)
+
+    timed(results, selected, "assets.load_cold", load_all, repeat, params)
+
+    game.state = "VISUAL_NOVEL"
+    for i, path in enumerate(paths[:size["placed"]]):
+        game.run_dialogue_command({'command': 'place', 'args': [f"obj_{i}", path, str(i * 90), "100"]})
+    game.show_line("유하람", sentence(random.Random(3), 20))
+    game.dialog_box.finish_line()
+    placed = {"placed": len(game.placed_objects)}
+
+    def dialogue_frame():
+        game.render_dialogue()
+
+    def dialogue_invalidated():
+        game.stage.invalidate()
+        game.dialog_box.body.invalidate()
+        game.render_dialogue()
+
+    timed(results, selected, "render.dialogue_frame", dialogue_frame, repeat * 10, placed)
+    timed(results, selected, "render.dialogue_redraw", dialogue_invalidated, repeat * 10, placed)
+
+    game.state = "MAP"
+    timed(results, selected, "render.map_screen", game.render_map, repeat * 10, {})
+    return results
+
+
+# --only가 그룹을 건너뛸지 정할 때 쓰는 케이스 이름 (bench_* 함수와 맞춘다)
+COMPILE_CASES = ["compile.full", "compile.incremental_edit", "search.index_file", "search.query_x20"]
+INTERPRETER_CASES = ["interpreter.run_script"]
+MAP_CASES = ["map.place_structure", "map.get_grid", "map.move_x1000", "map.find_path_x20",
+             "render.map_cold", "render.map_warm"]
+RENDER_CASES = ["assets.load_cold", "render.dialogue_frame", "render.dialogue_redraw", "render.map_screen"]
+
+SIZES = {
+    "full": {"scenes": 500, "lines": 20, "choices": 3, "map_width": 256, "map_height": 256,
+             "structures": 200, "assets": 40, "placed": 8},
+    "quick": {"scenes": 50, "lines": 10, "choices": 2, "map_width": 64, "map_height": 64,
+              "structures": 20, "assets": 8, "placed": 4},
+}
+
+
+def run_all(quick=False, only=None):
+    size = SIZES["quick" if quick else "full"]
+
+    def selected(name):
+        return not only or any(word in name for word in only)
+
+    repeat = 3 if quick else 5
+    directory = tempfile.mkdtemp(prefix="kvn_bench_")
+    results = {}
+    try:
+        # 그룹마다 준비 비용이 크므로 (게임 생성, 맵 생성) 고른 케이스가 없으면 통째로 건너뛴다
+        groups = [
+            (COMPILE_CASES, lambda: bench_compiler(size, repeat, selected)),
+            (INTERPRETER_CASES, lambda: bench_interpreter(size, repeat, selected)),
+            (MAP_CASES, lambda: bench_map(size, repeat, directory, selected)),
+            (RENDER_CASES, lambda: bench_render(size, repeat, directory, selected)),
+        ]
+        for cases, run in groups:
+            if any(selected(case) for case in cases):
+                results.update(run())
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "size": "quick" if quick else "full",
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """Print current vs baseline min times; returns the names that regressed"""
+    if baseline["meta"].get("size") != current["meta"]["size"]:
+        print(f"Warning: baseline size '{baseline['meta'].get('size')}' differs from '{current['meta']['size']}'")
+    regressions = []
+    print(f"{'case':32} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:32} {'-':>12} {result['min_ms']:12.3f} {'new':>7}")
+            continue
+        ratio = result["min_ms"] / base["min_ms"] if base["min_ms"] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:32} {base['min_ms']:12.3f} {result['min_ms']:12.3f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the synthetic benchmark suite")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--only", help="comma-separated substrings of case names")
+    parser.add_argument("--out", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    pygame.init()
+    current = run_all(args.quick, args.only.split(",") if args.only else None)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        shutil.copyfile(args.out, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        for name, result in current["results"].items():
+            print(f"{name:32} {result['min_ms']:12.3f} ms")
+        print(f"No baseline at {args.baseline}; run with --save-baseline to store one")
+        return 0
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        print(f"FAILED: {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Offline asset build: pre-scales background and character art per resolution.
+
+    python build_assets.py [--force] [--strict]
+
+--strict fails the build when a script does not compile or a script or sprite
+references a missing file (see scene_deps.py for the scene dependency
+manifest written alongside).
+
+Outputs go to assets/build/ together with manifest.json, which assets.py reads at runtime.
+"""
+import json
+import os
+import sys
+
+import pygame
+
+import config
+from utils import fit_size, file_hash, resolution_key
+
+BUILD_DIR = "assets/build"
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+SCALED_DIRS = {
+    "background": "assets/image/background",
+    "character": "assets/image/character",
+}
+
+
+def list_images(directory):
+    """Images under directory, subfolders included (e.g. character/<name>/*.png)"""
+    return sorted(
+        os.path.join(root, name).replace(os.sep, "/")
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.lower().endswith((".png", ".jpg", ".jpeg", ".bmp"))
+    )
+
+
+def relative_name(filename, directory):
+    return os.path.relpath(filename, directory).replace(os.sep, "/")
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"hashes": {}, "scaled": {}}
+
+
+def load_source(filename):
+    try:
+        return pygame.image.load(filename)
+    except pygame.error as e:
+        print(f"Error loading image '{filename}': {e}")
+        return None
+
+
+def target_size(kind, image, resolution):
+    width, height = resolution
+    if kind == "background":
+        return fit_size(image.get_size(), width, height)
+    # 캐릭터는 디자인 해상도 대비 비율만큼 줄인다
+    scale = min(width / config.design_width, height / config.design_height)
+    return max(1, round(image.get_width() * scale)), max(1, round(image.get_height() * scale))
+
+
+def build_scaled(manifest, force=False):
+    # 지금 있는 원본만 다시 등록한다: 지운 원본의 항목은 남지 않는다
+    manifest["scaled"] = {}
+    for kind, directory in SCALED_DIRS.items():
+        for filename in list_images(directory):
+            digest = file_hash(filename)
+            outputs = {
+                resolution_key(resolution): os.path.join(
+                    BUILD_DIR, resolution_key(resolution), kind, relative_name(filename, directory)
+                ).replace(os.sep, "/")
+                for resolution in config.resolutions
+            }
+            if (not force and manifest["hashes"].get(filename) == digest
+                    and all(os.path.exists(out) for out in outputs.values())):
+                print(f"[skip] {filename}")
+                for key, out in outputs.items():
+                    manifest["scaled"].setdefault(key, {})[filename] = out
+                continue
+
+            image = load_source(filename)
+            if image is None:
+                continue
+            for resolution in config.resolutions:
+                key = resolution_key(resolution)
+                out = outputs[key]
+                os.makedirs(os.path.dirname(out), exist_ok=True)
+                pygame.image.save(pygame.transform.smoothscale(image, target_size(kind, image, resolution)), out)
+                manifest["scaled"].setdefault(key, {})[filename] = out
+            manifest["hashes"][filename] = digest
+            print(f"[scale] {filename}")
+
+
+def build(force=False):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    manifest = load_manifest()
+    build_scaled(manifest, force)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def build_dependencies():
+    """Scene dependency manifest; returns the missing references per scene and sprite"""
+    from scene_deps import build_manifest, missing_references, write_manifest
+    from story import Story
+
+    dependencies = build_manifest(Story())
+    write_manifest(dependencies)
+    missing = missing_references(dependencies)
+    for name, references in missing.items():
+        for reference in references:
+            print(f"[missing] {name}: {reference}")
+    return missing
+
+
+if __name__ == "__main__":
+    build(force="--force" in sys.argv[1:])
+    if build_dependencies() and "--strict" in sys.argv[1:]:
+        sys.exit(1)
@@ -0,0 +1,186 @@
+"""Script command registry: argument schemas checked when a script compiles, handlers looked up at run time.
+
+A project command registers its schema and handler without touching the lexer:
+
+    registry.register("shake", [Param("seconds", "float", default=0.5)], handler=shake)
+
+Handlers are called as handler(game, *args, transition=...) when the command
+declares transitions, otherwise handler(game, *args).
+"""
+import os
+
+from resource_pack import resources
+
+TRANSITIONS = ('fade', 'dissolve', 'slide_left', 'slide_right', 'zoom', 'move')
+
+# 경로 인자: 적힌 그대로 없으면 이 폴더들에서 찾는다
+SEARCH_DIRS = {
+    "image": ["assets/image/character", "assets/image"],
+    "background": ["assets/image/background", "assets/image"],
+    "audio": ["assets/audio/bgm", "assets/audio"],
+    "voice": ["assets/audio/voice"],
+}
+SEARCH_EXTENSIONS = {
+    "image": (".png", ".jpg"),
+    "background": (".png", ".jpg"),
+    "audio": (".ogg", ".wav", ".mp3"),
+    "voice": (".ogg", ".wav", ".mp3"),
+}
+REQUIRED = object()
+
+
+class CommandError(ValueError):
+    def __init__(self, message, severity="error"):
+        super().__init__(message)
+        self.severity = severity
+
+
+class Param:
+    """One command argument; a variadic last param takes the remaining args as a list"""
+
+    def __init__(self, name, kind="str", default=REQUIRED, variadic=False):
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.variadic = variadic
+
+    @property
+    def required(self):
+        return self.default is REQUIRED
+
+
+def resolve_path(kind, value):
+    """Normalized path for an asset argument; CommandError (warning) when nothing exists"""
+    path = os.path.normpath(value).replace(os.sep, "/")
+    if resources.exists(path):
+        return path
+    candidates = []
+    for directory in SEARCH_DIRS[kind]:
+        candidates.append(f"{directory}/{path}")
+        if not os.path.splitext(path)[1]:
+            candidates.extend(f"{directory}/{path}{extension}" for extension in SEARCH_EXTENSIONS[kind])
+    for candidate in candidates:
+        if resources.exists(candidate):
+            return candidate
+    raise CommandError(f"{kind} file not found: '{value}'", severity="warning")
+
+
+def coerce(param, value):
+    kind = param.kind
+    try:
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+    except (TypeError, ValueError):
+        raise CommandError(f"argument '{param.name}' must be {kind}, got '{value}'")
+    if kind in SEARCH_DIRS:
+        return resolve_path(kind, str(value))
+    if kind == "scene":
+        return "@" + str(value).strip("@:")
+    return str(value)
+
+
+class CommandSpec:
+    def __init__(self, name, params, transition=False, handler=None):
+        self.name = name
+        self.params = list(params)
+        self.transition = transition
+        self.handler = handler
+        self.variadic = bool(self.params) and self.params[-1].variadic
+        self.min_args = sum(1 for param in self.params if param.required and not param.variadic)
+        self.max_args = None if self.variadic else len(self.params)
+
+    def signature(self):
+        parts = [f"[{param.name}...]" if param.variadic else param.name if param.required else f"[{param.name}]"
+                 for param in self.params]
+        if self.transition:
+            parts.append("[transition]")
+        return " ".join([self.name] + parts)
+
+
+class CommandRegistry:
+    def __init__(self):
+        self.specs = {}
+
+    def register(self, name, params=(), transition=False, handler=None):
+        self.specs[name] = CommandSpec(name, params, transition, handler)
+        return self.specs[name]
+
+    def handler(self, name):
+        """Decorator binding a handler to an already registered command"""
+        def bind(function):
+            self.specs[name].handler = function
+            return function
+        return bind
+
+    def names(self):
+        return self.specs.keys()
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def compile(self, command, warnings=None):
+        """Validated copy of a parsed command node with coerced args.
+
+        Missing asset files are collected in warnings (or raised when warnings is None).
+        """
+        spec = self.specs.get(command['command'])
+        if spec is None:
+            raise CommandError(f"unknown command '{command['command']}'")
+        args = list(command['args'])
+        transition = None
+        if spec.transition and args and args[-1] in TRANSITIONS:
+            transition = args.pop()
+        if len(args) < spec.min_args or (spec.max_args is not None and len(args) > spec.max_args):
+            raise CommandError(f"'{command['command']}' takes {spec.signature()}, got {len(args)} argument(s)")
+        fixed = spec.params[:-1] if spec.variadic else spec.params
+        values = [self.coerce(param, value, warnings) for param, value in zip(fixed, args)]
+        values.extend(param.default for param in fixed[len(args):])
+        if spec.variadic:
+            values.append([self.coerce(spec.params[-1], value, warnings) for value in args[len(fixed):]])
+        return {'type': 'command', 'command': spec.name, 'args': values, 'transition': transition, 'checked': True}
+
+    @staticmethod
+    def coerce(param, value, warnings):
+        try:
+            return coerce(param, value)
+        except CommandError as e:
+            if e.severity != "warning" or warnings is None:
+                raise
+            warnings.append(str(e))
+            return value
+
+    def dispatch(self, game, command):
+        if not command.get('checked'):
+            # 스크립트를 거치지 않은 명령 (코드에서 직접 만든 것)
+            try:
+                command = self.compile(command)
+            except CommandError as e:
+                print(f"Error in command '{command['command']}': {e}")
+                return
+        spec = self.specs[command['command']]
+        if spec.handler is None:
+            return
+        if spec.transition:
+            spec.handler(game, *command['args'], transition=command['transition'])
+        else:
+            spec.handler(game, *command['args'])
+
+
+registry = CommandRegistry()
+registry.register("bg", [Param("filename", "background")], transition=True)
+registry.register("bgm", [Param("filename", "audio")])
+registry.register("locate", [Param("location")])
+registry.register("stat", [Param("stat"), Param("value", "int")])
+registry.register("goto", [Param("scene", "scene")])
+registry.register("place", [Param("name"), Param("filename", "image"), Param("x", "int", None), Param("y", "int", None)],
+                  transition=True)
+registry.register("remove", [Param("name")], transition=True)
+registry.register("wait", [Param("seconds", "float", 1.0)])
+registry.register("end")
+# 배경 파티클 효과: effect rain [density], effect_stop [rain]
+registry.register("effect", [Param("name"), Param("density", "float", 1.0)])
+registry.register("effect_stop", [Param("name", default=None)])
+# 레이어 스프라이트: show 유하람 smile casual [transition] (data/character.json의 "sprite")
+registry.register("show", [Param("name"), Param("options", variadic=True)], transition=True)
@@ -1,3 +1,23 @@
-import random
-x = random.choice(range(10))
-print(x)
\ No newline at end of file
+#display
+width = 1080
+height = 720
+fps = 60
+
+# 디자인 해상도: 원본 아트는 이 크기를 기준으로 그린다
+design_width = 1280
+design_height = 720
+
+# 에셋 빌드가 미리 스케일해 둘 해상도 목록
+resolutions = [(1280, 720), (width, height)]
+
+# 분류별 메모리 예산 (바이트): 넘으면 오래 안 쓴 항목부터 캐시에서 뺀다
+memory_budgets = {
+    "surface": 192 * 1024 * 1024,
+    "sprite": 64 * 1024 * 1024,
+    "font": 8 * 1024 * 1024,
+    "script": 32 * 1024 * 1024,
+    "audio": 64 * 1024 * 1024,
+}
+
+# 다음 장면 에셋을 미리 불러올 때 쓰는 최대 바이트 (surface 예산 안에서)
+preload_budget = 48 * 1024 * 1024
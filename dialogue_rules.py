@@ -0,0 +1,118 @@
+import bisect
+
+from resource_pack import resources
+
+
+class ThresholdTable:
+    """Rules sorted by one condition key's bounds, with prefix/suffix bitmasks per position"""
+
+    def __init__(self, rules, key):
+        self.free = 0
+        mins, maxs = [], []
+        for bit, rule in rules:
+            bound = rule["conditions"].get(key)
+            if bound is None:
+                self.free |= 1 << bit
+                continue
+            mins.append((bound.get("min", float("-inf")), bit))
+            maxs.append((bound.get("max", float("inf")), bit))
+        mins.sort()
+        maxs.sort()
+        self.min_values = [value for value, _ in mins]
+        self.max_values = [value for value, _ in maxs]
+
+        # min_prefix[i]: 처음 i개 규칙 (min <= 값) / max_suffix[i]: i번째 이후 규칙 (max >= 값)
+        self.min_prefix = [0]
+        for _, bit in mins:
+            self.min_prefix.append(self.min_prefix[-1] | (1 << bit))
+        self.max_suffix = [0] * (len(maxs) + 1)
+        for i in range(len(maxs) - 1, -1, -1):
+            self.max_suffix[i] = self.max_suffix[i + 1] | (1 << maxs[i][1])
+
+    def match(self, value):
+        """Bitmask of rules whose bounds on this key admit value"""
+        lower_ok = self.min_prefix[bisect.bisect_right(self.min_values, value)]
+        upper_ok = self.max_suffix[bisect.bisect_left(self.max_values, value)]
+        return self.free | (lower_ok & upper_ok)
+
+
+class DialogueIndex:
+    """Every character's conditional lines compiled into per-key threshold tables"""
+
+    def __init__(self, characters):
+        entries = []
+        order = 0
+        for character in characters:
+            for rule in character.get("dialogues", []):
+                rule = dict(rule)
+                rule["speaker"] = character["name"]
+                rule.setdefault("conditions", {})
+                rule.setdefault("priority", 0)
+                entries.append((order, rule))
+                order += 1
+
+        # 비트 순서 = 우선순위 순서: 가장 낮은 비트가 가장 좋은 대사
+        entries.sort(key=lambda item: (-item[1]["priority"], -len(item[1]["conditions"]), item[0]))
+        self.rules = [rule for _, rule in entries]
+        # 대사 id는 캐릭터마다 따로 붙으므로 (화자, id) 쌍으로 비트를 찾는다
+        self.bit_of = {(rule["speaker"], rule["id"]): bit for bit, rule in enumerate(self.rules)}
+
+        self.speaker_masks = {}
+        self.once_mask = 0
+        # 우선순위가 같은 규칙끼리의 마스크 (아직 안 본 대사는 이 안에서만 앞선다)
+        priority_masks = {}
+        keys = set()
+        for bit, rule in enumerate(self.rules):
+            self.speaker_masks[rule["speaker"]] = self.speaker_masks.get(rule["speaker"], 0) | (1 << bit)
+            priority_masks[rule["priority"]] = priority_masks.get(rule["priority"], 0) | (1 << bit)
+            if rule.get("once"):
+                self.once_mask |= 1 << bit
+            keys.update(rule["conditions"])
+        numbered = list(enumerate(self.rules))
+        self.tables = {key: ThresholdTable(numbered, key) for key in sorted(keys)}
+        self.tier_masks = [priority_masks[rule["priority"]] for rule in self.rules]
+        self.seen = 0
+
+    @classmethod
+    def from_file(cls, filename):
+        """Load data/character.json; returns (character definitions, index)"""
+        try:
+            characters = resources.load_json(filename).get("characters", [])
+        except FileNotFoundError:
+            print(f"Error: Character data file not found at {filename}")
+            characters = []
+        return characters, cls(characters)
+
+    def select(self, speaker, conditions, mark_used=True):
+        """Best line for speaker under conditions (stats, day, likability), or None.
+
+        Highest priority wins; among lines of that priority an unseen one is
+        preferred, then the more specific one.
+        """
+        mask = self.speaker_masks.get(speaker, 0) & ~(self.seen & self.once_mask)
+        for key, table in self.tables.items():
+            if not mask:
+                return None
+            mask &= table.match(conditions.get(key, 0))
+        if not mask:
+            return None
+        # 가장 높은 우선순위 안에서만 아직 보지 않은 대사를 먼저 고른다
+        mask &= self.tier_masks[(mask & -mask).bit_length() - 1]
+        fresh = mask & ~self.seen
+        if fresh:
+            mask = fresh
+        bit = (mask & -mask).bit_length() - 1
+        if mark_used:
+            self.seen |= 1 << bit
+        return self.rules[bit]
+
+    def used_ids(self):
+        """Seen lines as [speaker, id] pairs (JSON-friendly for saves)"""
+        return [[rule["speaker"], rule["id"]] for bit, rule in enumerate(self.rules) if self.seen >> bit & 1]
+
+    def restore_used(self, ids):
+        self.seen = 0
+        for speaker, line_id in ids:
+            bit = self.bit_of.get((speaker, line_id))
+            if bit is not None:
+                self.seen |= 1 << bit
@@ -0,0 +1,161 @@
+import bisect
+import random
+
+from resource_pack import resources
+
+ANY_LOCATION = "*"
+ENCOUNTER_CHANCE = 0.1
+MAX_REJECTIONS = 8
+
+
+class AliasTable:
+    """Vose's alias method: O(n) build, O(1) weighted sampling"""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        self.n = n
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng):
+        i = int(rng.random() * self.n)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class Encounter:
+    """One entry of data/encounters.json; scene must exist in the story and
+    location names a structure the player stands near ("*" for anywhere)"""
+    __slots__ = ("index", "scene", "weight", "location", "min_day", "max_day", "stats", "cooldown")
+
+    def __init__(self, index, data):
+        self.index = index
+        self.scene = data["scene"]
+        self.weight = data.get("weight", 1)
+        self.location = data.get("location", ANY_LOCATION)
+        self.min_day = data.get("min_day", 1)
+        self.max_day = data.get("max_day")
+        self.stats = data.get("stats", {})
+        self.cooldown = data.get("cooldown", 0)
+
+    def stats_ok(self, player_stats):
+        for stat_name, minimum in self.stats.items():
+            if player_stats.get(stat_name, 0) < minimum:
+                return False
+        return True
+
+
+class EncounterEngine:
+    """Random encounters indexed by location and day range, sampled with per-bucket alias tables"""
+
+    def __init__(self, encounters, chance=ENCOUNTER_CHANCE, seed=None):
+        self.encounters = [Encounter(i, data) for i, data in enumerate(encounters) if data.get("weight", 1) > 0]
+        self.chance = chance
+        self.rng = random.Random(seed)
+        self.last_fired = {}
+        self.build_index()
+
+    def build_index(self):
+        # 날짜 구간 경계: 구간 안에서는 날짜 조건의 결과가 같다
+        bounds = {1}
+        for encounter in self.encounters:
+            bounds.add(encounter.min_day)
+            if encounter.max_day is not None:
+                bounds.add(encounter.max_day + 1)
+        self.day_bounds = sorted(bounds)
+
+        self.by_location = {}
+        for encounter in self.encounters:
+            self.by_location.setdefault(encounter.location, []).append(encounter)
+        self.buckets = {}
+
+    @classmethod
+    def from_file(cls, filename, seed=None):
+        try:
+            data = resources.load_json(filename)
+        except FileNotFoundError:
+            print(f"Error: Encounter data file not found at {filename}")
+            data = {}
+        return cls(data.get("encounters", []), data.get("chance", ENCOUNTER_CHANCE), seed)
+
+    def restrict(self, scenes):
+        """Drop encounters whose scene is not in scenes (a Story), with a warning"""
+        kept = []
+        for encounter in self.encounters:
+            if encounter.scene in scenes:
+                kept.append(encounter)
+            else:
+                print(f"Warning: Encounter scene '{encounter.scene}' not found; skipped.")
+        if len(kept) != len(self.encounters):
+            self.encounters = kept
+            self.build_index()
+
+    def reseed(self, seed):
+        self.rng.seed(seed)
+        self.last_fired.clear()
+
+    def get_state(self):
+        return {"rng": self.rng.getstate(), "last_fired": dict(self.last_fired)}
+
+    def set_state(self, state):
+        self.rng.setstate(state["rng"])
+        self.last_fired = dict(state["last_fired"])
+
+    def bucket(self, location, day):
+        """Candidates for (location, day segment) and their alias table, built once"""
+        segment = bisect.bisect_right(self.day_bounds, day) - 1
+        key = (location, segment)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            seg_day = self.day_bounds[max(segment, 0)]
+            candidates = [
+                e for e in self.by_location.get(location, []) + (
+                    self.by_location.get(ANY_LOCATION, []) if location != ANY_LOCATION else [])
+                if e.min_day <= seg_day and (e.max_day is None or seg_day <= e.max_day)
+            ]
+            table = AliasTable([e.weight for e in candidates]) if candidates else None
+            bucket = (candidates, table)
+            self.buckets[key] = bucket
+        return bucket
+
+    def available(self, encounter, stats, day):
+        last = self.last_fired.get(encounter.index)
+        if last is not None and day - last < encounter.cooldown:
+            return False
+        return encounter.stats_ok(stats)
+
+    def roll(self, stats, day, location=ANY_LOCATION):
+        """Roll for an encounter on one step; returns the scene name or None"""
+        if self.rng.random() >= self.chance:
+            return None
+        candidates, table = self.bucket(location, day)
+        if table is None:
+            return None
+
+        chosen = None
+        for _ in range(MAX_REJECTIONS):
+            candidate = candidates[table.sample(self.rng)]
+            if self.available(candidate, stats, day):
+                chosen = candidate
+                break
+        if chosen is None:
+            # 거절이 계속되면 이 구간만 한 번 걸러서 뽑는다
+            eligible = [e for e in candidates if self.available(e, stats, day)]
+            if not eligible:
+                return None
+            chosen = self.rng.choices(eligible, weights=[e.weight for e in eligible])[0]
+
+        self.last_fired[chosen.index] = day
+        return chosen.scene
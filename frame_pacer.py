@@ -0,0 +1,175 @@
+import asyncio
+import time
+
+import pygame
+
+# 실행기 작업을 기다리며 잠들어 있을 때 입력을 확인하는 간격
+IO_POLL_SECONDS = 1 / 30
+# wake_at 알람보다 조금 늦게 깨어난다 (asyncio 타이머가 먼저 만료되도록)
+ALARM_SLACK = 0.005
+
+
+async def run_ready():
+    """Let woken tasks run before blocking: a timer or executor callback resolves
+    its future on one loop pass and the waiting task resumes on the next"""
+    for _ in range(2):
+        await asyncio.sleep(0)
+
+
+class FramePacer:
+    """Runs frames at full rate while something animates, otherwise sleeps on the event queue"""
+
+    def __init__(self, clock, active_fps=60, idle_fps=4, wake_seconds=0.25):
+        self.clock = clock
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.wake_seconds = wake_seconds
+        self.activity_sources = []
+        self.awake_until = 0.0
+        self.alarm = None
+        self.redraw_requested = True
+
+        # 통계
+        self.frames = 0
+        self.rendered_frames = 0
+        self.idle_seconds = 0.0
+        self.started_at = time.perf_counter()
+        self.window_started_at = self.started_at
+        self.window_frames = 0
+        self.effective_fps = 0.0
+        self.frame_ended_at = self.started_at
+
+    def add_activity_source(self, source):
+        """Register a callable that returns True while it needs full-rate frames"""
+        self.activity_sources.append(source)
+
+    def remove_activity_source(self, source):
+        if source in self.activity_sources:
+            self.activity_sources.remove(source)
+
+    def keep_awake(self, seconds=None):
+        """Stay at the full rate for a while (e.g. right after input)"""
+        if seconds is None:
+            seconds = self.wake_seconds
+        self.awake_until = max(self.awake_until, time.perf_counter() + seconds)
+
+    def wake_at(self, when):
+        """Idle waits end by when (perf_counter), e.g. for a timer a task sleeps on"""
+        if self.alarm is None or self.alarm <= time.perf_counter() or when < self.alarm:
+            self.alarm = when
+
+    def request_redraw(self):
+        self.redraw_requested = True
+
+    def is_active(self):
+        if time.perf_counter() < self.awake_until:
+            return True
+        for source in self.activity_sources:
+            if source():
+                return True
+        return False
+
+    def poll_events(self):
+        """Return pending events, blocking up to one idle frame when nothing is animating"""
+        if self.is_active():
+            return pygame.event.get()
+
+        blocked_from = time.perf_counter()
+        event = pygame.event.wait(int(1000 / self.idle_fps))
+        self.idle_seconds += time.perf_counter() - blocked_from
+        if event.type == pygame.NOEVENT:
+            return []
+        # 입력이 들어오면 잠시 풀 프레임으로 복귀
+        self.keep_awake()
+        return [event] + pygame.event.get()
+
+    async def poll_events_async(self, runtime=None):
+        """poll_events for the asyncio loop.
+
+        Idle with no executor work in flight, it blocks on the event queue like
+        poll_events (until input, the idle frame or a wake_at alarm); while
+        runtime has I/O pending it waits on its completion instead.
+        """
+        events = pygame.event.get()
+        if events or self.is_active():
+            return events
+        await run_ready()
+        blocked_from = now = time.perf_counter()
+        deadline = blocked_from + 1 / self.idle_fps
+        if self.alarm is not None and self.alarm > now:
+            deadline = min(deadline, self.alarm + ALARM_SLACK)
+        while not events and not self.redraw_requested and not self.is_active() and deadline - now >= 0.001:
+            if runtime is not None and runtime.io_pending:
+                runtime.io_done.clear()
+                try:
+                    await asyncio.wait_for(runtime.io_done.wait(), min(IO_POLL_SECONDS, deadline - now))
+                except asyncio.TimeoutError:
+                    pass
+                events = pygame.event.get()
+                await run_ready()
+            else:
+                # 기다릴 작업이 없으므로 루프를 막고 SDL 이벤트 큐에서 잠든다
+                event = pygame.event.wait(round((deadline - now) * 1000))
+                if event.type != pygame.NOEVENT:
+                    events = [event] + pygame.event.get()
+            now = time.perf_counter()
+        self.idle_seconds += time.perf_counter() - blocked_from
+        if events:
+            self.keep_awake()
+        return events
+
+    def should_render(self, events):
+        return bool(events) or self.redraw_requested or self.is_active()
+
+    def end_frame(self, rendered=True):
+        """Finish the frame; returns the elapsed time in seconds"""
+        if rendered:
+            self.rendered_frames += 1
+            self.redraw_requested = False
+        if self.is_active():
+            dt = self.clock.tick(self.active_fps)
+        else:
+            # 이미 event.wait에서 잠들었으므로 추가로 지연하지 않는다
+            dt = self.clock.tick()
+        return self.count_frame(dt)
+
+    async def end_frame_async(self, rendered=True):
+        """end_frame without clock.tick's blocking delay: the wait yields to other tasks"""
+        if rendered:
+            self.rendered_frames += 1
+            self.redraw_requested = False
+        if self.is_active():
+            remaining = 1 / self.active_fps - (time.perf_counter() - self.frame_ended_at)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+        else:
+            await asyncio.sleep(0)
+        return self.count_frame(self.clock.tick())
+
+    def count_frame(self, dt):
+        self.frames += 1
+        self.window_frames += 1
+
+        now = time.perf_counter()
+        window = now - self.window_started_at
+        if window >= 1.0:
+            self.effective_fps = self.window_frames / window
+            self.window_frames = 0
+            self.window_started_at = now
+        self.frame_ended_at = now
+        return dt / 1000
+
+    def idle_ratio(self):
+        elapsed = time.perf_counter() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return self.idle_seconds / elapsed
+
+    def get_stats(self):
+        return {
+            "frames": self.frames,
+            "rendered_frames": self.rendered_frames,
+            "effective_fps": round(self.effective_fps, 2),
+            "idle_seconds": round(self.idle_seconds, 3),
+            "idle_ratio": round(self.idle_ratio(), 3),
+        }
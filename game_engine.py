@@ -4,6 +4,8 @@ import re
 
 import pygame
 
+from resource_pack import resources
+
 #display
 width = 1080
 height = 720
@@ -11,10 +13,13 @@ fps = 60
 
 #font
 def get_font(size: int, style: str = "default" ):
-    if style == "default":
-        return pygame.font.Font("assets/fonts/NanumGothic.ttf", size)
-    return pygame.font.Font(f"assets/fonts/NanumGothic{style}.ttf", size)
-font_default = get_font(size=20)
+    # 모듈을 불러올 때가 아니라 처음 쓸 때 연다 (pygame 초기화 전, 폰트 없는 환경)
+    path = "assets/fonts/NanumGothic.ttf" if style == "default" else f"assets/fonts/NanumGothic{style}.ttf"
+    try:
+        return resources.load_font(path, size)
+    except FileNotFoundError:
+        print(f"Error: Font file not found at {path}")
+        return pygame.font.Font(None, size)
 #colors
 
 #player manage
@@ -83,7 +88,7 @@ class VisualNovelInterpreter:
 
         # Build lexer and parser
         self.lexer = lex.lex(module=self)
-        self.parser = yacc.yacc(module=self)
+        self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
 
     # Token definitions
     tokens = (
@@ -0,0 +1,171 @@
+"""Development mode: watch content directories and swap changed files into the running game."""
+import ctypes
+import ctypes.util
+import os
+import struct
+import time
+
+from resource_pack import LOCAL_SUFFIXES, PACK_EXCLUDE, resources
+from story import SCRIPT_DIR
+
+WATCH_DIRS = [SCRIPT_DIR, "assets/image", "data"]
+POLL_INTERVAL = 0.5
+# 저장하는 도중의 여러 이벤트를 한 번에 처리하도록 잠깐 기다린다
+SETTLE_SECONDS = 0.1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify through libc; poll() never blocks"""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        for directory in directories:
+            for root, dirs, _ in os.walk(directory):
+                self.add_watch(root)
+
+    def add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def poll(self):
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                offset += length
+                directory = self.watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self.add_watch(path)
+                    continue
+                changed.add(os.path.normpath(path))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback: compare (mtime, size) of every file, at most every POLL_INTERVAL seconds"""
+
+    def __init__(self, directories, interval=POLL_INTERVAL):
+        self.directories = directories
+        self.interval = interval
+        self.last_poll = time.monotonic()
+        self.snapshot = self.scan()
+
+    def scan(self):
+        files = {}
+        for directory in self.directories:
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    path = os.path.normpath(os.path.join(root, name))
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self):
+        now = time.monotonic()
+        if now - self.last_poll < self.interval:
+            return set()
+        self.last_poll = now
+        snapshot = self.scan()
+        changed = {path for path, info in snapshot.items() if self.snapshot.get(path) != info}
+        changed.update(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def is_play_data(path):
+    """Saves, telemetry and their side files: written while playing, never content"""
+    path = os.path.normpath(path).replace(os.sep, "/")
+    return path in PACK_EXCLUDE or path.endswith(LOCAL_SUFFIXES)
+
+
+def create_watcher(directories=WATCH_DIRS):
+    directories = [d for d in directories if os.path.isdir(d)]
+    try:
+        return InotifyWatcher(directories)
+    except (OSError, AttributeError) as e:
+        print(f"inotify unavailable ({e}), polling for changes")
+        return PollingWatcher(directories)
+
+
+class HotReloader:
+    """Collects changed paths and reloads scripts, images and data without a restart"""
+
+    def __init__(self, game, watcher=None):
+        self.game = game
+        self.watcher = watcher or create_watcher()
+        self.pending = set()
+        self.pending_since = None
+        if resources.pack is not None:
+            print("Warning: resource pack is mounted; edits to packed files will not show up")
+
+    def poll(self):
+        # 세이브나 텔레메트리를 쓸 때마다 다시 불러오지 않는다
+        changed = {path for path in self.watcher.poll() if not is_play_data(path)}
+        now = time.monotonic()
+        if changed:
+            self.pending |= changed
+            self.pending_since = now
+        if not self.pending or now - self.pending_since < SETTLE_SECONDS:
+            return set()
+        paths, self.pending = self.pending, set()
+        start = time.perf_counter()
+        for path in sorted(paths):
+            self.reload(path)
+        print(f"Reloaded {len(paths)} file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return paths
+
+    def reload(self, path):
+        path = os.path.normpath(path).replace(os.sep, "/")
+        game = self.game
+        if path.startswith(SCRIPT_DIR + "/") and path.endswith(".txt"):
+            changed = game.story.load_file(path)
+            if changed:
+                game.reload_story(changed)
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            game.reload_image(path)
+        elif path.endswith(".json"):
+            resources.invalidate(path)
+            game.reload_data(path)
+
+    def close(self):
+        self.watcher.close()
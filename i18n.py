@@ -0,0 +1,216 @@
+"""Message catalogs: extraction, binary compilation and runtime lookup.
+
+    python i18n.py extract          # update locale/<lang>.json with new msgids
+    python i18n.py compile          # locale/<lang>.json -> locale/<lang>.kvc
+
+msgids are the Korean source strings; "ko" needs no catalog.
+"""
+import ast
+import json
+import os
+import re
+import struct
+import sys
+import weakref
+import zlib
+
+from resource_pack import resources
+
+LOCALE_DIR = "locale"
+SOURCE_LANGUAGE = "ko"
+EXTRACT_SOURCES = ["main.py", "ui.py"]
+SCRIPT_DIR = "assets/script"
+MAGIC = b"KVC1"
+HEADER = struct.Struct("<4sII")
+SLOT = struct.Struct("<IIIII")
+EMPTY = 0xFFFFFFFF
+
+
+def N_(message):
+    """Mark a string for extraction without translating it here"""
+    return message
+
+
+def compile_catalog(messages):
+    """Open-addressing hash table of (crc32, key, value) slots followed by a UTF-8 blob"""
+    entries = [(k.encode("utf-8"), v.encode("utf-8")) for k, v in messages.items() if v]
+    n_slots = 1
+    while n_slots < len(entries) * 2:
+        n_slots *= 2
+    slots = [(EMPTY, EMPTY, 0, 0, 0)] * n_slots
+    blob = bytearray()
+    for key, value in entries:
+        key_off = len(blob)
+        blob += key
+        val_off = len(blob)
+        blob += value
+        h = zlib.crc32(key)
+        i = h & (n_slots - 1)
+        while slots[i][1] != EMPTY:
+            i = (i + 1) & (n_slots - 1)
+        slots[i] = (h, key_off, len(key), val_off, len(value))
+    out = bytearray(HEADER.pack(MAGIC, n_slots, len(entries)))
+    for slot in slots:
+        out += SLOT.pack(*slot)
+    return bytes(out + blob)
+
+
+class Catalog:
+    """Compiled catalog; lookups probe the hash table in place without building a dict"""
+
+    def __init__(self, data):
+        magic, self.n_slots, self.n_entries = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a compiled catalog")
+        self.data = data
+        self.blob_offset = HEADER.size + self.n_slots * SLOT.size
+
+    def get(self, message):
+        if not self.n_entries:
+            return None
+        key = message.encode("utf-8")
+        h = zlib.crc32(key)
+        mask = self.n_slots - 1
+        i = h & mask
+        base = self.blob_offset
+        while True:
+            slot_hash, key_off, key_len, val_off, val_len = SLOT.unpack_from(self.data, HEADER.size + i * SLOT.size)
+            if key_off == EMPTY:
+                return None
+            if slot_hash == h and self.data[base + key_off:base + key_off + key_len] == key:
+                return bytes(self.data[base + val_off:base + val_off + val_len]).decode("utf-8")
+            i = (i + 1) & mask
+
+
+class Translator:
+    """Current language only; switching languages drops the old catalog and notifies listeners"""
+
+    def __init__(self, language=SOURCE_LANGUAGE):
+        self.language = SOURCE_LANGUAGE
+        self.catalog = None
+        self.listeners = weakref.WeakSet()
+        self.callbacks = []
+        self.set_language(language)
+
+    def load(self, language):
+        if language == SOURCE_LANGUAGE:
+            return None
+        compiled = os.path.join(LOCALE_DIR, f"{language}.kvc")
+        try:
+            return Catalog(resources.read_bytes(compiled))
+        except FileNotFoundError:
+            pass
+        # 개발 환경: 컴파일된 카탈로그가 없으면 JSON을 바로 컴파일한다
+        try:
+            return Catalog(compile_catalog(resources.load_json(os.path.join(LOCALE_DIR, f"{language}.json"))))
+        except FileNotFoundError:
+            print(f"Error: No catalog for language '{language}'")
+            return None
+
+    def set_language(self, language):
+        if language == self.language and (self.catalog is not None or language == SOURCE_LANGUAGE):
+            return
+        self.catalog = self.load(language)
+        self.language = language
+        # 텍스트 캐시만 무효화한다
+        for listener in list(self.listeners):
+            listener.invalidate()
+        # 죽은 위젯의 콜백은 버린다 (약한 참조)
+        self.callbacks = [ref for ref in self.callbacks if ref() is not None]
+        for ref in list(self.callbacks):
+            callback = ref()
+            if callback is not None:
+                callback()
+
+    def add_listener(self, widget):
+        """Widget whose invalidate() should run on a language switch (held weakly)"""
+        self.listeners.add(widget)
+
+    def add_callback(self, callback):
+        """Bound method to call after a language switch (held weakly, like listeners)"""
+        self.callbacks.append(weakref.WeakMethod(callback))
+
+    def gettext(self, message):
+        if self.catalog is None or not message:
+            return message
+        translated = self.catalog.get(message)
+        return translated if translated is not None else message
+
+
+translator = Translator()
+
+
+def _(message):
+    return translator.gettext(message)
+
+
+def extract_python(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename)
+    messages = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ("_", "N_")
+                and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+            messages.append(node.args[0].value)
+    return messages
+
+
+SCRIPT_LINE = re.compile(r'^\s*(?:[^\s:#@][^:]*|\$):\s*(?P<text>.+?)\s*(?:\([^)]*\))?\s*$')
+SCRIPT_OPTION = re.compile(r'^\s*(?P<text>[^#@:]+?)\s*(?:\([^)]*\))?\s*->\s*@')
+
+
+def extract_script(filename):
+    """Dialogue, narration and choice option texts from a .txt script"""
+    messages = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.lstrip().startswith(("#", "@")) or line.strip() == "choice:":
+                continue
+            match = SCRIPT_OPTION.match(line) or SCRIPT_LINE.match(line)
+            if match:
+                messages.append(match.group("text"))
+    return messages
+
+
+def extract():
+    messages = []
+    for filename in EXTRACT_SOURCES:
+        messages.extend(extract_python(filename))
+    if os.path.isdir(SCRIPT_DIR):
+        for name in sorted(os.listdir(SCRIPT_DIR)):
+            if name.endswith(".txt"):
+                messages.extend(extract_script(os.path.join(SCRIPT_DIR, name)))
+    unique = list(dict.fromkeys(messages))
+
+    os.makedirs(LOCALE_DIR, exist_ok=True)
+    for name in sorted(os.listdir(LOCALE_DIR)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(LOCALE_DIR, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+        merged = {message: catalog.get(message, "") for message in unique}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        missing = sum(1 for value in merged.values() if not value)
+        print(f"{path}: {len(merged)} messages, {missing} untranslated")
+    return unique
+
+
+def compile_all():
+    for name in sorted(os.listdir(LOCALE_DIR)):
+        if name.endswith(".json"):
+            with open(os.path.join(LOCALE_DIR, name), 'r', encoding='utf-8') as f:
+                data = compile_catalog(json.load(f))
+            out = os.path.join(LOCALE_DIR, name[:-5] + ".kvc")
+            with open(out, 'wb') as f:
+                f.write(data)
+            print(f"Compiled {out}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "extract"
+    if command == "extract":
+        extract()
+    elif command == "compile":
+        compile_all()
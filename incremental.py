@@ -0,0 +1,139 @@
+import bisect
+import re
+from collections import OrderedDict
+
+from vn_compiler import VnCompiler
+
+# '@장면:' 으로 시작하는 줄이 블록의 경계
+SCENE_HEADER = re.compile(r'[ \t]*@[a-zA-Z_][a-zA-Z0-9_]*:[ \t]*(#.*)?$')
+BLOCK_CACHE_SIZE = 256
+
+
+class Block:
+    """One scene: its source lines, parsed scene node and block-local diagnostics"""
+    __slots__ = ("start", "text", "node", "diagnostics")
+
+    def __init__(self, start, text, node, diagnostics):
+        self.start = start
+        self.text = text
+        self.node = node
+        self.diagnostics = diagnostics
+
+    @property
+    def line_count(self):
+        return self.text.count('\n')
+
+
+class ScriptDocument:
+    """Script kept as scene blocks; edits reparse only the blocks they touch.
+
+    Lines and columns are 1-based, the same as Diagnostic.
+    """
+
+    def __init__(self, text="", compiler=None):
+        self.compiler = compiler or VnCompiler(verbose=False)
+        self.cache = OrderedDict()
+        self.version = 0
+        self.lines = self.split_lines(text)
+        self.blocks = self.parse_region(0, len(self.lines))
+
+    @staticmethod
+    def split_lines(text):
+        lines = text.split('\n')
+        if lines and lines[-1] == '':
+            lines.pop()
+        return lines
+
+    def parse_block(self, lines):
+        text = '\n'.join(lines) + '\n'
+        cached = self.cache.get(text)
+        if cached is not None:
+            self.cache.move_to_end(text)
+            return text, cached
+        scenes = self.compiler.compile(text)
+        node = scenes[0] if scenes else None
+        cached = (node, list(self.compiler.diagnostics))
+        self.cache[text] = cached
+        if len(self.cache) > BLOCK_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return text, cached
+
+    def parse_region(self, first, last):
+        """Split lines[first:last] at scene headers and parse each piece"""
+        blocks = []
+        start = first
+        for i in range(first + 1, last):
+            if SCENE_HEADER.match(self.lines[i]):
+                blocks.append(self.make_block(start, i))
+                start = i
+        if start < last:
+            blocks.append(self.make_block(start, last))
+        return blocks
+
+    def make_block(self, first, last):
+        text, (node, diagnostics) = self.parse_block(self.lines[first:last])
+        return Block(first, text, node, diagnostics)
+
+    def block_index(self, line):
+        """Index of the block containing 0-based line"""
+        starts = [block.start for block in self.blocks]
+        return max(bisect.bisect_right(starts, line) - 1, 0)
+
+    def apply_edit(self, start_line, start_column, end_line, end_column, new_text):
+        """Replace the range (start, end) with new_text; returns the reparsed blocks"""
+        first_line, last_line = start_line - 1, end_line - 1
+        # 마지막 줄바꿈 뒤(문서 끝)에서의 편집: 빈 줄을 채워 두고 끝나면 다시 뺀다
+        padded = len(self.lines) <= last_line
+        while len(self.lines) <= last_line:
+            self.lines.append('')
+        head = self.lines[first_line][:start_column - 1]
+        tail = self.lines[last_line][end_column - 1:]
+        replaced = (head + new_text + tail).split('\n')
+        delta = len(replaced) - (last_line - first_line + 1)
+        self.lines[first_line:last_line + 1] = replaced
+        if padded and self.lines[-1] == '':
+            self.lines.pop()
+
+        # 영향 받은 블록: 편집 범위에 걸친 블록 + 머리줄이 바뀌면 바로 앞 블록
+        if not self.blocks:
+            lo, hi = 0, 0
+        else:
+            lo = self.block_index(first_line)
+            hi = self.block_index(last_line) + 1
+            if lo > 0 and first_line == self.blocks[lo].start:
+                lo -= 1
+        region_start = self.blocks[lo].start if self.blocks else 0
+        if hi < len(self.blocks):
+            region_end = self.blocks[hi].start + delta
+        else:
+            region_end = len(self.lines)
+
+        for block in self.blocks[hi:]:
+            block.start += delta
+        reparsed = self.parse_region(region_start, region_end)
+        self.blocks[lo:hi] = reparsed
+        self.version += 1
+        return reparsed
+
+    def set_text(self, text):
+        self.lines = self.split_lines(text)
+        self.blocks = self.parse_region(0, len(self.lines))
+        self.version += 1
+
+    @property
+    def text(self):
+        return ''.join(block.text for block in self.blocks)
+
+    @property
+    def ast(self):
+        """Scene nodes in order; unchanged scenes are the same objects across edits"""
+        return [block.node for block in self.blocks if block.node is not None]
+
+    @property
+    def diagnostics(self):
+        """Diagnostics for the whole document, shifted to document lines"""
+        result = []
+        for block in self.blocks:
+            for diagnostic in block.diagnostics:
+                result.append(diagnostic._replace(line=diagnostic.line + block.start))
+        return result
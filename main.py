@@ -1,176 +1,33 @@
+import asyncio
+import collections
 import pygame
 import sys
 import json
-import ply.lex as lex
-import ply.yacc as yacc
+import hashlib
 import random
 import os
-
-
-# ====================================================================
-# [1] 기존 컴파일러 클래스: 변경 사항 없음
-# ====================================================================
-class VnCompiler:
-    tokens = (
-        'SCENE', 'ID', 'COLON', 'TEXT', 'LPAREN', 'RPAREN', 'ARROW',
-        'NARRATOR', 'CHOICE', 'COMMAND'
-    )
-
-    def t_SCENE(self, t):
-        r'@[a-zA-Z_][a-zA-Z0-9_]*:'
-        t.value = t.value[:-1]
-        return t
-
-    def t_CHOICE(self, t):
-        r'choice:'
-        return t
-
-    def t_NARRATOR(self, t):
-        r'\$:'
-        return t
-
-    def t_COMMAND(self, t):
-        r'\b(bg|bgm|locate|stat|goto|place|remove|end)\b'
-        return t
-
-    def t_ID(self, t):
-        r'[a-zA-Z_][a-zA-Z0-9_./]*'
-        return t
-
-    t_COLON = r':'
-    t_LPAREN = r'\('
-    t_RPAREN = r'\)'
-    t_ARROW = r'->'
-
-    def t_TEXT(self, t):
-        r'.+?(?=(\(.*\))?\n|->|:)'
-        t.value = t.value.strip()
-        if t.value:
-            return t
-
-    t_ignore = ' \t'
-
-    def t_ignore_COMMENT(self, t):
-        r'\#.*'
-        pass
-
-    def t_newline(self, t):
-        r'\n+'
-        t.lexer.lineno += len(t.value)
-
-    def t_error(self, t):
-        print(f"Illegal character '{t.value[0]}' at line {t.lexer.lineno}")
-        t.lexer.skip(1)
-
-    def p_script(self, p):
-        'script : scenes'
-        p[0] = p[1]
-
-    def p_scenes_multiple(self, p):
-        'scenes : scenes scene'
-        p[0] = p[1] + [p[2]]
-
-    def p_scenes_single(self, p):
-        'scenes : scene'
-        p[0] = [p[1]]
-
-    def p_scene(self, p):
-        'scene : SCENE components'
-        p[0] = {'type': 'scene', 'name': p[1], 'components': p[2]}
-
-    def p_components_multiple(self, p):
-        'components : components component'
-        p[0] = p[1] + [p[2]]
-
-    def p_components_single(self, p):
-        'components : component'
-        p[0] = [p[1]]
-
-    def p_component(self, p):
-        '''component : dialogue
-                     | narration
-                     | command
-                     | choice'''
-        p[0] = p[1]
-
-    def p_dialogue_with_dub(self, p):
-        'dialogue : ID COLON TEXT LPAREN ID RPAREN'
-        p[0] = {'type': 'utter', 'speaker': p[1], 'utter': p[3], 'dubbing': p[5]}
-
-    def p_dialogue_no_dub(self, p):
-        'dialogue : ID COLON TEXT'
-        p[0] = {'type': 'utter', 'speaker': p[1], 'utter': p[3], 'dubbing': None}
-
-    def p_narration(self, p):
-        'narration : NARRATOR TEXT'
-        p[0] = {'type': 'utter', 'speaker': '', 'utter': p[2], 'dubbing': None}
-
-    def p_command_with_args(self, p):
-        'command : COMMAND args'
-        p[0] = {'type': 'command', 'command': p[1], 'args': p[2]}
-
-    def p_command_goto(self, p):
-        'command : COMMAND SCENE'
-        p[0] = {'type': 'command', 'command': p[1], 'args': [p[2]]}
-
-    def p_command_place(self, p):
-        'command : COMMAND ID ID'
-        p[0] = {'type': 'command', 'command': p[1], 'args': [p[2], p[3]]}
-
-    def p_command_place_full(self, p):
-        'command : COMMAND ID ID ID ID'
-        p[0] = {'type': 'command', 'command': p[1], 'args': [p[2], p[3], p[4], p[5]]}
-
-    def p_args_multiple(self, p):
-        'args : args ID'
-        p[0] = p[1] + [p[2]]
-
-    def p_args_single(self, p):
-        'args : ID'
-        p[0] = [p[1]]
-
-    def p_choice(self, p):
-        'choice : CHOICE options'
-        p[0] = {'type': 'choice', 'options': p[2]}
-
-    def p_options_multiple(self, p):
-        'options : options option'
-        p[0] = p[1] + [p[2]]
-
-    def p_options_single(self, p):
-        'options : option'
-        p[0] = [p[1]]
-
-    def p_option_conditional(self, p):
-        'option : TEXT LPAREN ID ID RPAREN ARROW SCENE'
-        try:
-            value = int(p[4])
-        except ValueError:
-            value = p[4]
-        p[0] = {
-            'text': p[1],
-            'condition': {'stat': p[3], 'value': value},
-            'target': p[7]
-        }
-
-    def p_option_normal(self, p):
-        'option : TEXT ARROW SCENE'
-        p[0] = {'text': p[1], 'condition': None, 'target': p[3]}
-
-    def p_error(self, p):
-        if p:
-            print(f"Syntax error at '{p.value}' (type: {p.type}) on line {p.lineno}")
-        else:
-            print("Syntax error at EOF")
-
-    def __init__(self):
-        self.lexer = lex.lex(module=self)
-        self.parser = yacc.yacc(module=self)
-
-    def compile(self, script_text):
-        if not script_text.strip():
-            return []
-        return self.parser.parse(script_text, lexer=self.lexer)
+import time
+
+from assets import AssetManager
+from async_runtime import AsyncRuntime
+from commands import CommandError, registry
+from dialogue_rules import DialogueIndex
+from encounters import EncounterEngine, ANY_LOCATION
+from frame_pacer import FramePacer
+from memory_budget import MemoryTracker, budget
+from npc_sim import NpcSimulation
+from i18n import N_, SOURCE_LANGUAGE, _, translator
+from resource_pack import resources
+from sprites import SpriteCompositor
+from scene_deps import Preloader
+from search_index import SearchIndex, normalize
+from story import Story, StoryCursor, scene_key
+from telemetry import Telemetry
+from particles import ParticleSystem
+from pathfinding import UNREACHABLE, PathFinder, distance_field
+from tilemap import ChunkedTileRenderer, TileSet
+from ui import Theme, Root, Label, MenuManager, DialogRenderer, CharacterRenderer, StateRenderer, MapRenderer
+from tween import TweenScheduler, FadeTween, DissolveTween, MoveTween, ZoomTween
 
 
 # Pygame 초기화
@@ -183,54 +40,76 @@ SCREEN_HEIGHT = 720
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("My Pygame Game")
 clock = pygame.time.Clock()
+FPS = 60
+IDLE_FPS = 4
+WALK_STEP_SECONDS = 0.08
+# 건물에서 이 걸음 수 안이면 그 장소에 있는 것으로 친다 (돌발 이벤트, NPC 만남)
+LOCATION_RADIUS = 2
 
 # 색상
-WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
-GRAY = (50, 50, 50)
-LIGHT_GRAY = (100, 100, 100)
 
+# 화면 전환
+BG_LAYER = "__bg__"
 
-def scale_image(image, max_width, max_height):
-    original_width, original_height = image.get_size()
-    width_ratio = max_width / original_width
-    height_ratio = max_height / original_height
-    scale_ratio = min(width_ratio, height_ratio)
-    new_width = int(original_width * scale_ratio)
-    new_height = int(original_height * scale_ratio)
-    return pygame.transform.smoothscale(image, (new_width, new_height))
+SAVE_PATH = "data/saved_data.json"
+SAVE_SLOT = "save1"
+BACKLOG_SIZE = 500
 
 
-def render_text_to_surf(text, surf, font):
-    text_surf = font.render(text, True, WHITE)
-    text_rect = text_surf.get_rect(center=surf.get_rect().center)
-    surf.blit(text_surf, text_rect)
+def read_save(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f).get(SAVE_SLOT, {})
+
+
+def write_save(filename, state):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        data = {}
+    data[SAVE_SLOT] = state
+    with open(filename + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(filename + ".tmp", filename)
+
 
 # ====================================================================
 # [2] Character, Player, Map 클래스: 변경 없음
 # ====================================================================
 class Character:
-    def __init__(self, name, likability=0, dialogues=None):
+    def __init__(self, name, likability=0, dialogues=None, rules=None):
         self.name = name
         self.likability = likability
         self.dialogues = dialogues if dialogues else {}
+        # 모든 캐릭터의 조건부 대사를 컴파일한 공용 인덱스
+        self.rules = rules
+        # 하루 시뮬레이션(npc_sim)이 채운다
+        self.mood = 0.0
+        self.location = None
 
     def get_main_dialogue(self, conditions):
-        pass
+        if self.rules is None:
+            return None
+        conditions = dict(conditions)
+        conditions.setdefault("likability", self.likability)
+        return self.rules.select(self.name, conditions)
 
 
 class Player(Character):
-    def __init__(self, name="주인공"):
+    def __init__(self, name="주인공", seed=None):
         super().__init__(name)
         self.stats = {
-            "예술": 0,
-            "문학": 0,
-            "체육": 0,
-            "운": 0,
-            "눈치": 0,
+            N_("예술"): 0,
+            N_("문학"): 0,
+            N_("체육"): 0,
+            N_("운"): 0,
+            N_("눈치"): 0,
         }
         self.activities_today = 0
         self.day = 1
+        # 세이브마다 고정되는 난수 시드 (돌발 이벤트 등)
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
 
     def increase_stat(self, stat_name, value):
         if stat_name in self.stats:
@@ -238,45 +117,88 @@ class Player(Character):
 
 
 class Map:
-    def __init__(self):
+    def __init__(self, rng=None, map_file="data/map.json", tiles_file="data/map_data.json"):
+        # 시작 위치와 건물 배치용 난수: 같은 시드면 같은 맵
+        self.rng = rng or random.Random()
         self.map_data = None
-        self.load_map("data/map.json")
         self.x = 0
         self.y = 0
         self.width = 0
         self.height = 0
         self.structures = []
         self.structure_place = []
+        self.structure_at = {}
         self.grid = []
+        self.tiles = []
+        self.load_map(map_file)
+        self.load_tiles(tiles_file)
+        # 보이는 청크만 그리는 타일맵 렌더러
+        self.renderer = ChunkedTileRenderer(self)
+        self.pathfinder = PathFinder(self)
+        self.encounters = EncounterEngine.from_file("data/encounters.json")
+        self.pending_scenes = []
         self.place_structure()
         self.get_grid()
 
     def load_map(self, filename):
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                self.map_data = json.load(f)
+            self.map_data = resources.load_json(filename)
         except FileNotFoundError:
             print(f"Error: Map data file not found at {filename}")
             self.map_data = {}
         data = self.map_data
         try:
-            data["structures"] = self.structures
-            data["width"] = self.width
-            data["height"] = self.height
-            self.x = random.choice(range(self.width))
-            self.y = random.choice(range(self.height))
-        except:
+            self.structures = data["structures"]
+            self.width = data["width"]
+            self.height = data["height"]
+            self.x = self.rng.randrange(self.width)
+            self.y = self.rng.randrange(self.height)
+        except (KeyError, IndexError):
+            print(f"Error: Invalid map data in {filename}")
+
+    def load_tiles(self, filename):
+        try:
+            self.tiles = resources.load_json(filename).get("tiles", [])
+        except FileNotFoundError:
             print(f"Error: Map data file not found at {filename}")
+            self.tiles = []
+
+    def set_tile(self, x, y, tile_id):
+        while len(self.tiles) <= y:
+            self.tiles.append([])
+        row = self.tiles[y]
+        while len(row) <= x:
+            row.append(0)
+        if row[x] != tile_id:
+            row[x] = tile_id
+            self.renderer.invalidate_tile(x, y)
+            self.pathfinder.invalidate()
 
     def place_structure(self):
         positions = []
         structure_places = []
+        if len(self.structures) >= self.width * self.height:
+            print("Error: Map is too small for its structures")
+            return
+        walkable = self.pathfinder.get_walkable()
+        if not walkable.any():
+            print("Error: Map has no walkable tile")
+            return
+        # 시작 위치가 물 위면 걸을 수 있는 칸으로 옮긴다
+        while not walkable[self.y, self.x]:
+            self.x = self.rng.randrange(self.width)
+            self.y = self.rng.randrange(self.height)
+        # 건물은 시작 위치에서 걸어서 갈 수 있는 칸에만 놓는다
+        reachable = distance_field(walkable, (self.x, self.y)) != UNREACHABLE
+        if len(self.structures) >= reachable.sum():
+            print("Error: Map is too small for its structures")
+            return
         for structure in self.structures:
             is_set = False
             while not is_set:
-                pos_x = random.choice(range(self.width))
-                pos_y = random.choice(range(self.height))
-                if [pos_x, pos_y] in positions:
+                pos_x = self.rng.randrange(self.width)
+                pos_y = self.rng.randrange(self.height)
+                if [pos_x, pos_y] in positions or not reachable[pos_y, pos_x]:
                     pass
                 else:
                     if [pos_x, pos_y] != [self.x, self.y]:
@@ -284,23 +206,25 @@ class Map:
                         is_set = True
             structure["pos"] = [pos_x, pos_y]
             structure_places.append(structure)
+        for structure in self.structure_place:
+            self.invalidate_structure(structure)
         self.structure_place = structure_places
+        self.structure_at = {tuple(structure["pos"]): structure for structure in structure_places}
+        for structure in structure_places:
+            self.invalidate_structure(structure)
+        self.pathfinder.invalidate()
+
+    def invalidate_structure(self, structure):
+        self.renderer.invalidate_tile(*structure["pos"])
 
     def get_grid(self):
-        structures = self.structure_place
         grid = []
-        pos_list = []
-        for structure in structures:
-            pos_list.append([structure["pos"][0], structure["pos"][1]])
-
         for x in range(self.width):
             grid_x = []
             for y in range(self.height):
-                if (x, y) in pos_list:
-                    for i in structures:
-                        if i["pos"][0] == x and i["pos"][1] == y:
-                            grid_x.append(i)
-                elif (x, y) == [self.x, self.y]:
+                if (x, y) in self.structure_at:
+                    grid_x.append(self.structure_at[(x, y)])
+                elif (x, y) == (self.x, self.y):
                     grid_x.append(1)
                 else:
                     grid_x.append(0)
@@ -308,23 +232,33 @@ class Map:
 
         self.grid = grid
 
-    def move(self, vector):
+    def move(self, vector, player=None):
+        old_x, old_y = self.x, self.y
         self.x += vector[0]
         if self.x < 0:
             self.x = 0
-        elif self.x > self.width:
+        elif self.x >= self.width:
             self.x = self.width - 1
         self.y += vector[1]
         if self.y < 0:
             self.y = 0
-        elif self.y > self.height:
+        elif self.y >= self.height:
             self.y = self.height - 1
+        if not self.pathfinder.get_walkable()[self.y, self.x]:
+            self.x, self.y = old_x, old_y
         st = self.check_for_structure()
-        if not st:
-            self.sudden_dialogue()
+        if not st and player is not None:
+            self.pending_scenes = self.sudden_dialogue(player)
+        return st
+
+    def find_path(self, goal):
+        return self.pathfinder.find_path((self.x, self.y), goal)
+
+    def path_to_structure(self, name):
+        return self.pathfinder.path_to_structure((self.x, self.y), name)
 
-    def render(self):
-        pass
+    def render(self, surface):
+        self.renderer.render(surface)
 
     def check_for_structure(self):
         x = self.x
@@ -332,223 +266,737 @@ class Map:
         structures = self.structure_place
         for structure in structures:
             if structure["pos"][0] == x and structure["pos"][1] == y:
-                exec(structure["code"])
+                if structure.get("code"):
+                    exec(structure["code"])
                 return 1
         return 0
 
-    def sudden_dialogue(self):
-        if random.random() < 0.1:
-            return []
+    def location(self):
+        """Name of the structure within LOCATION_RADIUS steps of the player, else None"""
+        nearest = self.pathfinder.nearest_structure((self.x, self.y), LOCATION_RADIUS)
+        return nearest["name"] if nearest else None
+
+    def sudden_dialogue(self, player):
+        scene = self.encounters.roll(player.stats, player.day, self.location() or ANY_LOCATION)
+        return [scene] if scene else []
 
 
 # ====================================================================
 # [3] Game 클래스: pygame-gui 통합 및 UI 관리 로직 전면 개편
 # ====================================================================
 
-class Button:
-    def __init__(self, rect, image, callback=None):
-        self.rect = rect
-        self.image = image
-        self.callback = callback
-
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.rect.collidepoint(event.pos):
-                if self.callback:
-                    self.callback()
-                return True
-        return False
-
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
-
-
 class Game:
-    def __init__(self):
+    def __init__(self, dev=False, seed=None, trace_memory=False, telemetry=False, task_stats=False):
         self.game_running = True
+        # 모든 난수는 이 시드 하나에서 나온다 (녹화/재생이 같은 게임을 만든다)
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
         self.state = "TITLE"
         self.placed_objects = {}
-        self.player = Player()
-        self.map_data = Map()
-        self.completed_conversation = []
+        self.background = None
+        self.assets = AssetManager((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # 레이어 캐릭터 스프라이트 (몸 + 표정/의상/효과), 조합마다 한 번 합성
+        self.sprites = SpriteCompositor(self.assets)
+        # 화면에 있는 이미지는 예산이 넘쳐도 캐시에서 빼지 않는다 (빼도 메모리는 그대로다)
+        self.assets.in_use = self.sprites.in_use = self.on_stage
+        self.tweens = TweenScheduler()
+        # 배경 위 파티클 효과 (비, 눈, 꽃잎, 먼지); 게임 난수와 따로 시드한다
+        self.effects = ParticleSystem((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), self.seed)
+        self.player = Player(seed=self.rng.randrange(1 << 32))
+        self.map_data = Map(self.rng)
+        self.map_data.encounters.reseed(self.player.seed)
+        self.scene_name = None
+        self.characters = {}
+        self.load_characters("data/character.json")
+        # 모든 스크립트 파일을 컴파일한 장면 모음과 현재 진행 위치
+        self.script_index = SearchIndex()
+        self.story = Story(index=self.script_index)
+        # 스크립트에 없는 장면의 이벤트는 걸리지 않게 뺀다
+        self.map_data.encounters.restrict(self.story)
+        # 이번 플레이에서 보여 준 대사 (백로그 화면과 검색용)
+        self.backlog = collections.deque(maxlen=BACKLOG_SIZE)
+        # 다음에 갈 수 있는 장면의 이미지를 예산 안에서 미리 불러온다 (run_async에서만)
+        self.preloader = Preloader(self.assets, self.story, self.sprites)
+        self.preload_task = None
+        self.cursor = StoryCursor(self.story)
+        self.choice_options = []
+        # run_async에서만 쓰인다: 장면 코루틴이 클릭과 선택을 기다리는 future
+        self.runtime = None
+        self.advance_waiter = None
+        self.choice_waiter = None
+        # 애니메이션이 없으면 낮은 주기로 잠들고 입력이 오면 깨어난다
+        self.pacer = FramePacer(clock, FPS, IDLE_FPS)
+        self.pacer.add_activity_source(self.tweens.is_active)
+        # 클릭 이동: 남은 경로를 한 칸씩 걷는다
+        self.walk_path = []
+        self.walk_timer = 0.0
+        self.pacer.add_activity_source(lambda: bool(self.walk_path))
+
+        # 화면별 위젯 트리: 한 번 만들고 바뀐 부분만 다시 그린다
+        self.theme = Theme()
+        self.build_ui()
+        self.pacer.add_activity_source(lambda: self.ui[self.state].is_animating())
+
+        # 개발 모드: 스크립트, 이미지, 데이터 파일이 바뀌면 실행 중에 다시 불러온다
+        self.hot_reload = None
+        if dev:
+            from hot_reload import HotReloader
+            self.hot_reload = HotReloader(self)
+        # 장면이 바뀔 때마다 tracemalloc 스냅숏을 비교한다 (누수 찾기)
+        self.memory_tracker = MemoryTracker() if trace_memory else None
+        # run_async가 끝날 때 작업별 시간 통계를 출력한다
+        self.task_stats = task_stats
+        # 장면, 선택, 스탯, 프레임 시간 기록: 파일 쓰기는 백그라운드 스레드에서만
+        self.telemetry = Telemetry() if telemetry else None
+
+    def build_ui(self):
+        theme = self.theme
+        self.title_ui = Root(theme)
+        self.title_ui.layout((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        title = self.title_ui.add(Label(theme, "title", N_("My Pygame Game"), localized=True))
+        title.layout((0, 170, SCREEN_WIDTH, 60))
+        self.title_menu = self.title_ui.add(MenuManager(theme, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 35)))
+        self.title_menu.add_button(N_("새 게임"), self.start_new_game)
+        self.title_menu.add_button(N_("불러오기"), self.load_game)
+        self.title_menu.add_button(N_("게임 종료"), self.end_game)
+
+        self.dialogue_ui = Root(theme)
+        self.dialogue_ui.layout((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.stage = self.dialogue_ui.add(CharacterRenderer(theme, self.placed_objects, self.tweens, BG_LAYER,
+                                                               self.effects))
+        self.dialog_box = self.dialogue_ui.add(DialogRenderer(screen, SCREEN_WIDTH, SCREEN_HEIGHT, theme))
+        self.choice_menu = self.dialogue_ui.add(MenuManager(theme, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3),
+                                                            button_size=(400, 50)))
+
+        self.map_ui = Root(theme)
+        self.map_ui.layout((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.map_ui.add(MapRenderer(theme, self.map_data))
+        self.status_panel = self.map_ui.add(StateRenderer(theme))
+
+        self.ui = {"TITLE": self.title_ui, "VISUAL_NOVEL": self.dialogue_ui, "MAP": self.map_ui}
+
+    def load_characters(self, filename):
+        definitions, self.dialogue_rules = DialogueIndex.from_file(filename)
+        for data in definitions:
+            dialogues = {rule["id"]: rule for rule in data.get("dialogues", [])}
+            self.characters[data["name"]] = Character(
+                data["name"], data.get("likability", 0), dialogues, self.dialogue_rules
+            )
+        self.sprites.load(definitions)
+        # 출연진 전체의 하루 단위 시뮬레이션 (호감도, 기분, 일정)
+        locations = [structure["name"] for structure in self.map_data.structures]
+        self.npcs = NpcSimulation.from_file(definitions, locations, self.player.seed)
+        self.npcs.sync_to(self.characters)
+
+    def get_dialogue_conditions(self):
+        conditions = dict(self.player.stats)
+        conditions["day"] = self.player.day
+        return conditions
+
+    def state_hash(self):
+        """Digest of the game state, compared at replay checkpoints"""
+        state = {
+            "state": self.state,
+            "stats": self.player.stats,
+            "day": self.player.day,
+            "activities": self.player.activities_today,
+            "position": [self.map_data.x, self.map_data.y],
+            "structures": [structure["pos"] for structure in self.map_data.structure_place],
+            "encounters": self.map_data.encounters.get_state(),
+            "story": self.cursor.get_state(),
+            "likability": {name: character.likability for name, character in self.characters.items()},
+            "seen": self.dialogue_rules.used_ids(),
+            "placed": sorted(self.placed_objects),
+        }
+        data = json.dumps(state, sort_keys=True, ensure_ascii=False, default=list)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
 
-        try:
-            self.main_font = pygame.font.SysFont("Malgun Gothic", 24)
-            self.title_font = pygame.font.SysFont("Malgun Gothic", 48)
-        except:
-            self.main_font = pygame.font.SysFont(pygame.font.get_default_font(), 24)
-            self.title_font = pygame.font.SysFont(pygame.font.get_default_font(), 48)
+    def set_language(self, language):
+        translator.set_language(language)
 
-        # 버튼 인스턴스를 저장할 리스트를 초기화만 합니다.
-        self.buttons = []
+    def on_stage(self, image):
+        if self.background and self.background['image'] is image:
+            return True
+        if any(obj['image'] is image for obj in self.placed_objects.values()):
+            return True
+        return any(ghost[0] is image for ghost in self.tweens.ghosts.values())
 
     def start_new_game(self):
         self.state = "MAP"
         print("새 게임 시작!")
 
     def load_game(self):
+        if self.runtime:
+            self.runtime.spawn("load", self.load_game_async())
+            return
+        try:
+            self.restore_state(read_save(SAVE_PATH))
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Error loading save data: {e}")
         self.state = "MAP"
         print("게임 불러오기!")
 
+    async def load_game_async(self):
+        # 파일 읽기와 파싱만 실행기에서, 상태 복원은 프레임 스레드에서
+        try:
+            self.restore_state(await self.runtime.run_io("load", read_save, SAVE_PATH))
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Error loading save data: {e}")
+        self.state = "MAP"
+        self.pacer.request_redraw()
+        print("게임 불러오기!")
+
+    def save_state(self):
+        return {
+            "player": {
+                "stats": dict(self.player.stats),
+                "conversation": self.dialogue_rules.used_ids(),
+                "day": self.player.day,
+                "seed": self.player.seed,
+            },
+            "position": [self.map_data.x, self.map_data.y],
+            "npcs": self.npcs.get_state(),
+        }
+
+    def restore_state(self, data):
+        player = data.get("player", {})
+        self.player.stats.update(player.get("stats", {}))
+        self.player.day = player.get("day", self.player.day)
+        conversation = player.get("conversation")
+        if isinstance(conversation, list):
+            self.dialogue_rules.restore_used(conversation)
+        if "position" in data:
+            self.map_data.x, self.map_data.y = data["position"]
+        if "npcs" in data:
+            self.npcs.set_state(data["npcs"])
+            self.npcs.sync_to(self.characters)
+
+    def save_game(self):
+        write_save(SAVE_PATH, self.save_state())
+
+    async def save_game_async(self):
+        # 상태는 프레임 스레드에서 복사하고 파일 쓰기만 실행기로 보낸다
+        await self.runtime.run_io("save", write_save, SAVE_PATH, self.save_state())
+
     def end_game(self):
         self.game_running = False
 
-    def next_day(self):
+    def next_day(self, days=1):
+        """End the day (or skip days days): the whole cast is simulated in one batch"""
+        self.npcs.advance(days, self.map_data.location(), self.player.activities_today)
+        self.npcs.sync_to(self.characters)
         self.player.activities_today = 0
-        self.player.day += 1
+        self.player.day += days
 
     def run_dialogue_command(self, command):
-        cmd = command['command']
-        args = command['args']
-        if cmd == 'bg':
-            pass
-        elif cmd == 'bgm':
-            pass
-        elif cmd == 'locate':
-            pass
-        elif cmd == 'stat':
-            stat_name, value = args[0], int(args[1])
-            self.player.increase_stat(stat_name, value)
-        elif cmd == 'goto':
-            target_scene = args[0]
-            pass
-        elif cmd == 'place':
-            objname, filename = args[0], args[1]
-            try:
-                image = pygame.image.load(filename).convert_alpha()
-                if len(args) == 4:
-                    x_pos, y_pos = int(args[2]), int(args[3])
-                else:
-                    default_x = (SCREEN_WIDTH - image.get_width()) // 2
-                    default_y = SCREEN_HEIGHT - image.get_height()
-                    x_pos, y_pos = default_x, default_y
+        registry.dispatch(self, command)
+
+    @registry.handler("bg")
+    def command_bg(self, filename, transition=None):
+        try:
+            # 빌드된 해상도별 배경이 없을 때만 불러올 때 한 번 스케일한다
+            image = self.assets.load_background(filename)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading image '{filename}': {e}")
+            return
+        rect = image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        old = self.background
+        self.background = {'image': image, 'rect': rect, 'file': filename}
+        self.stage.background = self.background
+        if transition == 'dissolve' and old:
+            self.tweens.add(BG_LAYER, DissolveTween(old['image'], old['rect'], image))
+        elif transition:
+            self.tweens.add(BG_LAYER, FadeTween(image))
+
+    @registry.handler("stat")
+    def command_stat(self, stat_name, value):
+        self.player.increase_stat(stat_name, value)
+        if self.telemetry:
+            self.telemetry.record("stat", self.cursor.scene_name, stat_name, value)
+
+    @registry.handler("goto")
+    def command_goto(self, scene):
+        self.cursor.jump(scene)
+
+    @registry.handler("place")
+    def command_place(self, objname, filename, x_pos=None, y_pos=None, transition=None):
+        try:
+            image = self.assets.load_image(filename)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading image '{filename}': {e}")
+            return
+        if x_pos is None or y_pos is None:
+            x_pos = (SCREEN_WIDTH - image.get_width()) // 2
+            y_pos = SCREEN_HEIGHT - image.get_height()
+        rect = image.get_rect(x=x_pos, y=y_pos)
+        old = self.placed_objects.get(objname)
+        self.placed_objects[objname] = {'image': image, 'rect': rect, 'file': filename}
+        if transition:
+            self.start_transition(objname, transition, old)
+
+    @registry.handler("show")
+    def command_show(self, name, options, transition=None):
+        """Layered sprite: options change only the named layers of a sprite already on stage"""
+        if name not in self.sprites:
+            print(f"Warning: Character '{name}' has no sprite.")
+            return
+        old = self.placed_objects.get(name)
+        try:
+            image, selection = self.sprites.compose(name, options, old.get('layers') if old else None)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error composing sprite '{name}': {e}")
+            return
+        if old and 'layers' in old:
+            rect = image.get_rect(topleft=old['rect'].topleft)
+        else:
+            rect = image.get_rect(midbottom=(SCREEN_WIDTH // 2, SCREEN_HEIGHT))
+        self.placed_objects[name] = {'image': image, 'rect': rect, 'file': f"sprite:{name}", 'layers': selection}
+        if transition:
+            self.start_transition(name, transition, old)
+
+    @registry.handler("remove")
+    def command_remove(self, objname, transition=None):
+        if objname not in self.placed_objects:
+            print(f"Warning: Object '{objname}' not found for removal.")
+            return
+        obj = self.placed_objects.pop(objname)
+        if self.memory_tracker:
+            self.memory_tracker.watch_release(obj['image'], f"{objname} ({obj.get('file')})")
+        if transition:
+            self.tweens.add_ghost(objname, obj['image'], obj['rect'],
+                                  FadeTween(obj['image'], fade_in=False))
+
+    @registry.handler("end")
+    def command_end(self):
+        if self.telemetry:
+            self.telemetry.record("end", self.cursor.scene_name)
+        self.cursor.stop()
+        self.effects.clear()
+        self.state = "MAP"
 
-                rect = image.get_rect(x=x_pos, y=y_pos)
-                self.placed_objects[objname] = {'image': image, 'rect': rect}
-            except pygame.error as e:
+    @registry.handler("effect")
+    def command_effect(self, name, density=1.0):
+        self.effects.start(name, density)
+
+    @registry.handler("effect_stop")
+    def command_effect_stop(self, name=None):
+        self.effects.stop(name)
+
+    async def run_dialogue_command_async(self, command):
+        """Like run_dialogue_command, but image loads and waits suspend the scene instead of the frame"""
+        if not command.get('checked'):
+            try:
+                command = registry.compile(command)
+            except CommandError as e:
+                print(f"Error in command '{command['command']}': {e}")
+                return
+        cmd, args = command['command'], command['args']
+        if cmd == 'wait':
+            # 동기 루프에서는 기다리지 않는다 (wait에는 핸들러가 없다)
+            # 게임 시간으로 기다리고, 쉬는 동안 이벤트 대기에서 제때 깨어나도록 알려 둔다
+            self.pacer.wake_at(time.perf_counter() + args[0])
+            await self.runtime.sleep(args[0])
+            return
+        if cmd in ('bg', 'place'):
+            filename = args[0] if cmd == 'bg' else args[1]
+            try:
+                await self.assets.load_image_async(filename, self.runtime, alpha=cmd != 'bg')
+            except (pygame.error, FileNotFoundError) as e:
                 print(f"Error loading image '{filename}': {e}")
-        elif cmd == 'remove':
-            objname = args[0]
-            if objname in self.placed_objects:
-                del self.placed_objects[objname]
+                return
+        self.run_dialogue_command(command)
+        if command['transition']:
+            await self.wait_for_tweens()
+
+    async def wait_for_tweens(self):
+        while self.tweens.is_active():
+            await self.runtime.next_frame()
+
+    def start_transition(self, objname, transition, old=None):
+        obj = self.placed_objects[objname]
+        image, rect = obj['image'], obj['rect']
+        if transition == 'dissolve' and old:
+            tween = DissolveTween(old['image'], old['rect'], image)
+        elif transition == 'slide_left':
+            tween = MoveTween((-rect.width, rect.y))
+        elif transition == 'slide_right':
+            tween = MoveTween((SCREEN_WIDTH, rect.y))
+        elif transition == 'move':
+            tween = MoveTween(old['rect'].topleft if old else rect.topleft)
+        elif transition == 'zoom':
+            tween = ZoomTween(image, 0.8)
+        else:
+            tween = FadeTween(image)
+        self.tweens.add(objname, tween)
+
+    def update(self, dt):
+        self.tweens.update(dt)
+        if self.state == "VISUAL_NOVEL":
+            self.effects.update(dt)
+        self.ui[self.state].update(dt)
+        if self.walk_path and self.state == "MAP":
+            self.walk_timer += dt
+            while self.walk_path and self.walk_timer >= WALK_STEP_SECONDS:
+                self.walk_timer -= WALK_STEP_SECONDS
+                x, y = self.walk_path.pop(0)
+                self.step_player([x - self.map_data.x, y - self.map_data.y])
+
+    def step_player(self, vector):
+        arrived = self.map_data.move(vector, self.player)
+        self.player.activities_today += 1
+        if self.map_data.pending_scenes:
+            scene = self.map_data.pending_scenes.pop(0)
+            self.map_data.pending_scenes.clear()
+            self.walk_to(None)
+            self.start_scene(scene)
+        elif arrived:
+            # 건물에 들어서면 오늘 그곳에 있는 인물이 말을 건다
+            structure = self.map_data.structure_at.get((self.map_data.x, self.map_data.y))
+            for name in self.npcs.npcs_at(structure["name"]) if structure else []:
+                if self.talk_to(name):
+                    break
+
+    def talk_to(self, name):
+        """Show the character's best conditional line (data/character.json dialogues) over the map"""
+        character = self.characters.get(name)
+        rule = character.get_main_dialogue(self.get_dialogue_conditions()) if character else None
+        if rule is None:
+            return False
+        self.walk_to(None)
+        if self.runtime:
+            self.runtime.spawn("talk", self.play_line(name, rule["text"]))
+            return True
+        # 장면 없이 한 줄: 클릭하면 advance_story가 지도로 돌아간다
+        self.cursor.stop()
+        self.state = "VISUAL_NOVEL"
+        self.show_line(name, rule["text"])
+        return True
+
+    async def play_line(self, speaker, text):
+        self.cursor.stop()
+        self.state = "VISUAL_NOVEL"
+        self.show_line(speaker, text)
+        self.advance_waiter = asyncio.get_running_loop().create_future()
+        await self.advance_waiter
+        self.state = "MAP"
+
+    def start_scene(self, scene_name):
+        if self.runtime:
+            self.runtime.spawn("scene", self.play_scene(scene_name))
+            return
+        self.state = "VISUAL_NOVEL"
+        self.cursor.jump(scene_name)
+        self.advance_story()
+
+    async def play_scene(self, scene_name):
+        """advance_story as a coroutine: lines, choices, loads and waits suspend it"""
+        self.state = "VISUAL_NOVEL"
+        self.cursor.jump(scene_name)
+        loop = asyncio.get_running_loop()
+        while self.state == "VISUAL_NOVEL":
+            self.sync_scene()
+            component = self.cursor.next()
+            if component is None:
+                self.cursor.stop()
+                self.state = "MAP"
+            elif component['type'] == 'utter':
+                self.show_line(component['speaker'], component['utter'])
+                self.advance_waiter = loop.create_future()
+                await self.advance_waiter
+            elif component['type'] == 'choice':
+                self.show_choice(component['options'])
+                self.choice_waiter = loop.create_future()
+                target = await self.choice_waiter
+                if not self.cursor.jump(target):
+                    self.state = "MAP"
+            elif component['command'] == 'goto':
+                self.cursor.jump(component['args'][0])
+            else:
+                await self.run_dialogue_command_async(component)
+        self.sync_scene()
+
+    def advance_story(self):
+        """Run commands up to the next line or choice; leaving the scene returns to the map"""
+        while self.state == "VISUAL_NOVEL":
+            self.sync_scene()
+            component = self.cursor.next()
+            if component is None:
+                self.cursor.stop()
+                self.state = "MAP"
+            elif component['type'] == 'utter':
+                self.show_line(component['speaker'], component['utter'])
+                return
+            elif component['type'] == 'choice':
+                self.show_choice(component['options'])
+                return
             else:
-                print(f"Warning: Object '{objname}' not found for removal.")
-        elif cmd == 'end':
+                self.run_dialogue_command(component)
+        self.sync_scene()
+
+    def sync_scene(self):
+        if self.cursor.scene_name == self.scene_name:
+            return
+        self.scene_name = self.cursor.scene_name
+        if self.telemetry and self.scene_name:
+            self.telemetry.record("scene", self.scene_name)
+        if self.runtime and self.scene_name:
+            if self.preload_task and not self.preload_task.done():
+                self.preload_task.cancel()
+            self.preload_task = self.runtime.spawn("preload", self.preloader.preload(self.scene_name, self.runtime))
+        if self.memory_tracker:
+            self.memory_tracker.checkpoint(self.scene_name or "map", self.assets.images.values())
+            for category, usage in budget.report().items():
+                print(f"[memory]   {category}: {usage['bytes'] / 1048576:.1f} MiB in {usage['entries']} entries")
+
+    def show_choice(self, options):
+        self.choice_menu.clear()
+        self.choice_options = []
+        for option in options:
+            condition = option['condition']
+            if condition and self.player.stats.get(condition['stat'], 0) < condition['value']:
+                continue
+            self.choice_options.append(option)
+            self.choice_menu.add_button(option['text'], lambda target=option['target']: self.choose(target))
+
+    def choose(self, target):
+        if self.telemetry:
+            self.telemetry.record("choice", self.cursor.scene_name, scene_key(target))
+        self.choice_menu.clear()
+        self.choice_options = []
+        if self.choice_waiter is not None:
+            waiter, self.choice_waiter = self.choice_waiter, None
+            waiter.set_result(target)
+        elif self.cursor.jump(target):
+            self.advance_story()
+        else:
             self.state = "MAP"
 
+    def reload_story(self, changed):
+        """Scenes in changed were recompiled; keep playing from the same position"""
+        if self.cursor.scene_name not in changed:
+            return
+        if not self.cursor.rebase():
+            print(f"Warning: Scene '{self.cursor.scene_name}' was removed; returning to the map.")
+            self.cursor.stop()
+            self.choice_menu.clear()
+            self.state = "MAP"
+
+    def reload_image(self, filename):
+        # 바뀐 파일의 surface만 캐시에서 빼고, 화면에 있으면 새 이미지로 바꾼다
+        self.assets.evict(filename)
+        if self.background and self.background.get('file') == filename:
+            self.run_dialogue_command({'command': 'bg', 'args': [filename]})
+        self.sprites.evict_file(filename)
+        for objname, obj in list(self.placed_objects.items()):
+            if 'layers' in obj and self.sprites.uses_file(objname, filename):
+                self.run_dialogue_command({'command': 'show', 'args': [objname]})
+            elif obj.get('file') == filename:
+                try:
+                    obj['image'] = self.assets.load_image(filename)
+                except (pygame.error, FileNotFoundError) as e:
+                    print(f"Error loading image '{filename}': {e}")
+                    continue
+                obj['rect'] = obj['image'].get_rect(topleft=obj['rect'].topleft)
+                self.stage.invalidate()
+        if filename == self.map_data.renderer.tileset.filename:
+            self.map_data.renderer.tileset = TileSet(filename)
+            self.map_data.renderer.invalidate_all()
+
+    def reload_data(self, filename):
+        if filename == "data/character.json":
+            used = self.dialogue_rules.used_ids()
+            old_npcs = self.npcs
+            self.characters = {}
+            self.load_characters(filename)
+            self.dialogue_rules.restore_used(used)
+            self.npcs.carry_over(old_npcs)
+            self.npcs.sync_to(self.characters)
+        elif filename == "data/encounters.json":
+            state = self.map_data.encounters.get_state()
+            self.map_data.encounters = EncounterEngine.from_file(filename)
+            self.map_data.encounters.restrict(self.story)
+            self.map_data.encounters.set_state(state)
+        elif filename == "data/map_data.json":
+            self.map_data.load_tiles(filename)
+            self.map_data.renderer.invalidate_all()
+            self.map_data.pathfinder.invalidate()
+        else:
+            print(f"{filename} changed; restart to apply it.")
+
+    def walk_to(self, path):
+        self.walk_path = list(path) if path else []
+        self.walk_timer = 0.0
+
+    def walk_to_structure(self, name):
+        self.walk_to(self.map_data.path_to_structure(name))
+
+    def show_line(self, speaker, text):
+        self.backlog.append((self.cursor.scene_name, self.cursor.index - 1, speaker, text))
+        self.dialog_box.set_line(speaker, text)
+
+    def search_backlog(self, query):
+        """Shown lines containing query as displayed (in the current language), oldest first.
+
+        In the source language script lines are looked up in the index;
+        otherwise the backlog (at most BACKLOG_SIZE lines) is matched against
+        the translated text.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        if translator.language != SOURCE_LANGUAGE:
+            return [
+                (speaker, text) for scene, index, speaker, text in self.backlog
+                if query in normalize(_(text))
+            ]
+        matches = self.script_index.matches(query)
+        return [
+            (speaker, text) for scene, index, speaker, text in self.backlog
+            if (scene, index) in matches or (scene is None and query in normalize(text))
+        ]
+
     def process_dialogue(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            pass
-        pass
+            if self.dialog_box.is_animating():
+                self.dialog_box.finish_line()
+            elif self.advance_waiter is not None:
+                waiter, self.advance_waiter = self.advance_waiter, None
+                waiter.set_result(None)
+            elif not self.choice_options and self.runtime is None:
+                self.advance_story()
 
     def process_map(self, event):
-        if event.type == pygame.KEYDOWN:
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            tile = self.map_data.renderer.screen_to_tile(event.pos, screen.get_size())
+            if tile:
+                self.walk_to(self.map_data.find_path(tile))
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_w, pygame.K_UP, pygame.K_s, pygame.K_DOWN,
+                             pygame.K_a, pygame.K_LEFT, pygame.K_d, pygame.K_RIGHT):
+                self.walk_to(None)
             if event.key == pygame.K_w or event.key == pygame.K_UP:
-                self.map_data.move([0, -1])
-                self.player.activities_today += 1
+                self.step_player([0, -1])
             elif event.key == pygame.K_s or event.key == pygame.K_DOWN:
-                self.map_data.move([0, 1])
-                self.player.activities_today += 1
+                self.step_player([0, 1])
             elif event.key == pygame.K_a or event.key == pygame.K_LEFT:
-                self.map_data.move([-1, 0])
-                self.player.activities_today += 1
+                self.step_player([-1, 0])
             elif event.key == pygame.K_d or event.key == pygame.K_RIGHT:
-                self.map_data.move([1, 0])
-                self.player.activities_today += 1
+                self.step_player([1, 0])
+            elif event.key == pygame.K_n:
+                # 하루 마치기
+                self.next_day()
+                if "end_day" in self.story:
+                    self.start_scene("end_day")
 
     def render_title_screen(self):
         screen.fill(BLACK)
-        title_text = self.title_font.render("My Pygame Game", True, WHITE)
-        screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 200))
-
-        self.buttons.clear()  # 매 프레임마다 버튼 리스트 초기화
-
-        button_width, button_height = 200, 50
-
-        # 텍스트 렌더링을 위한 임시 함수
-
-
-
-        # 새 게임 버튼 동적 생성
-        normal_surf = pygame.Surface((button_width, button_height))
-        normal_surf.fill(GRAY)
-        render_text_to_surf("새 게임", normal_surf, self.main_font)
-        self.buttons.append(
-            Button(
-                pygame.Rect(SCREEN_WIDTH // 2 - button_width // 2, SCREEN_HEIGHT // 2 - 50, button_width,
-                            button_height),
-                normal_surf, self.start_new_game
-            )
-        )
-
-        # 불러오기 버튼 동적 생성
-        normal_surf_load = pygame.Surface((button_width, button_height))
-        normal_surf_load.fill(GRAY)
-        render_text_to_surf("불러오기", normal_surf_load, self.main_font)
-        self.buttons.append(
-            Button(
-                pygame.Rect(SCREEN_WIDTH // 2 - button_width // 2, SCREEN_HEIGHT // 2 + 10, button_width,
-                            button_height),
-                normal_surf_load, self.load_game
-            )
-        )
-
-        # 게임 종료 버튼 동적 생성
-        normal_surf_quit = pygame.Surface((button_width, button_height))
-        normal_surf_quit.fill(GRAY)
-        render_text_to_surf("게임 종료", normal_surf_quit, self.main_font)
-        self.buttons.append(
-            Button(
-                pygame.Rect(SCREEN_WIDTH // 2 - button_width // 2, SCREEN_HEIGHT // 2 + 70, button_width,
-                            button_height),
-                normal_surf_quit, self.end_game
-            )
-        )
+        self.title_ui.render(screen)
 
     def render_dialogue(self):
-        for obj in self.placed_objects.values():
-            screen.blit(obj['image'], obj['rect'])
+        screen.fill(BLACK)
+        # 배경, 캐릭터, 진행 중인 전환은 stage가 한 번의 blits로 합성한다
+        self.dialogue_ui.render(screen)
 
     def render_map(self):
-        self.map_data.render()
+        self.render_status()
+        self.map_ui.render(screen)
 
     def render_status(self):
         stat_data = self.player.stats
+        self.status_panel.set_values({N_("Day"): self.player.day, **stat_data})
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.end_game()
+            # 현재 화면의 위젯 트리가 먼저 이벤트를 처리한다
+            if self.ui[self.state].handle_event(event):
+                continue
+
+            if self.state == "VISUAL_NOVEL":
+                self.process_dialogue(event)
+            elif self.state == "MAP":
+                self.process_map(event)
 
-    def render_menu(self):
-        pass
+        if self.hot_reload and self.hot_reload.poll():
+            self.pacer.request_redraw()
+
+    def render_frame(self):
+        if self.state == "TITLE":
+            self.render_title_screen()
+        elif self.state == "VISUAL_NOVEL":
+            self.render_dialogue()
+        elif self.state == "MAP":
+            self.render_map()
+        pygame.display.flip()
 
     def run(self):
+        try:
+            dt = 0
+            while self.game_running:
+                events = self.pacer.poll_events()
+                self.handle_events(events)
+                self.update(dt)
+
+                # 렌더링 파트: 바뀐 것이 없으면 그리지 않는다
+                if not self.pacer.should_render(events):
+                    dt = self.pacer.end_frame(rendered=False)
+                    continue
+
+                self.render_frame()
+                dt = self.pacer.end_frame()
+                if self.telemetry:
+                    self.telemetry.sample_frame(dt)
+        finally:
+            # 예외로 끝나도 쌓인 이벤트를 디스크에 쓴다
+            if self.telemetry:
+                self.telemetry.close()
+
+    async def run_async(self):
+        """run() on asyncio: scenes, asset loads and saves are tasks that never block a frame"""
+        self.runtime = AsyncRuntime()
+        # 장면 작업이 다음 프레임을 기다리고 있으면 풀 프레임을 유지한다
+        self.pacer.add_activity_source(lambda: bool(self.runtime.frame_waiters))
+        frames = self.runtime.spawn("frames", self.frame_loop())
+        try:
+            await frames
+        finally:
+            await self.runtime.shutdown()
+            if self.task_stats:
+                for name, stats in self.runtime.stats.report().items():
+                    print(f"[tasks] {name}: {stats}")
+            if self.telemetry:
+                self.telemetry.close()
+
+    async def frame_loop(self):
+        dt = 0
         while self.game_running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.end_game()
-                # Button 클래스의 handle_event() 메서드를 호출하여 이벤트 처리
-                if self.buttons:
-                    for button in self.buttons:
-                        if button.handle_event(event):
-                            break  # 버튼이 클릭되면 더 이상 다른 버튼을 확인할 필요 없음
-
-                if self.state == "VISUAL_NOVEL":
-                    self.process_dialogue(event)
-                elif self.state == "MAP":
-                    self.process_map(event)
-
-            # 렌더링 파트
-            if self.state == "TITLE":
-                self.render_title_screen()
-            elif self.state == "VISUAL_NOVEL":
-                self.render_dialogue()
-            elif self.state == "MAP":
-                self.render_map()
-
-            pygame.display.flip()
-            clock.tick(60)
+            events = await self.pacer.poll_events_async(self.runtime)
+            frame_start = time.perf_counter()
+            self.handle_events(events)
+            self.update(dt)
+            rendered = self.pacer.should_render(events)
+            if rendered:
+                self.render_frame()
+            elapsed = time.perf_counter() - frame_start
+            self.runtime.stats.record("frame", elapsed, elapsed, 1, elapsed)
+            self.runtime.frame_done()
+            dt = await self.pacer.end_frame_async(rendered)
+            self.runtime.advance(dt)
+            remaining = self.runtime.next_timer()
+            if remaining is not None:
+                self.pacer.wake_at(time.perf_counter() + remaining)
+            if self.telemetry and rendered:
+                self.telemetry.sample_frame(dt)
 
 
 # ====================================================================
 # [4] 실행
 # ====================================================================
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    game = Game(dev="--dev" in sys.argv, trace_memory="--trace-memory" in sys.argv,
+                telemetry="--telemetry" in sys.argv, task_stats="--stats" in sys.argv)
+    if "--sync" in sys.argv:
+        game.run()
+    else:
+        asyncio.run(game.run_async())
\ No newline at end of file
@@ -0,0 +1,178 @@
+import gc
+import sys
+import tracemalloc
+import weakref
+from collections import OrderedDict
+
+from config import memory_budgets
+
+# pygame.font.Font는 크기를 알 수 없어 글꼴 하나당 추정치로 센다
+FONT_ESTIMATE = 256 * 1024
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by nested dicts/lists/tuples/strings (parsed scripts, JSON)"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    return size
+
+
+class MemoryBudget:
+    """Byte accounting per category; going over a category's budget evicts its coldest entries.
+
+    Every cache registers what it keeps with an evict callback that drops its own
+    reference; entries are touched on every cache hit. A callback returning False
+    keeps its entry (still in use, e.g. on stage). Keys are global: owners that
+    can exist more than once per process prefix them with id(self).
+    """
+
+    def __init__(self, budgets=None):
+        self.budgets = dict(budgets or {})
+        self.entries = {}
+        self.usage = {}
+        self.evictions = {}
+
+    def category(self, name):
+        entries = self.entries.get(name)
+        if entries is None:
+            entries = self.entries[name] = OrderedDict()
+            self.usage[name] = 0
+            self.evictions[name] = 0
+        return entries
+
+    def register(self, category, key, nbytes, evict=None, pinned=False):
+        entries = self.category(category)
+        old = entries.pop(key, None)
+        if old is not None:
+            self.usage[category] -= old[0]
+        entries[key] = (nbytes, evict, pinned)
+        self.usage[category] += nbytes
+        self.enforce(category, keep=key)
+
+    def touch(self, category, key):
+        entries = self.entries.get(category)
+        if entries is not None and key in entries:
+            entries.move_to_end(key)
+
+    def release(self, category, key):
+        """The owner dropped key itself"""
+        entries = self.entries.get(category)
+        if entries is None:
+            return
+        entry = entries.pop(key, None)
+        if entry is not None:
+            self.usage[category] -= entry[0]
+
+    def release_all(self, category):
+        self.category(category).clear()
+        self.usage[category] = 0
+
+    def enforce(self, category, keep=None):
+        limit = self.budgets.get(category)
+        if limit is None:
+            return
+        entries = self.entries[category]
+        # 가장 오래 쓰지 않은 것부터 비운다
+        for key in list(entries):
+            if self.usage[category] <= limit:
+                break
+            nbytes, evict, pinned = entries[key]
+            if pinned or key == keep or evict is None:
+                continue
+            if evict() is False:
+                # 주인이 아직 쓰고 있다 (화면에 있는 이미지): 메모리가 그대로이므로 계속 센다
+                continue
+            del entries[key]
+            self.usage[category] -= nbytes
+            self.evictions[category] += 1
+
+    def set_budget(self, category, nbytes):
+        self.budgets[category] = nbytes
+        if category in self.entries:
+            self.enforce(category)
+
+    def report(self):
+        return {
+            category: {
+                "bytes": self.usage[category],
+                "budget": self.budgets.get(category),
+                "entries": len(entries),
+                "evictions": self.evictions[category],
+            }
+            for category, entries in self.entries.items()
+        }
+
+
+budget = MemoryBudget(memory_budgets)
+
+
+class MemoryTracker:
+    """tracemalloc snapshots at scene transitions, plus surfaces that outlive their removal"""
+
+    def __init__(self, frames=1, top=10):
+        self.top = top
+        self.previous = None
+        self.previous_label = None
+        self.released = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def watch_release(self, obj, label):
+        """obj should be garbage once nothing but caches refer to it"""
+        try:
+            self.released.append((weakref.ref(obj), label))
+        except TypeError:
+            pass
+
+    def leaked(self, cached=()):
+        """Watched objects still alive that no cache in cached holds"""
+        gc.collect()
+        cached_ids = {id(obj) for obj in cached}
+        alive = []
+        remaining = []
+        for ref, label in self.released:
+            obj = ref()
+            if obj is None:
+                continue
+            remaining.append((ref, label))
+            if id(obj) not in cached_ids:
+                alive.append(label)
+        self.released = remaining
+        return alive
+
+    def checkpoint(self, label, cached=()):
+        """Snapshot now and print the biggest growth since the previous checkpoint"""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        diff = []
+        if self.previous is not None:
+            diff = snapshot.compare_to(self.previous, "lineno")[:self.top]
+            total = sum(stat.size_diff for stat in diff)
+            print(f"[memory] {self.previous_label} -> {label}: {total / 1024:+.1f} KiB in top {len(diff)}")
+            for stat in diff:
+                if stat.size_diff:
+                    print(f"[memory]   {stat}")
+        for name in self.leaked(cached):
+            print(f"[memory]   still alive after remove: {name}")
+        self.previous = snapshot
+        self.previous_label = label
+        return diff
+
+    def stop(self):
+        tracemalloc.stop()
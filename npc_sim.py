@@ -0,0 +1,146 @@
+import numpy as np
+
+from resource_pack import resources
+
+HOME = "home"
+DAYS_PER_WEEK = 7
+DEFAULT_PARAMS = {
+    "baseline": 0.0,          # 호감도가 돌아가려는 값
+    "likability_decay": 0.98,  # 하루마다 (호감도 - baseline)에 곱한다
+    "mood_decay": 0.8,
+    "event_chance": 0.15,     # NPC 하루당 기분 이벤트 확률
+    "event_mood": 0.4,        # 이벤트 기분 변화의 표준편차
+    "influence": 0.2,         # 관계망을 따라 퍼지는 기분 비율
+    "spillover": 0.05,        # 친한 NPC의 호감도 변화가 옮겨 가는 비율
+    "mood_likability": 1.0,   # 기분 1당 하루 호감도 변화
+    "meeting_gain": 0.1,      # 같은 장소에서 보낸 활동 하나당 호감도
+    "min_likability": 0.0,
+    "max_likability": 100.0,
+}
+
+
+class NpcSimulation:
+    """Whole-cast daily simulation: likability, mood, schedule and location as arrays.
+
+    Row i of every array is self.names[i]; a day step is a handful of NumPy
+    operations regardless of cast size.
+    """
+
+    def __init__(self, characters, locations, seed=0, params=None):
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.names = [character["name"] for character in characters]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.locations = [HOME] + [name for name in locations if name != HOME]
+        location_index = {name: i for i, name in enumerate(self.locations)}
+        self.rng = np.random.default_rng(seed)
+        n = len(self.names)
+
+        self.likability = np.array([c.get("likability", 0) for c in characters], dtype=np.float64)
+        self.mood = np.array([c.get("mood", 0.0) for c in characters], dtype=np.float64)
+
+        # schedule[i, weekday] = 장소 번호; 정해지지 않은 요일은 시드로 고른다
+        self.schedule = self.rng.integers(0, len(self.locations), size=(n, DAYS_PER_WEEK))
+        for i, character in enumerate(characters):
+            for weekday, place in character.get("schedule", {}).items():
+                if place in location_index:
+                    self.schedule[i, int(weekday) % DAYS_PER_WEEK] = location_index[place]
+
+        # 관계망: 행 i가 영향을 받는 상대의 가중치 (행 합으로 정규화)
+        relations = np.zeros((n, n), dtype=np.float64)
+        for i, character in enumerate(characters):
+            for other, weight in character.get("relationships", {}).items():
+                j = self.index.get(other)
+                if j is not None and j != i:
+                    relations[i, j] = weight
+        totals = np.abs(relations).sum(axis=1, keepdims=True)
+        self.relations = np.divide(relations, totals, out=np.zeros_like(relations), where=totals > 0)
+        self.has_relations = bool(totals.any())
+
+        self.day = 1
+        self.location = self.schedule[:, 0].copy()
+
+    @classmethod
+    def from_file(cls, characters, locations, seed=0, filename="data/npc_sim.json"):
+        try:
+            params = resources.load_json(filename)
+        except FileNotFoundError:
+            params = {}
+        return cls(characters, locations, seed, params)
+
+    def advance(self, days=1, player_location=None, activities=0):
+        """Roll the simulation over days days.
+
+        Meetings count only for the day that just ended: NPCs scheduled at
+        player_location gain likability per activity the player did there.
+        """
+        p = self.params
+        base = p["baseline"]
+        if player_location in self.locations and activities:
+            met = self.location == self.locations.index(player_location)
+            self.likability += met * (p["meeting_gain"] * activities * (1.0 + self.mood))
+
+        n = len(self.names)
+        for _ in range(days):
+            before = self.likability.copy()
+            self.likability = base + (self.likability - base) * p["likability_decay"]
+            self.mood *= p["mood_decay"]
+            events = self.rng.random(n) < p["event_chance"]
+            self.mood += events * self.rng.normal(0.0, p["event_mood"], n)
+            if self.has_relations:
+                self.mood += p["influence"] * (self.relations @ self.mood)
+                self.likability += p["spillover"] * (self.relations @ (self.likability - before))
+            np.clip(self.mood, -1.0, 1.0, out=self.mood)
+            self.likability += p["mood_likability"] * self.mood
+            np.clip(self.likability, p["min_likability"], p["max_likability"], out=self.likability)
+            self.day += 1
+        self.location = self.schedule[:, (self.day - 1) % DAYS_PER_WEEK].copy()
+
+    def location_of(self, name):
+        i = self.index.get(name)
+        return None if i is None else self.locations[self.location[i]]
+
+    def npcs_at(self, location):
+        if location not in self.locations:
+            return []
+        rows = np.flatnonzero(self.location == self.locations.index(location))
+        return [self.names[i] for i in rows]
+
+    def sync_to(self, characters):
+        """Write the arrays back to Character objects (likability as int for dialogue rules)"""
+        for name, character in characters.items():
+            i = self.index.get(name)
+            if i is not None:
+                character.likability = int(round(self.likability[i]))
+                character.mood = float(self.mood[i])
+                character.location = self.locations[self.location[i]]
+
+    def carry_over(self, old):
+        """Take day, RNG and per-name values from a previous simulation (cast reload)"""
+        self.day = old.day
+        self.rng.bit_generator.state = old.rng.bit_generator.state
+        for name, i in self.index.items():
+            j = old.index.get(name)
+            if j is not None:
+                self.likability[i] = old.likability[j]
+                self.mood[i] = old.mood[j]
+        self.location = self.schedule[:, (self.day - 1) % DAYS_PER_WEEK].copy()
+
+    def get_state(self):
+        # 이름으로 저장한다: 등장인물이 바뀐 뒤에 불러와도 값이 엇갈리지 않는다
+        return {
+            "day": self.day,
+            "likability": dict(zip(self.names, self.likability.tolist())),
+            "mood": dict(zip(self.names, self.mood.tolist())),
+            "rng": self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state):
+        """Restore a saved state; values are matched by name like carry_over, new names keep their start values"""
+        self.day = state["day"]
+        for key, values in (("likability", self.likability), ("mood", self.mood)):
+            for name, value in state.get(key, {}).items():
+                i = self.index.get(name)
+                if i is not None:
+                    values[i] = value
+        self.rng.bit_generator.state = state["rng"]
+        self.location = self.schedule[:, (self.day - 1) % DAYS_PER_WEEK].copy()
@@ -0,0 +1,362 @@
+"""Offline renderer: play a route headless and write PNGs, one process per scene segment.
+
+    python offline_render.py render @end_day --choices 0,1 --out renders
+    python offline_render.py render @end_day --frames --fps 30 --out trailer
+    python offline_render.py render @end_day --out renders --reference tests/reference
+    python offline_render.py diff renders tests/reference
+
+The route is planned once in this process (scene entered, state at entry,
+choices taken); each segment is then rendered by a pool worker that
+restores that state. `--reference` (or `diff`) compares the PNGs pixel by
+pixel and exits with 1 when any image differs by more than --max-ratio.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+MAX_SEGMENTS = 1000
+DEFAULT_FPS = 30
+HOLD_SECONDS = 1.0       # frames 모드: 애니메이션이 끝난 뒤 대사를 보여 주는 시간
+MAX_LINE_SECONDS = 10.0  # 한 대사의 타자 효과와 전환 프레임 상한
+DIFF_THRESHOLD = 8       # 채널 차이가 이보다 크면 다른 픽셀
+MAX_DIFF_RATIO = 0.0
+# 이 도구가 만든 출력 폴더 표시: 이 파일이 있는 폴더만 지우고 다시 쓴다
+MARKER = ".offline_render"
+
+worker_game = None
+
+
+# ====================================================================
+# 장면 진행
+# ====================================================================
+def snapshot(game):
+    """What a segment needs to look and branch the same in another process"""
+    return {
+        "stats": dict(game.player.stats),
+        "background": game.background['file'] if game.background else None,
+        "placed": [
+            {"name": name, "file": obj['file'], "pos": list(obj['rect'].topleft), "layers": obj.get('layers')}
+            for name, obj in game.placed_objects.items()
+        ],
+        "effects": list(game.effects.emitters),
+    }
+
+
+def restore(game, state, seed):
+    game.player.stats.clear()
+    game.player.stats.update(state["stats"])
+    game.tweens.clear()
+    game.placed_objects.clear()
+    game.background = game.stage.background = None
+    game.backlog.clear()
+    if state["background"]:
+        game.run_dialogue_command({'command': 'bg', 'args': [state["background"]]})
+    for obj in state["placed"]:
+        if obj["layers"] is None:
+            game.run_dialogue_command({'command': 'place', 'args': [obj["name"], obj["file"], *obj["pos"]]})
+            continue
+        try:
+            image, layers = game.sprites.compose(obj["name"], (), obj["layers"])
+        except (KeyError, pygame.error, FileNotFoundError) as e:
+            print(f"Error composing sprite '{obj['name']}': {e}")
+            continue
+        game.placed_objects[obj["name"]] = {'image': image, 'rect': image.get_rect(topleft=obj["pos"]),
+                                            'file': obj["file"], 'layers': layers}
+    game.effects.clear()
+    # 세그먼트마다 같은 파티클이 나오도록 시드를 다시 정한다
+    game.effects.rng = np.random.default_rng(seed)
+    for name in state["effects"]:
+        game.effects.start(name)
+
+
+def play_segment(game, scene, choices, on_line=None, on_choice=None):
+    """Play scene until the story moves to another scene or ends.
+
+    choices are option indices (into the visible options) taken in order;
+    returns (next scene or None, number of choices used).
+    """
+    from story import scene_key
+
+    game.state = "VISUAL_NOVEL"
+    if not game.cursor.jump(scene):
+        return None, 0
+    name = game.cursor.scene_name
+    used = 0
+    while True:
+        if game.cursor.scene_name != name:
+            return game.cursor.scene_name, used
+        component = game.cursor.next()
+        if component is None:
+            game.cursor.stop()
+            game.state = "MAP"
+            return None, used
+        if component['type'] == 'utter':
+            game.show_line(component['speaker'], component['utter'])
+            if on_line:
+                on_line()
+        elif component['type'] == 'choice':
+            game.show_choice(component['options'])
+            if on_choice:
+                on_choice()
+            if not game.choice_options:
+                return None, used
+            index = choices[used] if used < len(choices) else 0
+            option = game.choice_options[min(index, len(game.choice_options) - 1)]
+            used += 1
+            game.choice_menu.clear()
+            game.choice_options = []
+            if not game.cursor.jump(option['target']):
+                return None, used
+            if scene_key(option['target']) == name:
+                # 같은 장면으로 돌아가는 선택지: 세그먼트를 나눈다
+                return name, used
+        elif component['command'] == 'goto':
+            if not game.cursor.jump(component['args'][0]):
+                return None, used
+            if scene_key(component['args'][0]) == name:
+                # 같은 장면으로 가는 goto도 세그먼트를 나눈다 (반복은 plan_route가 멈춘다)
+                return name, used
+        else:
+            game.run_dialogue_command(component)
+            if game.state != "VISUAL_NOVEL":
+                return None, used
+
+
+def plan_route(game, start, choices, max_segments=MAX_SEGMENTS):
+    """[(scene, state at entry, choices for the segment)] following choices from start"""
+    from story import scene_key
+
+    segments = []
+    scene = scene_key(start)
+    remaining = list(choices)
+    visited = set()
+    while scene is not None and len(segments) < max_segments:
+        # 남은 선택을 쓰지 않고 같은 장면에 돌아왔으면 (goto 반복 등) 끝없이 돈다
+        if (scene, len(remaining)) in visited:
+            print(f"Warning: route returns to '{scene}' without a new choice; stopping there.")
+            break
+        visited.add((scene, len(remaining)))
+        state = snapshot(game)
+        next_scene, used = play_segment(game, scene, remaining)
+        segments.append((scene, state, remaining[:used]))
+        remaining = remaining[used:]
+        game.tweens.clear()
+        scene = next_scene
+    return segments
+
+
+# ====================================================================
+# 작업 프로세스
+# ====================================================================
+def new_game(seed, scripts=None):
+    """Game for rendering; scripts is an extra directory of .txt files (work in progress)"""
+    import main
+    game = main.Game(seed=seed)
+    if scripts:
+        for name in sorted(os.listdir(scripts)):
+            if name.endswith(".txt"):
+                game.story.load_file(os.path.join(scripts, name))
+    return game
+
+
+def init_worker(seed, scripts):
+    global worker_game
+    worker_game = new_game(seed, scripts)
+
+
+def settle(game, dt):
+    """Jump the current line's typing and transitions to their end"""
+    for _ in range(int(MAX_LINE_SECONDS / dt)):
+        if not game.tweens.is_active():
+            break
+        game.tweens.update(dt)
+    game.dialog_box.finish_line()
+
+
+def render_segment(job):
+    """Render one segment in the worker; returns the written paths"""
+    import main
+
+    number, scene, state, choices, out_dir, frames, fps, seed = job
+    game = worker_game
+    restore(game, state, [seed, number])
+    directory = os.path.join(out_dir, f"{number:03d}_{scene.strip('@:')}")
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    dt = 1.0 / fps
+
+    def save():
+        game.render_dialogue()
+        path = os.path.join(directory, f"{len(written):05d}.png")
+        pygame.image.save(main.screen, path)
+        written.append(path)
+
+    def on_line():
+        if not frames:
+            settle(game, dt)
+            save()
+            return
+        # 타자 효과와 전환만 기다린다 (파티클은 끝나지 않는다)
+        busy = 0
+        while (game.dialog_box.is_animating() or game.tweens.is_active()) and busy < int(MAX_LINE_SECONDS * fps):
+            game.update(dt)
+            save()
+            busy += 1
+        for _ in range(int(HOLD_SECONDS * fps)):
+            game.update(dt)
+            save()
+
+    def on_choice():
+        settle(game, dt)
+        save()
+
+    play_segment(game, scene, list(choices), on_line, on_choice)
+    return written
+
+
+def clear_output(directory):
+    """Remove a previous output; refuses a directory this tool did not create"""
+    if not os.path.exists(directory):
+        return True
+    if not os.path.isdir(directory):
+        print(f"Error: '{directory}' is not a directory")
+        return False
+    if os.listdir(directory) and not os.path.exists(os.path.join(directory, MARKER)):
+        print(f"Error: '{directory}' is not empty and was not written by offline_render.py; choose another directory")
+        return False
+    shutil.rmtree(directory)
+    return True
+
+
+def render_route(start, choices, out_dir, frames=False, fps=DEFAULT_FPS, workers=None, seed=0, scripts=None):
+    os.makedirs(out_dir, exist_ok=True)
+    open(os.path.join(out_dir, MARKER), 'w').close()
+    planner = new_game(seed, scripts)
+    segments = plan_route(planner, start, choices)
+    jobs = [
+        (number, scene, state, segment_choices, out_dir, frames, fps, seed)
+        for number, (scene, state, segment_choices) in enumerate(segments)
+    ]
+    # 부모는 SDL을 초기화했으므로 fork 대신 spawn으로 깨끗한 작업 프로세스를 만든다
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_worker, initargs=(seed, scripts)) as pool:
+        results = list(pool.map(render_segment, jobs))
+    return [(scene, paths) for (scene, _, _), paths in zip(segments, results)]
+
+
+# ====================================================================
+# 픽셀 비교
+# ====================================================================
+def png_files(directory):
+    found = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(".png"):
+                found.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(found)
+
+
+def diff_images(actual_path, reference_path, threshold=DIFF_THRESHOLD):
+    """(ratio of differing pixels, mask) or (None, None) when sizes differ"""
+    actual = pygame.surfarray.array3d(pygame.image.load(actual_path)).astype(np.int16)
+    reference = pygame.surfarray.array3d(pygame.image.load(reference_path)).astype(np.int16)
+    if actual.shape != reference.shape:
+        return None, None
+    mask = np.abs(actual - reference).max(axis=2) > threshold
+    return float(mask.mean()), mask
+
+
+def write_diff(path, reference_path, mask):
+    """Reference dimmed to grey with differing pixels in red"""
+    image = pygame.surfarray.array3d(pygame.image.load(reference_path))
+    grey = (image.mean(axis=2, keepdims=True) * 0.4).astype(np.uint8)
+    out = np.repeat(grey, 3, axis=2)
+    out[mask] = (255, 0, 0)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pygame.image.save(pygame.surfarray.make_surface(out), path)
+
+
+def compare(out_dir, reference_dir, threshold=DIFF_THRESHOLD, max_ratio=MAX_DIFF_RATIO):
+    """Compare every reference PNG with out_dir; returns the failing relative paths"""
+    failures = []
+    actual = set(png_files(out_dir))
+    for name in png_files(reference_dir):
+        if name not in actual:
+            print(f"missing: {name}")
+            failures.append(name)
+            continue
+        ratio, mask = diff_images(os.path.join(out_dir, name), os.path.join(reference_dir, name), threshold)
+        if ratio is None:
+            print(f"size differs: {name}")
+            failures.append(name)
+        elif ratio > max_ratio:
+            diff_path = os.path.join(out_dir, "diff", name)
+            write_diff(diff_path, os.path.join(reference_dir, name), mask)
+            print(f"differs: {name} ({ratio:.4%} of pixels, see {diff_path})")
+            failures.append(name)
+    extra = actual - set(png_files(reference_dir)) - {name for name in actual if name.startswith("diff" + os.sep)}
+    for name in sorted(extra):
+        print(f"new: {name}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render scenes offline and compare with references")
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser("render")
+    render.add_argument("scene")
+    render.add_argument("--choices", default="", help="comma-separated option indices along the route")
+    render.add_argument("--out", default="renders")
+    render.add_argument("--frames", action="store_true", help="every frame instead of one image per line")
+    render.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    render.add_argument("--workers", type=int)
+    render.add_argument("--seed", type=int, default=0)
+    render.add_argument("--scripts", help="extra directory of scripts to load")
+    render.add_argument("--reference", help="compare the output with this directory")
+    render.add_argument("--save-reference", action="store_true", help="copy the output to --reference")
+    for command in (render, commands.add_parser("diff")):
+        command.add_argument("--threshold", type=int, default=DIFF_THRESHOLD)
+        command.add_argument("--max-ratio", type=float, default=MAX_DIFF_RATIO)
+    diff = commands.choices["diff"]
+    diff.add_argument("out")
+    diff.add_argument("reference")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        failures = compare(args.out, args.reference, args.threshold, args.max_ratio)
+        return 1 if failures else 0
+
+    choices = [int(choice) for choice in args.choices.split(",") if choice]
+    if not clear_output(args.out):
+        return 1
+    segments = render_route(args.scene, choices, args.out, args.frames, args.fps, args.workers, args.seed,
+                            args.scripts)
+    for scene, paths in segments:
+        print(f"{scene}: {len(paths)} image(s)")
+    if not args.reference:
+        return 0
+    if args.save_reference:
+        if not clear_output(args.reference):
+            return 1
+        shutil.copytree(args.out, args.reference)
+        print(f"Saved reference to {args.reference}")
+        return 0
+    failures = compare(args.out, args.reference, args.threshold, args.max_ratio)
+    if failures:
+        print(f"FAILED: {len(failures)} image(s) differ from {args.reference}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
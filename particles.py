@@ -0,0 +1,136 @@
+import numpy as np
+import pygame
+
+# 깊이 단계: 멀수록 작고 느리고 흐리다 (단계마다 스프라이트 하나)
+DEPTHS = 4
+MARGIN = 32
+
+# 효과 이름 -> 설정. speed는 가장 가까운 단계의 (vx, vy) 픽셀/초
+PRESETS = {
+    "rain": {"count": 1200, "speed": (-120, 900), "jitter": 0.15, "sway": 0, "shape": "streak",
+             "size": 18, "color": (170, 190, 230, 170)},
+    "snow": {"count": 800, "speed": (10, 70), "jitter": 0.4, "sway": 30, "shape": "dot",
+             "size": 4, "color": (255, 255, 255, 230)},
+    "petals": {"count": 300, "speed": (40, 60), "jitter": 0.5, "sway": 60, "shape": "petal",
+               "size": 9, "color": (250, 190, 210, 235)},
+    "dust": {"count": 400, "speed": (6, -4), "jitter": 1.0, "sway": 12, "shape": "dot",
+             "size": 2, "color": (255, 240, 200, 110)},
+}
+
+
+def make_sprite(shape, size, color):
+    if shape == "streak":
+        surface = pygame.Surface((2, size), pygame.SRCALPHA)
+        surface.fill(color)
+    elif shape == "petal":
+        surface = pygame.Surface((size, max(2, size * 2 // 3)), pygame.SRCALPHA)
+        pygame.draw.ellipse(surface, color, surface.get_rect())
+        surface = pygame.transform.rotate(surface, 30)
+    else:
+        radius = max(1, size)
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (radius, radius), radius)
+    return surface
+
+
+class ParticleEmitter:
+    """One running effect; particle i is row i of every array, no per-particle objects.
+
+    Particles leaving the area re-enter on the opposite side; once stopped
+    they are no longer recycled and the emitter ends when all have left.
+    """
+
+    def __init__(self, preset, area, rng, density=1.0):
+        self.area = pygame.Rect(area)
+        self.rng = rng
+        count = max(1, int(preset["count"] * density))
+        width, height = self.area.size
+        self.depth = rng.integers(0, DEPTHS, count)
+        scale = (self.depth + 1) / DEPTHS
+        jitter = 1.0 + preset["jitter"] * rng.uniform(-1.0, 1.0, count)
+        self.vx = preset["speed"][0] * scale * jitter
+        self.vy = preset["speed"][1] * scale * jitter
+        self.x = rng.uniform(-MARGIN, width + MARGIN, count)
+        self.y = rng.uniform(-MARGIN, height + MARGIN, count)
+        self.sway = preset["sway"] * scale
+        self.phase = rng.uniform(0.0, 2 * np.pi, count)
+        self.alive = np.ones(count, dtype=bool)
+        self.time = 0.0
+        self.stopping = False
+        r, g, b, a = preset["color"]
+        self.sprites = [
+            make_sprite(preset["shape"], max(1, round(preset["size"] * (d + 1) / DEPTHS)),
+                        (r, g, b, round(a * (0.4 + 0.6 * (d + 1) / DEPTHS))))
+            for d in range(DEPTHS)
+        ]
+
+    def update(self, dt):
+        self.time += dt
+        self.x += (self.vx + self.sway * np.sin(self.phase + self.time * 1.7)) * dt
+        self.y += self.vy * dt
+        width, height = self.area.size
+        out_x = (self.x < -MARGIN) | (self.x > width + MARGIN)
+        out_y = (self.y < -MARGIN) | (self.y > height + MARGIN)
+        out = out_x | out_y
+        if not out.any():
+            return
+        if self.stopping:
+            self.alive &= ~out
+            return
+        # 화면 밖으로 나간 입자는 반대쪽 가장자리에서 다시 들어온다
+        span_x, span_y = width + 2 * MARGIN, height + 2 * MARGIN
+        self.x[out_x] = (self.x[out_x] + MARGIN) % span_x - MARGIN
+        self.y[out_y] = (self.y[out_y] + MARGIN) % span_y - MARGIN
+        self.x[out_y] = self.rng.uniform(-MARGIN, width + MARGIN, int(out_y.sum()))
+
+    def blits(self):
+        """(sprite, position) sequence for Surface.blits"""
+        rows = np.flatnonzero(self.alive)
+        xs = (self.x[rows] + self.area.x).astype(np.int32).tolist()
+        ys = (self.y[rows] + self.area.y).astype(np.int32).tolist()
+        sprites = self.sprites
+        return zip(map(sprites.__getitem__, self.depth[rows].tolist()), zip(xs, ys))
+
+    def is_done(self):
+        return self.stopping and not self.alive.any()
+
+
+class ParticleSystem:
+    """Named ambient effects between the background and the characters"""
+
+    def __init__(self, area, seed=0):
+        self.area = area
+        self.rng = np.random.default_rng(seed)
+        self.emitters = {}
+
+    def start(self, name, density=1.0):
+        preset = PRESETS.get(name)
+        if preset is None:
+            print(f"Warning: Effect '{name}' not found.")
+            return False
+        self.emitters[name] = ParticleEmitter(preset, self.area, self.rng, density)
+        return True
+
+    def stop(self, name=None):
+        """Stop spawning; the particles on screen drift out. name None stops every effect"""
+        for effect, emitter in self.emitters.items():
+            if name is None or effect == name:
+                emitter.stopping = True
+
+    def clear(self):
+        self.emitters.clear()
+
+    def update(self, dt):
+        if not self.emitters:
+            return
+        for name, emitter in list(self.emitters.items()):
+            emitter.update(dt)
+            if emitter.is_done():
+                del self.emitters[name]
+
+    def draw(self, surface):
+        for emitter in self.emitters.values():
+            surface.blits(emitter.blits(), doreturn=False)
+
+    def is_active(self):
+        return bool(self.emitters)
@@ -0,0 +1,157 @@
+import heapq
+
+import numpy as np
+
+# 지나갈 수 없는 타일 (물)
+BLOCKED_TILES = {3}
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+UNREACHABLE = -1
+
+
+def build_walkable(tiles, width, height):
+    """Boolean (height, width) array of walkable cells"""
+    walkable = np.ones((height, width), dtype=bool)
+    for y, row in enumerate(tiles[:height]):
+        for x, tile_id in enumerate(row[:width]):
+            if tile_id in BLOCKED_TILES:
+                walkable[y, x] = False
+    return walkable
+
+
+def distance_field(walkable, target):
+    """BFS step distance from every cell to target, expanded one wavefront per iteration"""
+    height, width = walkable.shape
+    dist = np.full((height, width), UNREACHABLE, dtype=np.int32)
+    tx, ty = target
+    dist[ty, tx] = 0
+    frontier = np.zeros((height, width), dtype=bool)
+    frontier[ty, tx] = True
+    visited = frontier.copy()
+    step = 0
+    while frontier.any():
+        step += 1
+        grown = np.zeros_like(frontier)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & walkable & ~visited
+        visited |= frontier
+        dist[frontier] = step
+    return dist
+
+
+def astar(walkable, start, goal):
+    """A* over the 4-connected grid; returns the list of cells after start, or None"""
+    height, width = walkable.shape
+    gx, gy = goal
+    if not (0 <= gx < width and 0 <= gy < height) or not walkable[gy, gx]:
+        return None
+    # f가 같으면 더 멀리 간 노드를 먼저 꺼내 평탄한 지형에서 탐색이 퍼지지 않게 한다
+    open_heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+    came_from = {start: None}
+    cost = {start: 0}
+    while open_heap:
+        _, neg_g, current = heapq.heappop(open_heap)
+        g = -neg_g
+        if current == goal:
+            path = []
+            while current != start:
+                path.append(current)
+                current = came_from[current]
+            path.reverse()
+            return path
+        if g > cost[current]:
+            continue
+        cx, cy = current
+        for dx, dy in DIRECTIONS:
+            nx, ny = cx + dx, cy + dy
+            if 0 <= nx < width and 0 <= ny < height and walkable[ny, nx]:
+                new_cost = g + 1
+                if new_cost < cost.get((nx, ny), new_cost + 1):
+                    cost[(nx, ny)] = new_cost
+                    came_from[(nx, ny)] = current
+                    heapq.heappush(open_heap, (new_cost + abs(nx - gx) + abs(ny - gy), -new_cost, (nx, ny)))
+    return None
+
+
+class PathFinder:
+    """Click-to-move paths; distance fields per structure are cached until the map changes"""
+
+    def __init__(self, tile_map):
+        self.map = tile_map
+        self.walkable = None
+        self.fields = {}
+        self.nearest_dist = None
+        self.nearest_index = None
+        self.by_name = None
+
+    def invalidate(self):
+        self.walkable = None
+        self.fields.clear()
+        self.by_name = None
+        self.nearest_dist = None
+        self.nearest_index = None
+
+    def get_walkable(self):
+        if self.walkable is None:
+            self.walkable = build_walkable(self.map.tiles, self.map.width, self.map.height)
+        return self.walkable
+
+    def field_for(self, structure):
+        name = structure["name"]
+        field = self.fields.get(name)
+        if field is None:
+            field = distance_field(self.get_walkable(), tuple(structure["pos"]))
+            self.fields[name] = field
+        return field
+
+    def warm_up(self):
+        """Compute every structure's field and the nearest-structure lookup up front"""
+        structures = self.map.structure_place
+        if not structures:
+            return
+        fields = np.stack([self.field_for(structure) for structure in structures])
+        fields = np.where(fields == UNREACHABLE, np.iinfo(np.int32).max, fields)
+        self.nearest_index = fields.argmin(axis=0)
+        self.nearest_dist = fields.min(axis=0)
+
+    def nearest_structure(self, pos, max_distance=None):
+        """Structure fewest steps from pos; None when unreachable or farther than max_distance"""
+        if self.nearest_index is None:
+            self.warm_up()
+            if self.nearest_index is None:
+                return None
+        x, y = pos
+        distance = self.nearest_dist[y, x]
+        if distance == np.iinfo(np.int32).max or (max_distance is not None and distance > max_distance):
+            return None
+        return self.map.structure_place[self.nearest_index[y, x]]
+
+    def path_to_structure(self, start, name):
+        """Descend the cached distance field from start to the named structure"""
+        if self.by_name is None:
+            self.by_name = {s["name"]: s for s in self.map.structure_place}
+        structure = self.by_name.get(name)
+        if structure is None:
+            return None
+        field = self.field_for(structure)
+        x, y = start
+        if field[y, x] == UNREACHABLE:
+            return None
+        height, width = field.shape
+        path = []
+        while field[y, x] > 0:
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and field[ny, nx] == field[y, x] - 1:
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+        return path
+
+    def find_path(self, start, goal):
+        structure = self.map.structure_at.get(tuple(goal))
+        if structure is not None:
+            return self.path_to_structure(start, structure["name"])
+        return astar(self.get_walkable(), tuple(start), tuple(goal))
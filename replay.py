@@ -0,0 +1,240 @@
+"""Input recording and headless replay.
+
+    python replay.py record session.json [--seed N] [--sync]   # play normally, save seed + input
+    python replay.py replay session.json [--render]            # dummy video driver, no frame cap
+
+A recording holds the game seed, the loop it was played on (run_async by
+default, run with --sync), every frame's dt with the input events polled in
+that frame, and state hashes every CHECKPOINT_FRAMES frames. Replay feeds the
+same events and dts back through the same loop, so the game must reach the
+same hashes. On the async loop both sides let pending tasks and executor I/O
+settle before a frame reads its input, so loads finish in the same frame.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pygame
+
+from frame_pacer import run_ready
+
+RECORDING_VERSION = 1
+CHECKPOINT_FRAMES = 60
+INPUT_EVENTS = {
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL,
+}
+TUPLE_ATTRIBUTES = ("pos", "rel", "buttons")
+
+
+def serialize_event(event):
+    attrs = {}
+    for key, value in event.dict.items():
+        if isinstance(value, tuple):
+            attrs[key] = list(value)
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            attrs[key] = value
+    return [event.type, attrs]
+
+
+def deserialize_event(data):
+    event_type, attrs = data
+    attrs = {key: tuple(value) if key in TUPLE_ATTRIBUTES else value for key, value in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+
+async def settle(runtime):
+    """Run woken tasks and wait out executor I/O, so the frame sees the same state in record and replay"""
+    await run_ready()
+    while runtime.io_pending:
+        runtime.io_done.clear()
+        await runtime.io_done.wait()
+        await run_ready()
+
+
+class RecordingPacer:
+    """Wraps the game's FramePacer and records what each frame saw"""
+
+    def __init__(self, game, checkpoint_every=CHECKPOINT_FRAMES, loop="sync"):
+        self.pacer = game.pacer
+        self.game = game
+        self.checkpoint_every = checkpoint_every
+        self.loop = loop
+        self.frames = []
+        self.checkpoints = []
+        self.current = []
+
+    def __getattr__(self, name):
+        return getattr(self.pacer, name)
+
+    def poll_events(self):
+        events = self.pacer.poll_events()
+        self.current = [serialize_event(event) for event in events if event.type in INPUT_EVENTS]
+        return events
+
+    async def poll_events_async(self, runtime=None):
+        events = await self.pacer.poll_events_async(runtime)
+        if runtime is not None:
+            await settle(runtime)
+        self.current = [serialize_event(event) for event in events if event.type in INPUT_EVENTS]
+        return events
+
+    def end_frame(self, rendered=True):
+        return self.record_frame(self.pacer.end_frame(rendered))
+
+    async def end_frame_async(self, rendered=True):
+        return self.record_frame(await self.pacer.end_frame_async(rendered))
+
+    def record_frame(self, dt):
+        self.frames.append([dt, self.current])
+        self.current = []
+        if len(self.frames) % self.checkpoint_every == 0:
+            self.checkpoints.append([len(self.frames), self.game.state_hash()])
+        return dt
+
+    def save(self, filename):
+        recording = {
+            "version": RECORDING_VERSION,
+            "seed": self.game.seed,
+            "loop": self.loop,
+            "checkpoint_every": self.checkpoint_every,
+            "frames": self.frames,
+            "checkpoints": self.checkpoints,
+            "final": self.game.state_hash(),
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(recording, f, separators=(",", ":"))
+
+
+class ReplayPacer:
+    """Stands in for FramePacer: recorded events and dts, no waiting, optional rendering"""
+
+    def __init__(self, game, recording, render=False):
+        self.game = game
+        self.frames = recording["frames"]
+        self.expected = dict((frame, digest) for frame, digest in recording.get("checkpoints", []))
+        self.render = render
+        self.index = 0
+        self.mismatches = []
+
+    def add_activity_source(self, source):
+        pass
+
+    def remove_activity_source(self, source):
+        pass
+
+    def keep_awake(self, seconds=None):
+        pass
+
+    def wake_at(self, when):
+        pass
+
+    def request_redraw(self):
+        pass
+
+    def is_active(self):
+        return True
+
+    def poll_events(self):
+        if self.index >= len(self.frames):
+            return [pygame.event.Event(pygame.QUIT)]
+        return [deserialize_event(data) for data in self.frames[self.index][1]]
+
+    async def poll_events_async(self, runtime=None):
+        if runtime is not None:
+            await settle(runtime)
+        return self.poll_events()
+
+    def should_render(self, events):
+        return self.render
+
+    def end_frame(self, rendered=True):
+        if self.index >= len(self.frames):
+            return 0.0
+        dt = self.frames[self.index][0]
+        self.index += 1
+        expected = self.expected.get(self.index)
+        if expected is not None:
+            actual = self.game.state_hash()
+            if actual != expected:
+                self.mismatches.append((self.index, expected, actual))
+                print(f"Checkpoint mismatch at frame {self.index}: expected {expected}, got {actual}")
+        return dt
+
+    async def end_frame_async(self, rendered=True):
+        return self.end_frame(rendered)
+
+    def get_stats(self):
+        return {"frames": self.index, "mismatches": len(self.mismatches)}
+
+
+def load_recording(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"unsupported recording version {recording.get('version')}")
+    return recording
+
+
+def play(game, loop):
+    if loop == "sync":
+        game.run()
+    else:
+        asyncio.run(game.run_async())
+
+
+def record(filename, seed=None, loop="async"):
+    import main
+    game = main.Game(seed=seed)
+    recorder = RecordingPacer(game, loop=loop)
+    game.pacer = recorder
+    try:
+        play(game, loop)
+    finally:
+        recorder.save(filename)
+        print(f"Recorded {len(recorder.frames)} frames (seed {game.seed}) to {filename}")
+
+
+def replay(filename, render=False):
+    """Run a recording headlessly; returns a result dict (ok is False on any divergence)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    recording = load_recording(filename)
+    import main
+    game = main.Game(seed=recording["seed"])
+    pacer = ReplayPacer(game, recording, render)
+    game.pacer = pacer
+
+    start = time.perf_counter()
+    play(game, recording["loop"])
+    elapsed = time.perf_counter() - start
+
+    final = game.state_hash()
+    if recording.get("final") and final != recording["final"]:
+        pacer.mismatches.append((pacer.index, recording["final"], final))
+        print(f"Final state mismatch: expected {recording['final']}, got {final}")
+    played = sum(dt for dt, _ in recording["frames"])
+    return {
+        "frames": pacer.index,
+        "played_seconds": round(played, 3),
+        "replay_seconds": round(elapsed, 3),
+        "speedup": round(played / elapsed, 1) if elapsed else None,
+        "mismatches": pacer.mismatches,
+        "ok": not pacer.mismatches,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("record", "replay"):
+        print(__doc__)
+        sys.exit(2)
+    command, path = sys.argv[1], sys.argv[2]
+    if command == "record":
+        seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else None
+        record(path, seed, "sync" if "--sync" in sys.argv else "async")
+    else:
+        result = replay(path, render="--render" in sys.argv)
+        print(json.dumps({key: value for key, value in result.items() if key != "mismatches"}))
+        sys.exit(0 if result["ok"] else 1)
@@ -0,0 +1,174 @@
+"""Single-file resource pack read through mmap, with loose-file fallback for development.
+
+    python resource_pack.py build [game.pack] [--prune]   # --prune: leave out assets no scene uses
+    python resource_pack.py list [game.pack]
+
+Layout: MAGIC, u64 index offset, u64 index size, entry data, JSON index
+{name: [offset, size, raw_size, compression, sha256]}.
+"""
+import copy
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+import pygame
+
+MAGIC = b"KVNPACK\x01"
+HEADER = struct.Struct("<8sQQ")
+PACK_PATH = os.environ.get("KVN_PACK", "game.pack")
+PACK_ROOTS = ["assets", "data"]
+# 플레이하면서 생기는 로컬 파일 (세이브, 텔레메트리): 배포 팩에 넣지 않는다
+PACK_EXCLUDE = {"data/saved_data.json", "data/telemetry.db"}
+LOCAL_SUFFIXES = (".tmp", "-journal", "-wal", "-shm")
+# 이미 압축된 포맷은 그대로 저장한다
+STORED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".mp3", ".ogg")
+
+
+def normalize(path):
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def build_pack(out_path=PACK_PATH, roots=PACK_ROOTS, exclude=()):
+    """Pack every file under roots except local play data and the normalized paths in exclude"""
+    exclude = PACK_EXCLUDE | set(exclude)
+    index = {}
+    with open(out_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, 0, 0))
+        for root in roots:
+            for directory, _, files in sorted(os.walk(root)):
+                for name in sorted(files):
+                    path = normalize(os.path.join(directory, name))
+                    if path in exclude or path.endswith(LOCAL_SUFFIXES):
+                        continue
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    compression = None
+                    data = raw
+                    if not path.lower().endswith(STORED_EXTENSIONS):
+                        packed = zlib.compress(raw, 9)
+                        if len(packed) < len(raw):
+                            compression, data = "zlib", packed
+                    index[path] = [out.tell(), len(data), len(raw), compression,
+                                   hashlib.sha256(raw).hexdigest()]
+                    out.write(data)
+        index_offset = out.tell()
+        index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+        out.write(index_bytes)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, index_offset, len(index_bytes)))
+    return index
+
+
+class ResourcePack:
+    """Read-only view of a pack file; stored entries are returned as memoryview slices"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a resource pack")
+        self.view = memoryview(self.map)
+        self.index = json.loads(bytes(self.view[index_offset:index_offset + index_size]).decode("utf-8"))
+
+    def __contains__(self, name):
+        return normalize(name) in self.index
+
+    def read(self, name):
+        offset, size, _, compression, _ = self.index[normalize(name)]
+        data = self.view[offset:offset + size]
+        if compression == "zlib":
+            return zlib.decompress(data)
+        return data
+
+    def verify(self, name):
+        expected = self.index[normalize(name)][4]
+        return hashlib.sha256(self.read(name)).hexdigest() == expected
+
+    def close(self):
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+
+class ResourceLoader:
+    """Opens resources from the pack when present, otherwise from loose files"""
+
+    def __init__(self, pack_path=PACK_PATH):
+        self.pack = None
+        self.json_cache = {}
+        if pack_path and os.path.exists(pack_path):
+            try:
+                self.pack = ResourcePack(pack_path)
+            except (OSError, ValueError) as e:
+                print(f"Error opening resource pack '{pack_path}': {e}")
+
+    def exists(self, path):
+        return (self.pack is not None and path in self.pack) or os.path.exists(path)
+
+    def read_bytes(self, path):
+        if self.pack is not None and path in self.pack:
+            return self.pack.read(path)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def open(self, path):
+        """Binary file object for path"""
+        if self.pack is not None and path in self.pack:
+            return io.BytesIO(self.pack.read(path))
+        return open(path, 'rb')
+
+    def read_text(self, path):
+        return bytes(self.read_bytes(path)).decode("utf-8")
+
+    def load_image(self, path):
+        if self.pack is not None and path in self.pack:
+            return pygame.image.load(io.BytesIO(self.pack.read(path)), os.path.basename(path))
+        return pygame.image.load(path)
+
+    def load_font(self, path, size):
+        return pygame.font.Font(self.open(path), size)
+
+    def load_json(self, path):
+        """Parse a JSON resource on first use; every caller gets its own copy"""
+        data = self.json_cache.get(path)
+        if data is None:
+            text = self.read_text(path)
+            data = json.loads(text) if text.strip() else {}
+            self.json_cache[path] = data
+        # 호출한 쪽이 고쳐도 (Map.place_structure 등) 캐시와 다른 Game은 그대로
+        return copy.deepcopy(data)
+
+    def invalidate(self, path=None):
+        if path is None:
+            self.json_cache.clear()
+        else:
+            self.json_cache.pop(path, None)
+
+
+resources = ResourceLoader()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    command = args[0] if args else "build"
+    path = args[1] if len(args) > 1 else PACK_PATH
+    if command == "build":
+        exclude = set()
+        if "--prune" in sys.argv:
+            # scene_deps.py가 만든 의존성 목록 기준 (먼저 빌드해야 한다)
+            from scene_deps import pruned_files
+            exclude = pruned_files()
+        entries = build_pack(path, exclude=exclude)
+        print(f"Packed {len(entries)} files into {path}" + (f", pruned {len(exclude)}" if exclude else ""))
+    elif command == "list":
+        pack = ResourcePack(path)
+        for name, (offset, size, raw_size, compression, _) in sorted(pack.index.items()):
+            print(f"{name}\t{raw_size}\t{size}\t{compression or 'stored'}")
+        pack.close()
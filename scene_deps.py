@@ -0,0 +1,303 @@
+"""Scene -> asset dependency graph, followed through goto and choice targets.
+
+    python scene_deps.py                 # write assets/build/dependencies.json and report
+    python scene_deps.py --strict        # exit 1 when a script does not compile or a script or sprite references a missing file
+    python scene_deps.py --unreferenced  # list assets no scene uses (pruned by resource_pack.py build --prune)
+
+The game builds the same graph from its live Story to preload the next
+reachable scenes (Preloader).
+"""
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+
+import pygame
+
+from build_assets import BUILD_DIR, load_manifest
+from commands import SEARCH_DIRS, CommandError, registry, resolve_path
+from config import design_height, design_width, preload_budget
+from resource_pack import normalize, resources
+from sprites import SpriteDefinition
+from story import Story, scene_key
+
+DEPENDENCIES_PATH = os.path.join(BUILD_DIR, "dependencies.json").replace(os.sep, "/")
+# 스크립트에서만 쓰는 에셋 폴더: 여기서 어느 장면도 쓰지 않는 파일은 배포에서 뺀다
+PRUNABLE_DIRS = ["assets/image/background", "assets/image/character", "assets/audio/bgm", "assets/audio/voice"]
+IMAGE_KINDS = ("background", "image", "sprite")
+# 크기를 모르는 이미지 (빌드 전): 디자인 해상도 한 장으로 친다
+DEFAULT_IMAGE_BYTES = design_width * design_height * 4
+
+
+def sprite_definitions(filename="data/character.json"):
+    try:
+        characters = resources.load_json(filename).get("characters", [])
+    except FileNotFoundError:
+        return {}
+    return {data["name"]: SpriteDefinition(data["name"], data["sprite"]) for data in characters if data.get("sprite")}
+
+
+def sprite_files(definition, options):
+    """Base, layer defaults and every option a scene names"""
+    files = {definition.base}
+    for layer in definition.layers:
+        for option, path in layer["images"].items():
+            if option == layer.get("default") or option in options:
+                files.add(path)
+    return files
+
+
+def missing_sprite_files(sprites):
+    """{character: [missing file]} over every layer of every sprite, shown by a scene or not"""
+    missing = {}
+    for name, definition in sprites.items():
+        files = sorted({path for path in definition.files() if not resources.exists(path)})
+        if files:
+            missing[name] = files
+    return missing
+
+
+def scene_assets(scene, sprites):
+    """({path: kind}, {missing reference}) used directly by one compiled scene"""
+    assets, missing = {}, set()
+    shows = {}
+
+    def add(kind, path):
+        if resources.exists(path):
+            assets[normalize(path)] = kind
+        else:
+            missing.add(f"{kind}:{path}")
+
+    for component in scene['components']:
+        if component['type'] == 'utter':
+            if component.get('dubbing'):
+                try:
+                    assets[resolve_path("voice", component['dubbing'])] = "voice"
+                except CommandError:
+                    missing.add(f"voice:{component['dubbing']}")
+            continue
+        if component['type'] != 'command' or component['command'] not in registry:
+            continue
+        if component['command'] == 'show':
+            shows.setdefault(component['args'][0], set()).update(component['args'][1])
+            continue
+        for param, value in zip(registry.specs[component['command']].params, component['args']):
+            if param.kind in SEARCH_DIRS and value is not None:
+                add(param.kind, value)
+    for name, options in shows.items():
+        definition = sprites.get(name)
+        if definition is None:
+            missing.add(f"sprite:{name}")
+            continue
+        for path in sprite_files(definition, options):
+            add("sprite", path)
+    return assets, missing
+
+
+def scene_edges(scene):
+    targets = set()
+    for component in scene['components']:
+        if component['type'] == 'choice':
+            targets.update(scene_key(option['target']) for option in component['options'])
+        elif component['type'] == 'command' and component['command'] == 'goto':
+            targets.add(scene_key(component['args'][0]))
+    return targets
+
+
+def build_graph(story, sprites=None):
+    """{scene: {"assets": {path: kind}, "missing": set, "next": set}}"""
+    sprites = sprite_definitions() if sprites is None else sprites
+    graph = {}
+    for name, scene in story.scenes.items():
+        assets, missing = scene_assets(scene, sprites)
+        graph[name] = {"assets": assets, "missing": missing, "next": scene_edges(scene)}
+    return graph
+
+
+def reachable(graph, start, max_depth=None):
+    """[(scene, distance)] breadth-first from start (distance 0); unknown targets are skipped"""
+    start = scene_key(start)
+    if start not in graph:
+        return []
+    order, seen = [], {start}
+    queue = deque([(start, 0)])
+    while queue:
+        name, distance = queue.popleft()
+        order.append((name, distance))
+        if max_depth is not None and distance >= max_depth:
+            continue
+        for target in sorted(graph[name]["next"]):
+            if target in graph and target not in seen:
+                seen.add(target)
+                queue.append((target, distance + 1))
+    return order
+
+
+def closure(graph, start):
+    """Every asset the story can need from start on"""
+    assets = {}
+    for name, _ in reachable(graph, start):
+        assets.update(graph[name]["assets"])
+    return assets
+
+
+def image_bytes(path):
+    """Decoded 32-bit size of an image, 0 when it does not load"""
+    try:
+        width, height = resources.load_image(path).get_size()
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"Error loading image '{path}': {e}")
+        return 0
+    return width * height * 4
+
+
+def unreferenced(graph, directories=PRUNABLE_DIRS):
+    used = {path for node in graph.values() for path in node["assets"]}
+    files = []
+    for directory in directories:
+        for root, _, names in os.walk(directory):
+            for name in sorted(names):
+                path = normalize(os.path.join(root, name))
+                if path not in used:
+                    files.append(path)
+    return sorted(files)
+
+
+def build_manifest(story, sprites=None):
+    sprites = sprite_definitions() if sprites is None else sprites
+    graph = build_graph(story, sprites)
+    assets = {}
+    for name, node in sorted(graph.items()):
+        for path, kind in node["assets"].items():
+            entry = assets.get(path)
+            if entry is None:
+                entry = assets[path] = {"kind": kind, "bytes": image_bytes(path) if kind in IMAGE_KINDS else 0,
+                                        "scenes": []}
+            entry["scenes"].append(name)
+    return {
+        "scenes": {
+            name: {
+                "assets": sorted(node["assets"]),
+                "closure": sorted(closure(graph, name)),
+                "missing": sorted(node["missing"]),
+                "next": sorted(node["next"]),
+            }
+            for name, node in sorted(graph.items())
+        },
+        "assets": assets,
+        "missing_sprites": missing_sprite_files(sprites),
+        # 컴파일되지 않은 스크립트는 장면이 없으므로 참조도 검사할 수 없다
+        "script_errors": {
+            path: [f"{error.line}:{error.column}: {error.message}" for error in errors]
+            for path, errors in sorted(story.errors.items())
+        },
+        "unreferenced": unreferenced(graph),
+    }
+
+
+def write_manifest(manifest, path=DEPENDENCIES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def missing_references(manifest):
+    """{scene, sprite:<character> or script:<path>: missing references or compile errors} from a manifest"""
+    missing = {name: node["missing"] for name, node in manifest["scenes"].items() if node["missing"]}
+    for name, files in manifest["missing_sprites"].items():
+        missing[f"sprite:{name}"] = files
+    for path, errors in manifest["script_errors"].items():
+        missing[f"script:{path}"] = errors
+    return missing
+
+
+def pruned_files(path=DEPENDENCIES_PATH):
+    """Unreferenced sources plus their pre-scaled build outputs, for resource_pack.build_pack"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            files = set(json.load(f).get("unreferenced", []))
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading dependencies '{path}': {e}")
+        return set()
+    for scaled in load_manifest().get("scaled", {}).values():
+        files.update(out for source, out in scaled.items() if source in files)
+    return files
+
+
+class Preloader:
+    """Loads the images of the next reachable scenes ahead of time, nearest first.
+
+    Stops at preload_budget decoded bytes; sizes come from the build manifest
+    when present, otherwise from the first load.
+    """
+
+    def __init__(self, assets, story, sprites, budget_bytes=preload_budget, max_depth=2):
+        # sprites: SpriteCompositor (정의가 바뀌면 그래프에도 반영된다)
+        self.assets = assets
+        self.story = story
+        self.sprites = sprites
+        self.budget_bytes = budget_bytes
+        self.max_depth = max_depth
+        self.graph = None
+        self.version = None
+        try:
+            entries = resources.load_json(DEPENDENCIES_PATH)["assets"]
+            self.sizes = {path: entry["bytes"] for path, entry in entries.items()}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.sizes = {}
+
+    def plan(self, scene):
+        """[(path, alpha)] not yet cached, in the order they are likely needed"""
+        if self.version != self.story.version:
+            # 스크립트가 다시 컴파일되면 그래프도 다시 만든다 (핫 리로드)
+            self.graph = build_graph(self.story, self.sprites.definitions)
+            self.version = self.story.version
+        planned, total = [], 0
+        for name, _ in reachable(self.graph, scene, self.max_depth):
+            for path, kind in sorted(self.graph[name]["assets"].items()):
+                if kind not in IMAGE_KINDS:
+                    continue
+                alpha = kind != "background"
+                if (path, alpha) in self.assets.images or (path, alpha) in planned:
+                    continue
+                size = self.sizes.get(path) or DEFAULT_IMAGE_BYTES
+                if total + size > self.budget_bytes:
+                    return planned
+                total += size
+                planned.append((path, alpha))
+        return planned
+
+    async def preload(self, scene, runtime):
+        for path, alpha in self.plan(scene):
+            try:
+                image = await self.assets.load_image_async(path, runtime, alpha)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error preloading image '{path}': {e}")
+                continue
+            if not self.sizes.get(path):
+                self.sizes[path] = image.get_width() * image.get_height() * 4
+            await asyncio.sleep(0)
+
+
+def main():
+    args = sys.argv[1:]
+    story = Story()
+    manifest = build_manifest(story)
+    write_manifest(manifest)
+    missing = missing_references(manifest)
+    print(f"{len(manifest['scenes'])} scene(s), {len(manifest['assets'])} asset(s) -> {DEPENDENCIES_PATH}")
+    for name, references in missing.items():
+        for reference in references:
+            print(f"missing: {name}: {reference}")
+    if "--unreferenced" in args:
+        for path in manifest["unreferenced"]:
+            print(f"unreferenced: {path}")
+    if "--strict" in args and missing:
+        print(f"FAILED: {sum(len(references) for references in missing.values())} missing file(s) or script error(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
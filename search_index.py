@@ -0,0 +1,164 @@
+"""Full-text search over every dialogue line and choice of the compiled scripts.
+
+    python search_index.py 도서관                   # search assets/script
+    python search_index.py "같이 가자" --speaker 유하람 --dir assets/script --limit 20
+
+Hangul is indexed as syllables and syllable bigrams, other words as
+trigrams; candidates from the postings are confirmed by a substring check,
+so results are exact.
+"""
+import argparse
+import re
+import sys
+import time
+import unicodedata
+from typing import NamedTuple
+
+from story import SCRIPT_DIR, scene_key
+
+HANGUL_RUN = re.compile(r'[가-힣]+')
+WORD_RUN = re.compile(r'[^\W가-힣_]+')
+SPACES = re.compile(r'\s+')
+
+
+class Entry(NamedTuple):
+    path: str
+    scene: str
+    index: int  # 장면 안의 컴포넌트 번호 (StoryCursor.index와 같다)
+    speaker: str
+    text: str
+
+
+def normalize(text):
+    return SPACES.sub(" ", unicodedata.normalize("NFC", text).lower()).strip()
+
+
+def terms(text, query=False):
+    """Index terms of normalized text; for a query only terms every match must contain"""
+    found = set()
+    for match in HANGUL_RUN.finditer(text):
+        run = match.group()
+        if len(run) == 1 or not query:
+            found.update(run)
+        found.update(run[i:i + 2] for i in range(len(run) - 1))
+    for match in WORD_RUN.finditer(text):
+        run = match.group()
+        found.update(run[i:i + 3] for i in range(len(run) - 2))
+    return found
+
+
+class SearchIndex:
+    """Inverted index term -> entry ids, replaceable one script file at a time"""
+
+    def __init__(self):
+        self.postings = {}
+        self.entries = {}
+        self.normalized = {}
+        self.files = {}
+        self.next_id = 0
+
+    def update_file(self, path, scenes):
+        self.remove_file(path)
+        ids = self.files[path] = []
+        for scene in scenes:
+            name = scene_key(scene['name'])
+            for index, component in enumerate(scene['components']):
+                if component['type'] == 'utter':
+                    ids.append(self.add(Entry(path, name, index, component['speaker'], component['utter'])))
+                elif component['type'] == 'choice':
+                    for option in component['options']:
+                        ids.append(self.add(Entry(path, name, index, "", option['text'])))
+
+    def add(self, entry):
+        entry_id = self.next_id
+        self.next_id += 1
+        self.entries[entry_id] = entry
+        text = self.normalized[entry_id] = normalize(entry.text)
+        postings = self.postings
+        for term in terms(text):
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = set()
+            posting.add(entry_id)
+        return entry_id
+
+    def remove_file(self, path):
+        for entry_id in self.files.pop(path, []):
+            for term in terms(self.normalized.pop(entry_id)):
+                posting = self.postings[term]
+                posting.discard(entry_id)
+                if not posting:
+                    del self.postings[term]
+            del self.entries[entry_id]
+
+    def match_ids(self, query):
+        """Ids of entries containing query (case and spacing insensitive), in script order"""
+        query = normalize(query)
+        if not query:
+            return []
+        wanted = terms(query, query=True)
+        if wanted:
+            postings = sorted((self.postings.get(term, set()) for term in wanted), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return []
+        else:
+            # 색인할 수 없는 짧은 검색어 (영문 두 글자 등): 전체를 훑는다
+            candidates = self.normalized.keys()
+        normalized = self.normalized
+        return sorted(entry_id for entry_id in candidates if query in normalized[entry_id])
+
+    def search(self, query, speaker=None, limit=None):
+        results = []
+        for entry_id in self.match_ids(query):
+            entry = self.entries[entry_id]
+            if speaker is not None and entry.speaker != speaker:
+                continue
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def matches(self, query):
+        """{(scene, index)} containing query, for filtering a backlog of shown lines"""
+        return {(self.entries[i].scene, self.entries[i].index) for i in self.match_ids(query)}
+
+    def stats(self):
+        return {
+            "files": len(self.files),
+            "entries": len(self.entries),
+            "terms": len(self.postings),
+            "characters": sum(len(text) for text in self.normalized.values()),
+        }
+
+
+def main():
+    from story import Story
+
+    parser = argparse.ArgumentParser(description="Search dialogue lines and choices in the scripts")
+    parser.add_argument("query")
+    parser.add_argument("--dir", default=SCRIPT_DIR)
+    parser.add_argument("--speaker")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    Story(args.dir, index=index)
+    built = time.perf_counter() - started
+    started = time.perf_counter()
+    results = index.search(args.query, args.speaker, args.limit)
+    searched = time.perf_counter() - started
+    for entry in results:
+        speaker = f"{entry.speaker}: " if entry.speaker else ""
+        print(f"{entry.path}:{entry.scene}#{entry.index}  {speaker}{entry.text}")
+    stats = index.stats()
+    print(f"{len(results)} result(s) in {searched * 1000:.2f} ms "
+          f"({stats['entries']} lines, {stats['characters']} characters, indexed in {built:.2f} s)")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
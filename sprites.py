@@ -0,0 +1,155 @@
+import pygame
+
+from memory_budget import budget, surface_bytes
+
+
+class SpriteDefinition:
+    """Layered character sprite from data/character.json:
+
+        "sprite": {
+          "base": "assets/image/character/haram/body.png",
+          "face": [x, y, width, height],
+          "layers": [
+            {"slot": "outfit", "default": "uniform", "images": {"uniform": "...", "casual": "..."}},
+            {"slot": "expression", "default": "neutral", "face": true, "images": {"neutral": "...", "smile": "..."}},
+            {"slot": "effect", "default": null, "images": {"blush": "..."}}
+          ]
+        }
+
+    Layers are drawn over the base in list order. Face layers are face-sized
+    images drawn at the face rect; the others cover the whole base.
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        self.base = data["base"]
+        self.face = pygame.Rect(data["face"]) if data.get("face") else None
+        self.layers = data.get("layers", [])
+        self.slots = {layer["slot"]: layer for layer in self.layers}
+        # 선택지 이름 -> 슬롯: 스크립트에는 "smile casual"처럼 이름만 쓴다
+        self.option_slot = {}
+        for layer in self.layers:
+            for option in layer["images"]:
+                self.option_slot.setdefault(option, layer["slot"])
+
+    def default_selection(self):
+        return {layer["slot"]: layer.get("default") for layer in self.layers}
+
+    def select(self, options, current=None):
+        """New slot -> option mapping; 'none.<slot>' clears a slot, unknown names are skipped"""
+        selection = dict(current or self.default_selection())
+        for option in options:
+            if option.startswith("none.") and option[5:] in self.slots:
+                selection[option[5:]] = None
+            elif option in self.option_slot:
+                selection[self.option_slot[option]] = option
+            else:
+                print(f"Warning: Sprite '{self.name}' has no layer option '{option}'.")
+        return selection
+
+    def is_face(self, slot):
+        return bool(self.slots[slot].get("face")) and self.face is not None
+
+    def files(self):
+        yield self.base
+        for layer in self.layers:
+            yield from layer["images"].values()
+
+
+class SpriteCompositor:
+    """Composites layered sprites once per unique layer combination.
+
+    Composites live in the "sprite" memory budget (LRU). A combination that
+    differs from a cached one only in face layers copies it and redraws the face
+    rect, so expression changes cost a face-sized blit.
+    """
+
+    def __init__(self, assets):
+        self.assets = assets
+        self.budget_id = id(self)
+        # 화면에 있는 합성은 예산이 넘쳐도 비우지 않는다 (AssetManager.in_use와 같다)
+        self.in_use = lambda image: False
+        self.definitions = {}
+        self.composites = {}
+        # (이름, 얼굴 외 레이어) -> 마지막으로 만든 합성 키
+        self.bodies = {}
+
+    def load(self, characters):
+        self.clear()
+        self.definitions = {
+            data["name"]: SpriteDefinition(data["name"], data["sprite"])
+            for data in characters if data.get("sprite")
+        }
+
+    def __contains__(self, name):
+        return name in self.definitions
+
+    def key(self, name, selection):
+        definition = self.definitions[name]
+        body = tuple(
+            (slot, option) for slot, option in selection.items()
+            if not definition.is_face(slot)
+        )
+        face = tuple((slot, option) for slot, option in selection.items() if definition.is_face(slot))
+        return (name, body), (name, body, face)
+
+    def compose(self, name, options=(), current=None):
+        """(surface, selection) for character name with options applied over current"""
+        definition = self.definitions[name]
+        selection = definition.select(options, current)
+        body_key, key = self.key(name, selection)
+        image = self.composites.get(key)
+        if image is not None:
+            budget.touch("sprite", (self.budget_id, key))
+            return image, selection
+        similar = self.composites.get(self.bodies.get(body_key))
+        if similar is not None:
+            image = similar.copy()
+            image.set_clip(definition.face)
+            self.draw_layers(image, definition, selection)
+            image.set_clip(None)
+        else:
+            base = self.assets.load_image(definition.base)
+            image = pygame.Surface(base.get_size(), pygame.SRCALPHA)
+            self.draw_layers(image, definition, selection)
+        self.cache(body_key, key, image)
+        return image, selection
+
+    def draw_layers(self, image, definition, selection):
+        """Base and selected layers in order; drawing honours the surface clip"""
+        image.fill((0, 0, 0, 0))
+        image.blit(self.assets.load_image(definition.base), (0, 0))
+        for layer in definition.layers:
+            option = selection.get(layer["slot"])
+            if option is None:
+                continue
+            layer_image = self.assets.load_image(layer["images"][option])
+            position = definition.face.topleft if definition.is_face(layer["slot"]) else (0, 0)
+            image.blit(layer_image, position)
+
+    def cache(self, body_key, key, image):
+        self.composites[key] = image
+        self.bodies[body_key] = key
+        budget.register("sprite", (self.budget_id, key), surface_bytes(image), lambda: self.drop(key))
+
+    def drop(self, key):
+        image = self.composites.get(key)
+        if image is not None and self.in_use(image):
+            return False
+        self.composites.pop(key, None)
+        return True
+
+    def uses_file(self, name, filename):
+        return name in self.definitions and filename in self.definitions[name].files()
+
+    def evict_file(self, filename):
+        """Drop composites built from filename (hot reload of one layer image)"""
+        for key in [key for key in self.composites if self.uses_file(key[0], filename)]:
+            self.composites.pop(key)
+            budget.release("sprite", (self.budget_id, key))
+
+    def clear(self):
+        for key in self.composites:
+            budget.release("sprite", (self.budget_id, key))
+        self.composites.clear()
+        self.bodies.clear()
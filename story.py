@@ -0,0 +1,137 @@
+import os
+
+from memory_budget import budget, deep_sizeof
+from resource_pack import resources
+from vn_compiler import VnCompiler
+
+SCRIPT_DIR = "assets/script"
+
+
+def scene_key(name):
+    """'@start' (goto target) and 'start' (encounter scene) name the same scene"""
+    return name.lstrip('@')
+
+
+class Story:
+    """Compiled scenes of every script file, replaceable one file at a time"""
+
+    def __init__(self, directory=SCRIPT_DIR, index=None):
+        self.directory = directory
+        # 검색 색인 (search_index.SearchIndex): 파일을 컴파일할 때마다 그 파일분만 갱신
+        self.index = index
+        self.compiler = VnCompiler(verbose=False)
+        self.scenes = {}
+        self.files = {}
+        # 컴파일에 실패한 파일의 오류 (build_assets --strict가 검사한다)
+        self.errors = {}
+        self.version = 0
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".txt"):
+                    self.load_file(os.path.join(directory, name))
+
+    def compile_file(self, path):
+        try:
+            text = resources.read_text(path)
+        except FileNotFoundError:
+            self.errors.pop(path, None)
+            return []
+        scenes = self.compiler.compile(text)
+        for diagnostic in self.compiler.diagnostics:
+            print(f"{path}:{diagnostic.line}:{diagnostic.column}: {diagnostic.severity}: {diagnostic.message}")
+        if scenes is None or self.compiler.errors:
+            self.errors[path] = list(self.compiler.errors)
+            return None
+        self.errors.pop(path, None)
+        return scenes
+
+    def load_file(self, path):
+        """Compile one file and swap its scenes in; returns the changed scene names.
+
+        A file that fails to compile keeps its previous scenes.
+        """
+        scenes = self.compile_file(path)
+        if scenes is None:
+            return set()
+        old_names = self.files.get(path, [])
+        new_scenes = {scene_key(scene['name']): scene for scene in scenes}
+        changed = set()
+        for name in old_names:
+            if name not in new_scenes:
+                self.scenes.pop(name, None)
+                changed.add(name)
+        for name, scene in new_scenes.items():
+            if self.scenes.get(name) != scene:
+                self.scenes[name] = scene
+                changed.add(name)
+        self.files[path] = list(new_scenes)
+        # 컴파일된 장면은 계속 필요하므로 예산에 세기만 한다
+        budget.register("script", (id(self), path), deep_sizeof(scenes), pinned=True)
+        if changed:
+            self.version += 1
+            if self.index is not None:
+                self.index.update_file(path, scenes)
+        return changed
+
+    def get(self, name):
+        return self.scenes.get(scene_key(name))
+
+    def __contains__(self, name):
+        return scene_key(name) in self.scenes
+
+
+class StoryCursor:
+    """Position in the story: current scene and the index of the next component"""
+
+    def __init__(self, story):
+        self.story = story
+        self.scene_name = None
+        self.index = 0
+        self.components = []
+
+    def jump(self, name):
+        scene = self.story.get(name)
+        if scene is None:
+            print(f"Warning: Scene '{name}' not found.")
+            self.stop()
+            return False
+        self.scene_name = scene_key(name)
+        self.components = scene['components']
+        self.index = 0
+        return True
+
+    def stop(self):
+        self.scene_name = None
+        self.components = []
+        self.index = 0
+
+    def next(self):
+        """Next component of the current scene, or None at its end"""
+        if self.index >= len(self.components):
+            return None
+        component = self.components[self.index]
+        self.index += 1
+        return component
+
+    def rebase(self):
+        """Pick up the recompiled current scene, keeping the position.
+
+        Returns False when the current scene no longer exists.
+        """
+        if self.scene_name is None:
+            return True
+        scene = self.story.get(self.scene_name)
+        if scene is None:
+            return False
+        self.components = scene['components']
+        self.index = min(self.index, len(self.components))
+        return True
+
+    def get_state(self):
+        return {"scene": self.scene_name, "index": self.index}
+
+    def set_state(self, state):
+        if state.get("scene") and self.jump(state["scene"]):
+            self.index = min(state.get("index", 0), len(self.components))
+        else:
+            self.stop()
@@ -0,0 +1,460 @@
+"""Headless story server: one compiled Story shared by many player sessions.
+
+    python story_server.py serve [--host 127.0.0.1] [--port 8765] [--unix PATH]
+    python story_server.py loadgen [--sessions 2000] [--connections 64] [--steps 20]
+
+Protocol: one JSON object per line, one response line per request, in order.
+
+    {"op": "new", "scene": "@end_day"}           -> {"ok": true, "session": "...", "event": {...}}
+    {"op": "step", "session": "..."}             -> {"ok": true, "event": {...}}
+    {"op": "choose", "session": "...", "option": 0}
+    {"op": "save", "session": "..."}             -> {"ok": true, "state": {...}}
+    {"op": "load", "state": {...}}               -> new session from a saved state
+    {"op": "close", "session": "..."}
+    {"op": "stats"}
+
+An event is {"type": "line" | "choice" | "end", ...} plus the stage "effects"
+(bg, place, ...) met on the way, for the front end to show.
+A request's "id" is echoed back. "new" needs a scene of the served story;
+client stats must be integers and a loaded index must lie inside its scene.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from memory_budget import deep_sizeof
+from story import SCRIPT_DIR, Story, StoryCursor
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 100000
+# goto만 반복하는 장면에서 한 step이 끝나지 않는 것을 막는다
+MAX_COMMANDS_PER_STEP = 10000
+STAT_NAMES = ("예술", "문학", "체육", "운", "눈치")
+
+
+class SessionError(ValueError):
+    pass
+
+
+def check_stats(stats):
+    """Client-supplied stats: {name: int}"""
+    if stats is None:
+        return {}
+    if not isinstance(stats, dict):
+        raise SessionError("stats must be an object")
+    for name, value in stats.items():
+        # bool도 int이므로 따로 막는다
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise SessionError(f"stat '{name}' must be an integer")
+    return stats
+
+
+def check_state(state, story):
+    """Client-supplied saved state: scene in the story, 0 <= index <= its length"""
+    if not isinstance(state, dict):
+        raise SessionError("state must be an object")
+    scene = state.get("scene")
+    if not isinstance(scene, str) or scene not in story:
+        raise SessionError(f"scene '{scene}' not found")
+    index = state.get("index", 0)
+    length = len(story.get(scene)['components'])
+    if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index <= length:
+        raise SessionError(f"index must be 0..{length}")
+    check_stats(state.get("stats"))
+    return state
+
+
+class StorySession:
+    """Per-player state only: cursor position, stats and the pending choice.
+
+    Scenes are read from the shared Story and never copied.
+    """
+
+    def __init__(self, story, stats=None):
+        self.cursor = StoryCursor(story)
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
+        self.stats.update(check_stats(stats))
+        self.options = None
+
+    def start(self, scene):
+        self.options = None
+        if not self.cursor.jump(scene):
+            raise SessionError(f"scene '{scene}' not found")
+        return self.step()
+
+    def visible_options(self, options):
+        visible = []
+        for option in options:
+            condition = option['condition']
+            if condition and self.stats.get(condition['stat'], 0) < condition['value']:
+                continue
+            visible.append(option)
+        return visible
+
+    def choice_event(self, effects):
+        return {"type": "choice", "options": [option['text'] for option in self.options], "effects": effects}
+
+    def step(self):
+        """Run commands up to the next line, choice or the end of the story"""
+        effects = []
+        if self.options is not None:
+            return self.choice_event(effects)
+        for _ in range(MAX_COMMANDS_PER_STEP):
+            component = self.cursor.next()
+            if component is None:
+                self.cursor.stop()
+                return {"type": "end", "effects": effects}
+            if component['type'] == 'utter':
+                return {"type": "line", "speaker": component['speaker'], "text": component['utter'],
+                        "dubbing": component['dubbing'], "effects": effects}
+            if component['type'] == 'choice':
+                self.options = self.visible_options(component['options'])
+                return self.choice_event(effects)
+            command, args = component['command'], component['args']
+            if command == 'goto':
+                if not self.cursor.jump(args[0]):
+                    return {"type": "end", "effects": effects}
+            elif command == 'end':
+                self.cursor.stop()
+                return {"type": "end", "effects": effects}
+            elif command == 'stat':
+                if args[0] in self.stats:
+                    self.stats[args[0]] += args[1]
+            else:
+                effects.append({"command": command, "args": args, "transition": component.get('transition')})
+        raise SessionError(f"no line or choice after {MAX_COMMANDS_PER_STEP} commands")
+
+    def choose(self, option):
+        if self.options is None:
+            raise SessionError("no choice pending")
+        if not isinstance(option, int) or isinstance(option, bool) or not 0 <= option < len(self.options):
+            raise SessionError(f"option must be 0..{len(self.options) - 1}")
+        target = self.options[option]['target']
+        self.options = None
+        if not self.cursor.jump(target):
+            return {"type": "end", "effects": []}
+        return self.step()
+
+    def get_state(self):
+        return {**self.cursor.get_state(), "stats": dict(self.stats), "choice": self.options is not None}
+
+    def set_state(self, state):
+        check_state(state, self.cursor.story)
+        self.cursor.set_state(state)
+        self.stats.update(check_stats(state.get("stats")))
+        self.options = None
+        if state.get("choice") and self.cursor.index > 0:
+            # 선택지에서 저장했으면 같은 선택지를 (현재 스탯으로) 다시 보여 준다
+            component = self.cursor.components[self.cursor.index - 1]
+            if component['type'] == 'choice':
+                self.options = self.visible_options(component['options'])
+
+
+class StoryServer:
+    """Sessions keyed by an opaque id; every op is a plain method so it runs without sockets too"""
+
+    def __init__(self, story, max_sessions=MAX_SESSIONS):
+        self.story = story
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.requests = 0
+        self.started = time.perf_counter()
+        self.ops = {
+            "new": self.op_new,
+            "step": self.op_step,
+            "choose": self.op_choose,
+            "save": self.op_save,
+            "load": self.op_load,
+            "close": self.op_close,
+            "stats": self.op_stats,
+        }
+
+    def handle(self, request):
+        self.requests += 1
+        response = {"id": request["id"]} if "id" in request else {}
+        op = self.ops.get(request.get("op"))
+        try:
+            if op is None:
+                raise SessionError(f"unknown op '{request.get('op')}'")
+            response.update(op(request))
+            response["ok"] = True
+        except SessionError as e:
+            response.update(ok=False, error=str(e))
+        except Exception as e:
+            # 검사하지 못한 입력이 연결을 끊지 않게: 요청 하나만 실패시킨다
+            print(f"Error handling request {request.get('op')!r}: {e!r}")
+            response.update(ok=False, error="internal error")
+        return response
+
+    def session(self, request):
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise SessionError(f"unknown session '{request.get('session')}'")
+        return session
+
+    def add_session(self):
+        if len(self.sessions) >= self.max_sessions:
+            raise SessionError("too many sessions")
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = session = StorySession(self.story)
+        return session_id, session
+
+    def op_new(self, request):
+        scene = request.get("scene")
+        if not isinstance(scene, str):
+            raise SessionError("'scene' is required")
+        stats = check_stats(request.get("stats"))
+        session_id, session = self.add_session()
+        try:
+            session.stats.update(stats)
+            event = session.start(scene)
+        except Exception:
+            del self.sessions[session_id]
+            raise
+        return {"session": session_id, "event": event}
+
+    def op_step(self, request):
+        return {"event": self.session(request).step()}
+
+    def op_choose(self, request):
+        return {"event": self.session(request).choose(request.get("option"))}
+
+    def op_save(self, request):
+        return {"state": self.session(request).get_state()}
+
+    def op_load(self, request):
+        state = check_state(request.get("state"), self.story)
+        session_id, session = self.add_session()
+        try:
+            session.set_state(state)
+            event = session.step()
+        except Exception:
+            del self.sessions[session_id]
+            raise
+        return {"session": session_id, "event": event}
+
+    def op_close(self, request):
+        self.session(request)
+        del self.sessions[request["session"]]
+        return {}
+
+    def op_stats(self, request):
+        sample = list(self.sessions.values())[:100]
+        state_bytes = statistics.mean(deep_sizeof(s.get_state()) for s in sample) if sample else 0
+        return {
+            "sessions": len(self.sessions),
+            "requests": self.requests,
+            "uptime": round(time.perf_counter() - self.started, 3),
+            "scenes": len(self.story.scenes),
+            "state_bytes": round(state_bytes),
+        }
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # 한 줄이 StreamReader 한도(64 KiB)를 넘었다: 줄 경계를 잃었으므로 알리고 끊는다
+                    response = {"ok": False, "error": "request line too long"}
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be an object")
+                except ValueError as e:
+                    response = {"ok": False, "error": f"bad request: {e}"}
+                else:
+                    response = self.handle(request)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        if path:
+            return await asyncio.start_unix_server(self.handle_client, path=path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+# ====================================================================
+# 부하 생성기
+# ====================================================================
+class Client:
+    """One connection; requests are answered in order, so one in flight at a time"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = []
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **request):
+        started = time.perf_counter()
+        self.writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.append(time.perf_counter() - started)
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def drive(client, sessions, steps, scenes, rng):
+    """Play sessions interleaved on one connection: new, then steps of step/choose, save+load once"""
+    players = []
+    errors = 0
+    for _ in range(sessions):
+        response = await client.request(op="new", scene=rng.choice(scenes))
+        if not response["ok"]:
+            errors += 1
+            continue
+        players.append([response["session"], response["event"]])
+    for turn in range(steps):
+        for player in players:
+            session, event = player
+            if event["type"] == "choice" and event["options"]:
+                response = await client.request(op="choose", session=session, option=rng.randrange(len(event["options"])))
+            elif event["type"] == "end":
+                await client.request(op="close", session=session)
+                response = await client.request(op="new", scene=rng.choice(scenes))
+                player[0] = response.get("session", session)
+            elif turn == steps // 2:
+                response = saved = await client.request(op="save", session=session)
+                if saved["ok"]:
+                    await client.request(op="close", session=session)
+                    response = await client.request(op="load", state=saved["state"])
+                    player[0] = response.get("session", session)
+            else:
+                response = await client.request(op="step", session=session)
+            if not response["ok"]:
+                errors += 1
+                continue
+            player[1] = response["event"]
+    return errors
+
+
+async def loadgen(scenes, sessions, connections, steps, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    """sessions players starting in random scenes, spread over connections; latency per request"""
+    rng = random.Random(0)
+    clients = [await Client.connect(host, port, path) for _ in range(connections)]
+    try:
+        per_client = [sessions // connections + (i < sessions % connections) for i in range(connections)]
+        started = time.perf_counter()
+        errors = await asyncio.gather(*(
+            drive(client, count, steps, scenes, random.Random(rng.random()))
+            for client, count in zip(clients, per_client)
+        ))
+        elapsed = time.perf_counter() - started
+        stats = await clients[0].request(op="stats")
+    finally:
+        for client in clients:
+            await client.close()
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    return {
+        "sessions": sessions,
+        "connections": connections,
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3) if latencies else 0.0,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 3) if latencies else 0.0,
+        "server": stats,
+    }
+
+
+async def run_loadgen(args):
+    """Load generator against --connect, or an in-process server on a generated story"""
+    from benchmark import SIZES, generate_story, quiet
+
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        return await loadgen(args.scenes.split(","), args.sessions, args.connections, args.steps, host, int(port))
+    size = SIZES["quick" if args.quick else "full"]
+    directory = tempfile.mkdtemp(prefix="kvn_server_")
+    try:
+        with open(os.path.join(directory, "story.txt"), 'w', encoding='utf-8') as f:
+            f.write(generate_story(size["scenes"], size["lines"], size["choices"]))
+        with quiet():
+            story = Story(directory)
+        server = StoryServer(story)
+        listener = await server.start(DEFAULT_HOST, 0)
+        port = listener.sockets[0].getsockname()[1]
+        scenes = [f"@scene_{i}" for i in range(size["scenes"])]
+        try:
+            return await loadgen(scenes, args.sessions, args.connections, args.steps, DEFAULT_HOST, port)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+async def serve(args):
+    story = Story(args.scripts)
+    server = StoryServer(story, args.max_sessions)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {len(story.scenes)} scene(s) on {where}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multi-session story server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--unix", help="listen on a unix socket instead of TCP")
+    serve_parser.add_argument("--scripts", default=SCRIPT_DIR)
+    serve_parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    load_parser = commands.add_parser("loadgen")
+    load_parser.add_argument("--sessions", type=int, default=2000)
+    load_parser.add_argument("--connections", type=int, default=64)
+    load_parser.add_argument("--steps", type=int, default=20)
+    load_parser.add_argument("--quick", action="store_true", help="smaller generated story")
+    load_parser.add_argument("--connect", help="host:port of a running server instead of an in-process one")
+    load_parser.add_argument("--scenes", help="comma-separated start scenes (required with --connect)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.connect and not args.scenes:
+        parser.error("--connect needs --scenes (start scenes in the server's story)")
+    result = asyncio.run(run_loadgen(args))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
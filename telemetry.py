@@ -0,0 +1,206 @@
+"""Local play telemetry: events buffered in memory, written to SQLite on a background thread.
+
+    python telemetry.py [data/telemetry.db]     # route popularity and session report
+
+record() only appends a tuple to a deque; serialization and the batched
+INSERT transactions happen on the writer thread.
+"""
+import collections
+import json
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+TELEMETRY_PATH = "data/telemetry.db"
+FLUSH_SECONDS = 2.0
+BATCH_SIZE = 1000
+MAX_PENDING = 100000
+FRAME_SAMPLE_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    session TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    scene TEXT,
+    name TEXT,
+    value REAL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_kind ON events (kind, scene);
+"""
+
+
+class Telemetry:
+    """Event kinds: session_start, session_end (value = seconds), scene, choice
+    (name = target), stat (name, value = change), end, frame (value = frame ms)"""
+
+    def __init__(self, path=TELEMETRY_PATH, flush_seconds=FLUSH_SECONDS, session=None):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.session = session or uuid.uuid4().hex
+        # 쓰기 스레드가 멈춰도 메모리가 끝없이 늘지 않게 (가장 오래된 것부터 버린다)
+        self.queue = collections.deque(maxlen=MAX_PENDING)
+        self.started = time.time()
+        self.frame_clock = 0.0
+        self.wakeup = threading.Event()
+        self.closed = False
+        self.writer = threading.Thread(target=self.write_loop, name="kvn-telemetry", daemon=True)
+        self.writer.start()
+        self.record("session_start")
+
+    def record(self, kind, scene=None, name=None, value=None, data=None):
+        # 프레임 스레드: deque.append만 (스레드 안전, 디스크 쓰기 없음)
+        self.queue.append((self.session, time.time(), kind, scene, name, value, data))
+
+    def sample_frame(self, dt):
+        """Keep one frame time (seconds) per FRAME_SAMPLE_SECONDS of play"""
+        self.frame_clock += dt
+        if self.frame_clock >= FRAME_SAMPLE_SECONDS:
+            self.frame_clock = 0.0
+            self.record("frame", value=dt * 1000)
+
+    def write_loop(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.executescript(SCHEMA)
+            while True:
+                self.wakeup.wait(self.flush_seconds)
+                self.wakeup.clear()
+                closing = self.closed
+                self.write_batches(connection)
+                if closing:
+                    break
+        except sqlite3.Error as e:
+            print(f"Error writing telemetry '{self.path}': {e}")
+        finally:
+            connection.close()
+
+    def write_batches(self, connection):
+        queue = self.queue
+        while queue:
+            batch = []
+            marker = None
+            while queue and len(batch) < BATCH_SIZE:
+                row = queue.popleft()
+                if isinstance(row, threading.Event):
+                    # flush()가 넣은 표시: 여기까지 커밋하고 알린다
+                    marker = row
+                    break
+                if row[6] is not None:
+                    row = row[:6] + (json.dumps(row[6], ensure_ascii=False),)
+                batch.append(row)
+            if batch:
+                with connection:
+                    connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            if marker is not None:
+                marker.set()
+
+    def flush(self, timeout=5.0):
+        """Wait until everything recorded so far is on disk"""
+        if not self.writer.is_alive():
+            return False
+        marker = threading.Event()
+        self.queue.append(marker)
+        self.wakeup.set()
+        return marker.wait(timeout)
+
+    def close(self, timeout=5.0):
+        if self.closed:
+            return
+        self.record("session_end", value=time.time() - self.started)
+        self.closed = True
+        self.wakeup.set()
+        self.writer.join(timeout)
+
+
+# ====================================================================
+# 집계
+# ====================================================================
+def connect(path=TELEMETRY_PATH):
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def route_popularity(connection, scene=None):
+    """[(scene, target, count, share of that scene's choices)] most taken first"""
+    query = """
+        SELECT scene, name, COUNT(*) AS taken,
+               COUNT(*) * 1.0 / SUM(COUNT(*)) OVER (PARTITION BY scene)
+        FROM events WHERE kind = 'choice' {where}
+        GROUP BY scene, name ORDER BY scene, taken DESC
+    """
+    if scene is None:
+        return connection.execute(query.format(where="")).fetchall()
+    return connection.execute(query.format(where="AND scene = ?"), (scene,)).fetchall()
+
+
+def scene_reach(connection):
+    """[(scene, sessions that entered it, total entries)]"""
+    return connection.execute("""
+        SELECT scene, COUNT(DISTINCT session), COUNT(*)
+        FROM events WHERE kind = 'scene'
+        GROUP BY scene ORDER BY COUNT(DISTINCT session) DESC
+    """).fetchall()
+
+
+def endings(connection):
+    """[(scene the story ended in, sessions)]"""
+    return connection.execute("""
+        SELECT scene, COUNT(DISTINCT session)
+        FROM events WHERE kind = 'end'
+        GROUP BY scene ORDER BY COUNT(DISTINCT session) DESC
+    """).fetchall()
+
+
+def stat_totals(connection):
+    return connection.execute("""
+        SELECT name, SUM(value), COUNT(*) FROM events WHERE kind = 'stat' GROUP BY name ORDER BY name
+    """).fetchall()
+
+
+def session_summary(connection):
+    sessions, average, longest = connection.execute("""
+        SELECT COUNT(*), AVG(value), MAX(value) FROM events WHERE kind = 'session_end'
+    """).fetchone()
+    frames = [row[0] for row in connection.execute(
+        "SELECT value FROM events WHERE kind = 'frame' ORDER BY value")]
+    return {
+        "sessions": sessions,
+        "average_seconds": round(average or 0.0, 1),
+        "longest_seconds": round(longest or 0.0, 1),
+        "frame_samples": len(frames),
+        "frame_p50_ms": round(frames[len(frames) // 2], 2) if frames else None,
+        "frame_p99_ms": round(frames[int(len(frames) * 0.99)], 2) if frames else None,
+    }
+
+
+def report(path=TELEMETRY_PATH):
+    try:
+        connection = connect(path)
+    except sqlite3.OperationalError as e:
+        print(f"Error opening telemetry '{path}': {e}")
+        return
+    try:
+        print(json.dumps(session_summary(connection), ensure_ascii=False))
+        print("routes:")
+        for scene, target, taken, share in route_popularity(connection):
+            print(f"  {scene} -> {target}: {taken} ({share:.0%})")
+        print("scenes:")
+        for scene, sessions, entries in scene_reach(connection):
+            print(f"  {scene}: {sessions} session(s), {entries} entries")
+        print("endings:")
+        for scene, sessions in endings(connection):
+            print(f"  {scene}: {sessions} session(s)")
+        print("stats:")
+        for name, total, changes in stat_totals(connection):
+            print(f"  {name}: {total:+g} over {changes} change(s)")
+    except sqlite3.Error as e:
+        print(f"Error reading telemetry '{path}': {e}")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    report(sys.argv[1] if len(sys.argv) > 1 else TELEMETRY_PATH)
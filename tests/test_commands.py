@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from commands import CommandError, CommandRegistry, Param, registry  # noqa: E402
+
+
+def command(name, *args):
+    return {'type': 'command', 'command': name, 'args': list(args), 'transition': None}
+
+
+def test_arguments_are_coerced_to_their_kinds():
+    compiled = registry.compile(command("stat", "예술", "3"))
+    assert compiled['args'] == ["예술", 3]
+    assert compiled['checked']
+    assert registry.compile(command("wait", "0.5"))['args'] == [0.5]
+    assert registry.compile(command("goto", "home"))['args'] == ["@home"]
+
+
+def test_defaults_and_transition():
+    assert registry.compile(command("wait"))['args'] == [1.0]
+    compiled = registry.compile(command("remove", "haram", "fade"))
+    assert compiled['args'] == ["haram"]
+    assert compiled['transition'] == "fade"
+
+
+def test_bad_number_is_an_error():
+    with pytest.raises(CommandError) as error:
+        registry.compile(command("stat", "예술", "많이"))
+    assert error.value.severity == "error"
+    assert "'value' must be int" in str(error.value)
+    with pytest.raises(CommandError):
+        registry.compile(command("wait", "soon"))
+
+
+def test_argument_count_and_unknown_command():
+    with pytest.raises(CommandError, match="takes stat stat value"):
+        registry.compile(command("stat", "예술"))
+    with pytest.raises(CommandError, match="takes"):
+        registry.compile(command("end", "now"))
+    with pytest.raises(CommandError, match="unknown command"):
+        registry.compile(command("dance"))
+
+
+def test_missing_asset_is_a_warning():
+    with pytest.raises(CommandError) as error:
+        registry.compile(command("bg", "no_such_background.png"))
+    assert error.value.severity == "warning"
+    warnings = []
+    compiled = registry.compile(command("bg", "no_such_background.png"), warnings)
+    assert compiled['args'] == ["no_such_background.png"]
+    assert len(warnings) == 1
+
+
+def test_variadic_and_project_command():
+    commands = CommandRegistry()
+    calls = []
+    commands.register("shake", [Param("seconds", "float", 0.5), Param("axes", "int", variadic=True)],
+                      handler=lambda game, seconds, axes: calls.append((seconds, axes)))
+    compiled = commands.compile(command("shake", "2", "1", "0"))
+    assert compiled['args'] == [2.0, [1, 0]]
+    commands.dispatch(None, compiled)
+    assert calls == [(2.0, [1, 0])]
+    with pytest.raises(CommandError):
+        commands.compile(command("shake", "2", "x"))
@@ -0,0 +1,74 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dialogue_rules import DialogueIndex  # noqa: E402
+
+CHARACTERS = [
+    {"name": "유하람", "dialogues": [
+        {"id": "hello", "text": "안녕!"},
+        {"id": "morning", "text": "좋은 아침!", "conditions": {"day": {"min": 2}}},
+        {"id": "friend", "text": "반가워!", "priority": 5, "conditions": {"likability": {"min": 10}}},
+        {"id": "secret", "text": "비밀이야.", "priority": 9, "once": True,
+         "conditions": {"likability": {"min": 30}, "day": {"max": 3}}},
+    ]},
+    {"name": "김민지", "dialogues": [
+        {"id": "hi", "text": "어, 왔어?"},
+    ]},
+]
+
+
+def test_conditions_filter_lines():
+    index = DialogueIndex(CHARACTERS)
+    assert index.select("유하람", {"day": 1}, mark_used=False)["id"] == "hello"
+    # 조건이 더 많은(구체적인) 대사가 앞선다
+    assert index.select("유하람", {"day": 2}, mark_used=False)["id"] == "morning"
+    assert index.select("김민지", {"day": 5}, mark_used=False)["id"] == "hi"
+    assert index.select("없는 사람", {"day": 1}) is None
+
+
+def test_priority_beats_unseen():
+    index = DialogueIndex(CHARACTERS)
+    conditions = {"day": 2, "likability": 10}
+    assert [index.select("유하람", conditions)["id"] for _ in range(3)] == ["friend"] * 3
+
+
+def test_unseen_breaks_ties_within_a_priority():
+    index = DialogueIndex(CHARACTERS)
+    conditions = {"day": 2}
+    assert [index.select("유하람", conditions)["id"] for _ in range(3)] == ["morning", "hello", "morning"]
+
+
+def test_once_lines_and_bounds():
+    index = DialogueIndex(CHARACTERS)
+    assert index.select("유하람", {"day": 4, "likability": 30})["id"] == "friend"
+    assert index.select("유하람", {"day": 3, "likability": 30})["id"] == "secret"
+    assert index.select("유하람", {"day": 3, "likability": 30})["id"] == "friend"
+
+
+def test_used_ids_round_trip():
+    index = DialogueIndex(CHARACTERS)
+    index.select("유하람", {"day": 3, "likability": 30})
+    index.select("김민지", {})
+    saved = index.used_ids()
+    restored = DialogueIndex(CHARACTERS)
+    restored.restore_used(saved)
+    assert restored.used_ids() == saved
+    assert restored.select("유하람", {"day": 3, "likability": 30})["id"] == "friend"
+
+
+def test_shared_ids_are_kept_per_speaker():
+    characters = [
+        {"name": "유하람", "dialogues": [{"id": "hello", "text": "안녕!"}]},
+        {"name": "김민지", "dialogues": [{"id": "hello", "text": "어, 왔어?"}]},
+    ]
+    index = DialogueIndex(characters)
+    assert index.select("유하람", {})["text"] == "안녕!"
+    assert index.select("김민지", {})["text"] == "어, 왔어?"
+    assert index.used_ids() == [["유하람", "hello"], ["김민지", "hello"]]
+
+    restored = DialogueIndex(characters)
+    restored.restore_used([["김민지", "hello"]])
+    assert restored.used_ids() == [["김민지", "hello"]]
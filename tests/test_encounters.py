@@ -0,0 +1,44 @@
+import collections
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from encounters import AliasTable, EncounterEngine  # noqa: E402
+
+
+def test_alias_table_matches_weights():
+    weights = [1, 2, 3, 4, 0]
+    table = AliasTable(weights)
+    rng = random.Random(0)
+    samples = 100000
+    counts = collections.Counter(table.sample(rng) for _ in range(samples))
+    assert counts[4] == 0
+    for i, weight in enumerate(weights[:4]):
+        assert abs(counts[i] / samples - weight / sum(weights)) < 0.01
+
+
+def test_alias_table_single_entry():
+    table = AliasTable([5])
+    rng = random.Random(1)
+    assert {table.sample(rng) for _ in range(100)} == {0}
+
+
+def test_roll_respects_location_day_stats_and_cooldown():
+    engine = EncounterEngine([
+        {"scene": "@library_talk", "location": "library", "min_day": 2},
+        {"scene": "@gym_talk", "location": "gym", "stats": {"체육": 3}, "cooldown": 100},
+    ], chance=1.0, seed=0)
+    assert engine.roll({}, 1, "library") is None
+    assert engine.roll({}, 2, "library") == "@library_talk"
+    assert engine.roll({"체육": 2}, 5, "gym") is None
+    assert engine.roll({"체육": 3}, 5, "gym") == "@gym_talk"
+    assert engine.roll({"체육": 3}, 6, "gym") is None
+
+
+def test_restrict_skips_unknown_scenes():
+    engine = EncounterEngine([{"scene": "@a"}, {"scene": "@missing"}], chance=1.0, seed=0)
+    engine.restrict({"@a"})
+    assert {engine.roll({}, 1) for _ in range(20)} == {"@a"}
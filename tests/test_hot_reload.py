@@ -0,0 +1,41 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import hot_reload  # noqa: E402
+
+
+class QueueWatcher:
+    def __init__(self):
+        self.queue = set()
+
+    def poll(self):
+        changed, self.queue = self.queue, set()
+        return changed
+
+    def close(self):
+        pass
+
+
+class DataGame:
+    def __init__(self):
+        self.reloaded = []
+
+    def reload_data(self, path):
+        self.reloaded.append(path)
+
+
+def test_play_data_is_not_reloaded(monkeypatch):
+    monkeypatch.setattr(hot_reload, "SETTLE_SECONDS", 0)
+    game, watcher = DataGame(), QueueWatcher()
+    reloader = hot_reload.HotReloader(game, watcher)
+    watcher.queue = {
+        "data/saved_data.json", "data/saved_data.json.tmp", "data/telemetry.db",
+        "data/telemetry.db-journal", "data/telemetry.db-wal", "data/map.json",
+    }
+    assert reloader.poll() == {"data/map.json"}
+    assert game.reloaded == ["data/map.json"]
+    watcher.queue = {"data/telemetry.db-shm"}
+    assert reloader.poll() == set()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytest  # noqa: E402
+
+from i18n import Catalog, compile_catalog  # noqa: E402
+
+
+def test_catalog_lookup():
+    messages = {f"문장 {i}": f"sentence {i}" for i in range(200)}
+    messages["새 게임"] = "New Game"
+    messages["번역 안 됨"] = ""
+    catalog = Catalog(compile_catalog(messages))
+    assert catalog.get("새 게임") == "New Game"
+    for i in range(200):
+        assert catalog.get(f"문장 {i}") == f"sentence {i}"
+    # 빈 번역은 싣지 않는다: 원문을 그대로 쓴다
+    assert catalog.get("번역 안 됨") is None
+    assert catalog.get("없는 문장") is None
+
+
+def test_empty_catalog():
+    catalog = Catalog(compile_catalog({}))
+    assert catalog.get("새 게임") is None
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        Catalog(b"NOPE" + bytes(8))
@@ -0,0 +1,118 @@
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from incremental import ScriptDocument  # noqa: E402
+from vn_compiler import VnCompiler  # noqa: E402
+
+SCRIPT = """@start:
+$: 아침이다.
+유하람: 안녕! (haram_01)
+choice:
+    도서관에 간다 -> @library:
+    체육관에 간다 (체육 3) -> @home:
+@library:
+$: 조용하다.
+stat 예술 2
+goto @home
+@home:
+$: 하루가 끝났다.
+"""
+
+# 통째로 넣으면 문법이 맞는 줄들
+LINES = [
+    "", "$: 새 줄\n", "@extra:\n$: 추가\n", "유하람: 응?\n", "wait 1\n",
+    "goto @start\n", "choice:\n    간다 -> @home:\n", "stat 운 1\n",
+]
+# 아무 데나 넣으면 대개 문법 오류를 만드는 조각
+FRAGMENTS = LINES + ["\n", "@extra:\n", "x", "하", ":", "->"]
+
+
+def position(text, offset):
+    """1-based (line, column) of offset in text"""
+    line = text.count('\n', 0, offset) + 1
+    column = offset - (text.rfind('\n', 0, offset) + 1) + 1
+    return line, column
+
+
+def line_offset(text, line):
+    """Offset of the start of 1-based line (one past the end for the line after the last newline)"""
+    offset = 0
+    for _ in range(line - 1):
+        offset = text.index('\n', offset) + 1
+    return offset
+
+
+def full_compile(text):
+    compiler = VnCompiler(verbose=False)
+    return compiler.compile(text), compiler.errors
+
+
+def test_append_at_end_of_document():
+    document = ScriptDocument('@a:\n$: hi\n')
+    document.apply_edit(3, 1, 3, 1, '$: more\n')
+    assert document.text == '@a:\n$: hi\n$: more\n'
+    assert document.ast == full_compile('@a:\n$: hi\n$: more\n')[0]
+
+
+def test_edit_into_empty_document():
+    document = ScriptDocument('')
+    document.apply_edit(1, 1, 1, 1, '@a:\n$: hi\n')
+    assert document.ast == full_compile('@a:\n$: hi\n')[0]
+
+
+def check(document, text):
+    # 블록 단위로 다시 읽은 결과는 처음부터 읽은 문서와 같아야 한다
+    fresh = ScriptDocument(text)
+    assert document.text == fresh.text
+    assert document.ast == fresh.ast
+    assert document.diagnostics == fresh.diagnostics
+    # 오류가 없으면 전체 컴파일과도 같다 (오류가 있으면 블록별로 복구한다)
+    scenes, errors = full_compile(text)
+    if errors:
+        assert document.diagnostics
+    else:
+        assert document.ast == scenes, text
+    return not errors
+
+
+def test_random_line_edits_match_full_compile():
+    rng = random.Random(3)
+    text = SCRIPT
+    document = ScriptDocument(text)
+    valid = 0
+    for _ in range(300):
+        # 첫 장면 머리줄은 남기고 줄 단위로 바꾼다 (문서 끝 다음 줄 포함)
+        lines = text.count('\n')
+        first = rng.randrange(2, lines + 2)
+        last = min(lines + 1, first + rng.choice([0, 0, 1, 2]))
+        new_text = rng.choice(LINES)
+        document.apply_edit(first, 1, last, 1, new_text)
+        start, end = line_offset(text, first), line_offset(text, last)
+        old_text, text = text[start:end], text[:start] + new_text + text[end:]
+        if check(document, text):
+            valid += 1
+            continue
+        # 선택지 안에 끼워 넣는 등 문법이 깨지면 되돌리는 편집을 한다
+        (end_line, end_column) = position(text, start + len(new_text))
+        document.apply_edit(first, 1, end_line, end_column, old_text)
+        text = text[:start] + old_text + text[start + len(new_text):]
+        assert check(document, text)
+    assert valid > 100
+
+
+def test_random_edits_match_fresh_parse():
+    rng = random.Random(7)
+    text = SCRIPT
+    document = ScriptDocument(text)
+    for _ in range(300):
+        start = rng.randrange(len(text) + 1)
+        end = min(len(text), start + rng.choice([0, 0, 1, 3, 12]))
+        new_text = rng.choice(FRAGMENTS)
+        (start_line, start_column), (end_line, end_column) = position(text, start), position(text, end)
+        document.apply_edit(start_line, start_column, end_line, end_column, new_text)
+        text = text[:start] + new_text + text[end:]
+        check(document, text)
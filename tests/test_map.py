@@ -0,0 +1,41 @@
+import json
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+
+def test_maps_do_not_share_loaded_data():
+    a = main.Map(random.Random(1))
+    placed = {s["name"]: list(s["pos"]) for s in a.structures}
+    b = main.Map(random.Random(2))
+    assert a.structures is not b.structures
+    assert a.tiles is not b.tiles
+    assert {s["name"]: list(s["pos"]) for s in a.structures} == placed
+    for structure in a.structures:
+        assert a.structure_at[tuple(structure["pos"])] is structure
+    b.set_tile(0, 0, 99)
+    assert not a.tiles or not a.tiles[0] or a.tiles[0][0] != 99
+
+
+def test_structures_and_start_are_reachable(tmp_path):
+    # 가운데 세로 물줄기가 지도를 둘로 나눈다: 왼쪽 3칸만 걸을 수 있는 덩어리
+    width, height = 8, 4
+    tiles = [[3 if x == 3 or (x < 3 and y > 0) else 0 for x in range(width)] for y in range(height)]
+    tiles_file = tmp_path / "tiles.json"
+    tiles_file.write_text(json.dumps({"tiles": tiles}), encoding="utf-8")
+    map_file = tmp_path / "map.json"
+    map_file.write_text(json.dumps({"width": width, "height": height, "structures": [
+        {"name": f"s{i}"} for i in range(3)]}), encoding="utf-8")
+    for seed in range(30):
+        tile_map = main.Map(random.Random(seed), str(map_file), str(tiles_file))
+        assert tiles[tile_map.y][tile_map.x] != 3
+        for structure in tile_map.structure_place:
+            assert tile_map.pathfinder.find_path((tile_map.x, tile_map.y), structure["pos"]) is not None
@@ -0,0 +1,48 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resource_pack import ResourceLoader, ResourcePack, build_pack  # noqa: E402
+
+
+def test_pack_round_trip(tmp_path):
+    files = {
+        "data/story.json": ('{"name": "유하람", "lines": [' + ", ".join(['"안녕"'] * 50) + ']}').encode("utf-8"),
+        "data/sub/notes.txt": b"plain text",
+        "assets/image/bg.png": bytes(range(256)) * 4,
+        "data/saved_data.json": b"{}",
+        "data/telemetry.db-journal": b"x",
+        "data/skip.txt": b"left out",
+    }
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        index = build_pack("game.pack", ["assets", "data"], exclude={"data/skip.txt"})
+        pack = ResourcePack("game.pack")
+        try:
+            assert sorted(pack.index) == sorted(index) == ["assets/image/bg.png", "data/story.json",
+                                                           "data/sub/notes.txt"]
+            for name in index:
+                assert bytes(pack.read(name)) == files[name]
+                assert pack.verify(name)
+            # PNG는 그대로, 텍스트는 줄어들면 zlib
+            assert pack.index["assets/image/bg.png"][3] is None
+            assert pack.index["data/story.json"][3] == "zlib"
+            assert "data/./story.json" in pack
+        finally:
+            pack.close()
+
+        loader = ResourceLoader("game.pack")
+        os.remove("data/story.json")
+        assert loader.load_json("data/story.json")["name"] == "유하람"
+        assert loader.read_text("data/skip.txt") == "left out"
+        assert not loader.exists("data/missing.txt")
+        loader.pack.close()
+    finally:
+        os.chdir(cwd)
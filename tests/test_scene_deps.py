@@ -0,0 +1,26 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scene_deps import build_manifest, missing_references  # noqa: E402
+from story import Story  # noqa: E402
+
+
+def test_broken_script_is_reported(tmp_path):
+    (tmp_path / "good.txt").write_text("@good:\n$: 안녕\n", encoding="utf-8")
+    (tmp_path / "broken.txt").write_text("@broken:\nchoice:\n$: 선택지가 없다\n", encoding="utf-8")
+    story = Story(str(tmp_path))
+    assert "good" in story.scenes and "broken" not in story.scenes
+    missing = missing_references(build_manifest(story, sprites={}))
+    broken = os.path.join(str(tmp_path), "broken.txt")
+    assert list(missing) == [f"script:{broken}"]
+    assert missing[f"script:{broken}"][0].startswith("3:")
+
+    # 고치면 오류 목록에서 빠진다
+    (tmp_path / "broken.txt").write_text("@broken:\n$: 고쳤다\n", encoding="utf-8")
+    story.load_file(broken)
+    assert missing_references(build_manifest(story, sprites={})) == {}
@@ -0,0 +1,51 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from search_index import SearchIndex  # noqa: E402
+
+
+def utter(speaker, text):
+    return {'type': 'utter', 'speaker': speaker, 'utter': text, 'dubbing': None}
+
+
+SCENES = [
+    {'name': '@start', 'components': [
+        utter("유하람", "같이 도서관에 가자!"),
+        utter("", "Library is Quiet today."),
+        {'type': 'choice', 'options': [{'text': '도서관에 간다', 'condition': None, 'target': '@library'}]},
+    ]},
+    {'name': '@library', 'components': [utter("김민지", "도서관은   조용해야 해.")]},
+]
+
+
+def test_search_finds_substrings():
+    index = SearchIndex()
+    index.update_file("a.txt", SCENES)
+    assert [(entry.scene, entry.index) for entry in index.search("도서관")] == [
+        ("start", 0), ("start", 2), ("library", 0)]
+    assert [entry.speaker for entry in index.search("도서관", speaker="유하람")] == ["유하람"]
+    assert len(index.search("도서관", limit=2)) == 2
+    # 한 글자, 대소문자, 띄어쓰기
+    assert len(index.search("관")) == 3
+    assert [entry.index for entry in index.search("QUIET")] == [1]
+    assert [entry.scene for entry in index.search("조용해야 해")] == ["library"]
+    assert [entry.index for entry in index.search("is")] == [1]
+    assert index.search("도서실") == []
+    assert index.search("   ") == []
+
+
+def test_update_and_remove_file():
+    index = SearchIndex()
+    index.update_file("a.txt", SCENES)
+    index.update_file("b.txt", [{'name': '@b', 'components': [utter("", "도서관 앞")]}])
+    assert len(index.search("도서관")) == 4
+    index.update_file("a.txt", SCENES[1:])
+    assert len(index.search("도서관")) == 2
+    index.remove_file("a.txt")
+    index.remove_file("b.txt")
+    assert index.search("도서관") == []
+    assert index.postings == {}
+    assert index.matches("앞") == set()
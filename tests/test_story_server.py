@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from story import Story  # noqa: E402
+from story_server import SessionError, StorySession, StoryServer  # noqa: E402
+
+SCRIPT = """@start:
+bg school.png
+유하람: 안녕!
+stat 체육 2
+choice:
+    도서관 -> @library:
+    체육관 (체육 3) -> @gym:
+@library:
+$: 조용하다.
+goto @home
+@gym:
+$: 땀이 난다.
+@home:
+$: 하루가 끝났다.
+end
+"""
+
+
+@pytest.fixture
+def story(tmp_path):
+    (tmp_path / "story.txt").write_text(SCRIPT, encoding="utf-8")
+    return Story(str(tmp_path))
+
+
+def test_step_choose_to_the_end(story):
+    session = StorySession(story)
+    event = session.start("@start")
+    assert event["type"] == "line" and event["text"] == "안녕!"
+    assert event["effects"][0]["command"] == "bg"
+    event = session.step()
+    # 체육이 2라 조건 선택지는 보이지 않는다
+    assert event == {"type": "choice", "options": ["도서관"], "effects": []}
+    assert session.stats["체육"] == 2
+    assert session.choose(0)["text"] == "조용하다."
+    assert session.step()["text"] == "하루가 끝났다."
+    assert session.step()["type"] == "end"
+
+
+def test_conditional_option_and_bad_choice(story):
+    session = StorySession(story, {"체육": 1})
+    session.start("@start")
+    assert session.step()["options"] == ["도서관", "체육관"]
+    with pytest.raises(SessionError):
+        session.choose(2)
+    with pytest.raises(SessionError):
+        session.choose(True)
+    assert session.choose(1)["text"] == "땀이 난다."
+
+
+def test_save_and_load_at_a_choice(story):
+    session = StorySession(story)
+    session.start("@start")
+    session.step()
+    state = session.get_state()
+    assert state["choice"]
+    restored = StorySession(story)
+    restored.set_state(state)
+    assert restored.step()["options"] == ["도서관"]
+    assert restored.stats == session.stats
+
+
+def test_server_rejects_bad_input_without_leaking_sessions(story):
+    server = StoryServer(story)
+    assert not server.handle({"op": "new"})["ok"]
+    assert not server.handle({"op": "new", "scene": "@nowhere"})["ok"]
+    assert not server.handle({"op": "new", "scene": "@start", "stats": {"체육": "lots"}})["ok"]
+    assert not server.handle({"op": "load", "state": {"scene": "@start", "index": 99}})["ok"]
+    assert not server.handle({"op": "load", "state": []})["ok"]
+    assert server.sessions == {}
+
+    response = server.handle({"op": "new", "scene": "@start", "id": 7})
+    assert response["ok"] and response["id"] == 7
+    saved = server.handle({"op": "save", "session": response["session"]})["state"]
+    loaded = server.handle({"op": "load", "state": saved})
+    assert loaded["ok"] and loaded["event"]["type"] == "choice"
+    assert len(server.sessions) == 2
+
+
+def test_overlong_request_line_gets_an_error(story):
+    async def exchange():
+        server = StoryServer(story)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            writer.write(b'{"op": "stats", "pad": "' + b"x" * 70000 + b'"}\n')
+            await writer.drain()
+            return await reader.readline(), await reader.readline()
+        finally:
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+
+    response, after = asyncio.run(exchange())
+    assert json.loads(response) == {"ok": False, "error": "request line too long"}
+    assert after == b""
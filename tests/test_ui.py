@@ -0,0 +1,41 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame  # noqa: E402
+
+from ui import Label, Theme  # noqa: E402
+
+TEXT = "가나다 라마바 사아자 차카타\n파하 가나다라마바사 아자"
+
+
+def visible(lines, count):
+    """Text a wrapped label shows with count characters revealed"""
+    shown = []
+    for line, dropped, covered in lines:
+        if count <= 0:
+            break
+        shown.append(line[:count - dropped])
+        count -= covered
+    return "".join(shown)
+
+
+def test_wrapped_lines_keep_source_offsets():
+    pygame.init()
+    label = Label(Theme(), "defaults", wrap=True)
+    font = label.theme.font(label.style)
+    dropped_spaces = 0
+    for width in range(20, 300, 3):
+        label.wrapped = None
+        lines = label.wrap_lines(font, width, TEXT)
+        dropped_spaces += sum(dropped for _, dropped, _ in lines)
+        assert sum(covered for _, _, covered in lines) == len(TEXT)
+        for count in range(len(TEXT) + 1):
+            # 타자 효과로 count 글자가 나왔으면 원문 앞 count 글자만 보인다
+            expected = TEXT[:count].replace("\n", "").replace(" ", "")
+            assert visible(lines, count).replace(" ", "") == expected
+    assert dropped_spaces
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import pygame
+
+from resource_pack import resources
+
+TILE_SIZE = 32
+CHUNK_TILES = 16
+CHUNK_CACHE_SIZE = 48
+
+# tile.png가 없거나 비어 있을 때 쓰는 타일 색
+FALLBACK_TILE_COLORS = [(74, 124, 89), (96, 140, 96), (140, 120, 90), (70, 110, 160)]
+STRUCTURE_COLOR = (200, 170, 90)
+PLAYER_COLOR = (240, 240, 240)
+
+
+class TileSet:
+    """Tile images cut from a horizontal strip of TILE_SIZE squares"""
+
+    def __init__(self, filename="assets/image/maps/tile.png"):
+        self.filename = filename
+        self.tiles = []
+        try:
+            strip = resources.load_image(filename)
+            for x in range(0, strip.get_width() - TILE_SIZE + 1, TILE_SIZE):
+                self.tiles.append(strip.subsurface((x, 0, TILE_SIZE, TILE_SIZE)).copy())
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading tile image '{filename}': {e}")
+        if not self.tiles:
+            for color in FALLBACK_TILE_COLORS:
+                tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+                tile.fill(color)
+                pygame.draw.rect(tile, [max(0, c - 20) for c in color], tile.get_rect(), 1)
+                self.tiles.append(tile)
+
+    def get(self, tile_id):
+        return self.tiles[tile_id % len(self.tiles)]
+
+
+class ChunkedTileRenderer:
+    """Pre-renders CHUNK_TILES x CHUNK_TILES blocks of the map and blits only the visible ones"""
+
+    def __init__(self, tile_map, tileset=None, cache_size=CHUNK_CACHE_SIZE):
+        self.map = tile_map
+        self.tileset = tileset or TileSet()
+        self.cache_size = cache_size
+        self.chunks = OrderedDict()
+        self.chunk_px = TILE_SIZE * CHUNK_TILES
+
+    def chunk_of(self, x, y):
+        return x // CHUNK_TILES, y // CHUNK_TILES
+
+    def invalidate_tile(self, x, y):
+        self.chunks.pop(self.chunk_of(x, y), None)
+
+    def invalidate_all(self):
+        self.chunks.clear()
+
+    def build_chunk(self, cx, cy):
+        x0, y0 = cx * CHUNK_TILES, cy * CHUNK_TILES
+        x1 = min(x0 + CHUNK_TILES, self.map.width)
+        y1 = min(y0 + CHUNK_TILES, self.map.height)
+        surface = pygame.Surface(((x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        tiles = self.map.tiles
+        sequence = []
+        for y in range(y0, y1):
+            row = tiles[y] if y < len(tiles) else ()
+            for x in range(x0, x1):
+                tile_id = row[x] if x < len(row) else 0
+                sequence.append((self.tileset.get(tile_id), ((x - x0) * TILE_SIZE, (y - y0) * TILE_SIZE)))
+        surface.blits(sequence, doreturn=False)
+
+        for (x, y), structure in self.map.structure_at.items():
+            if x0 <= x < x1 and y0 <= y < y1:
+                rect = pygame.Rect((x - x0) * TILE_SIZE, (y - y0) * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                pygame.draw.rect(surface, STRUCTURE_COLOR, rect.inflate(-6, -6))
+        return surface
+
+    def get_chunk(self, cx, cy):
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.build_chunk(cx, cy)
+            self.chunks[key] = chunk
+            # 오래 보이지 않은 청크부터 버린다
+            while len(self.chunks) > self.cache_size:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def camera(self, view_width, view_height):
+        """Top-left pixel of a viewport centred on the player, clamped to the map"""
+        map_px_w = self.map.width * TILE_SIZE
+        map_px_h = self.map.height * TILE_SIZE
+        cam_x = self.map.x * TILE_SIZE + TILE_SIZE // 2 - view_width // 2
+        cam_y = self.map.y * TILE_SIZE + TILE_SIZE // 2 - view_height // 2
+        cam_x = max(0, min(cam_x, map_px_w - view_width)) if map_px_w > view_width else (map_px_w - view_width) // 2
+        cam_y = max(0, min(cam_y, map_px_h - view_height)) if map_px_h > view_height else (map_px_h - view_height) // 2
+        return cam_x, cam_y
+
+    def render(self, surface):
+        view_width, view_height = surface.get_size()
+        cam_x, cam_y = self.camera(view_width, view_height)
+        chunks_w = -(-self.map.width // CHUNK_TILES)
+        chunks_h = -(-self.map.height // CHUNK_TILES)
+        first_cx = max(0, cam_x // self.chunk_px)
+        first_cy = max(0, cam_y // self.chunk_px)
+        last_cx = min(chunks_w - 1, (cam_x + view_width - 1) // self.chunk_px)
+        last_cy = min(chunks_h - 1, (cam_y + view_height - 1) // self.chunk_px)
+
+        sequence = []
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                sequence.append((self.get_chunk(cx, cy), (cx * self.chunk_px - cam_x, cy * self.chunk_px - cam_y)))
+        surface.blits(sequence, doreturn=False)
+
+        player_center = (self.map.x * TILE_SIZE + TILE_SIZE // 2 - cam_x,
+                         self.map.y * TILE_SIZE + TILE_SIZE // 2 - cam_y)
+        pygame.draw.circle(surface, PLAYER_COLOR, player_center, TILE_SIZE // 3)
+
+    def screen_to_tile(self, pos, view_size):
+        """Tile under a screen position, or None outside the map"""
+        cam_x, cam_y = self.camera(*view_size)
+        x = (pos[0] + cam_x) // TILE_SIZE
+        y = (pos[1] + cam_y) // TILE_SIZE
+        if 0 <= x < self.map.width and 0 <= y < self.map.height:
+            return x, y
+        return None
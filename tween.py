@@ -0,0 +1,266 @@
+import math
+import weakref
+
+import pygame
+
+from memory_budget import budget, surface_bytes
+
+ALPHA_STEPS = 16
+TRANSITION_SECONDS = 0.5
+
+
+def ease_linear(t):
+    return t
+
+
+def ease_in_out(t):
+    return 0.5 - math.cos(math.pi * t) / 2
+
+
+EASINGS = {
+    "linear": ease_linear,
+    "ease_in_out": ease_in_out,
+}
+
+
+class AlphaVariants:
+    """Surfaces pre-faded to ALPHA_STEPS levels so a fade never touches pixels per frame.
+
+    Shared by the tweens fading the same image; counted in the "surface"
+    budget until the last of them finishes.
+    """
+
+    def __init__(self, image, steps=ALPHA_STEPS):
+        self.image = image
+        self.steps = steps
+        self.users = 0
+        self.variants = [None] * (steps + 1)
+        self.variants[steps] = image
+        # 불투명한 이미지는 surface alpha만으로 페이드되므로 사본을 만들지 않는다 (view)
+        self.per_pixel = bool(image.get_flags() & pygame.SRCALPHA)
+        if self.per_pixel:
+            for level in range(steps):
+                faded = image.copy()
+                alpha = round(255 * level / steps)
+                faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                self.variants[level] = faded
+        self.nbytes = sum(surface_bytes(faded) for faded in self.variants[:steps] if faded is not None)
+
+    def view(self):
+        """Per-tween surface for opaque images: shares the pixels, has its own surface alpha"""
+        if self.per_pixel:
+            return None
+        return self.image.subsurface(self.image.get_rect())
+
+    def get(self, alpha, view=None):
+        """Return the variant closest to alpha (0.0 - 1.0); view is the caller's own view()"""
+        level = min(self.steps, max(0, round(alpha * self.steps)))
+        if level == self.steps:
+            return self.image
+        if self.per_pixel:
+            return self.variants[level]
+        view.set_alpha(round(255 * level / self.steps))
+        return view
+
+
+class ScaleVariants:
+    """Smoothscaled copies of one surface at fixed scale steps, built once per zoom"""
+
+    def __init__(self, image, start, end, steps=ALPHA_STEPS):
+        self.steps = steps
+        self.variants = []
+        width, height = image.get_size()
+        for level in range(steps + 1):
+            scale = start + (end - start) * level / steps
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            self.variants.append(pygame.transform.smoothscale(image, size))
+        self.nbytes = sum(surface_bytes(scaled) for scaled in self.variants)
+
+    def get(self, progress):
+        level = min(self.steps, max(0, round(progress * self.steps)))
+        return self.variants[level]
+
+
+# 같은 이미지로 동시에 여러 전환이 돌아도 변형은 한 번만 만든다
+_alpha_cache = weakref.WeakKeyDictionary()
+
+
+def acquire_alpha_variants(image):
+    variants = _alpha_cache.get(image)
+    if variants is None:
+        variants = AlphaVariants(image)
+        _alpha_cache[image] = variants
+        # 전환 중에만 쓰이므로 고정하고, 끝나면 release_alpha_variants가 뺀다
+        budget.register("surface", ("alpha", id(variants)), variants.nbytes, pinned=True)
+    variants.users += 1
+    return variants
+
+
+def release_alpha_variants(variants):
+    variants.users -= 1
+    if variants.users > 0:
+        return
+    if _alpha_cache.get(variants.image) is variants:
+        del _alpha_cache[variants.image]
+    budget.release("surface", ("alpha", id(variants)))
+
+
+class Tween:
+    def __init__(self, duration=TRANSITION_SECONDS, easing="ease_in_out", on_finish=None):
+        self.duration = max(duration, 1e-6)
+        self.easing = EASINGS[easing]
+        self.on_finish = on_finish
+        self.elapsed = 0.0
+        self.started = False
+
+    @property
+    def progress(self):
+        return self.easing(min(1.0, self.elapsed / self.duration))
+
+    @property
+    def done(self):
+        return self.elapsed >= self.duration
+
+    def release(self):
+        """Called once when the scheduler drops the tween: give back cached variants"""
+
+    def update(self, dt):
+        # 추가된 프레임의 dt는 유휴 대기 시간일 수 있으므로 건너뛴다
+        if not self.started:
+            self.started = True
+            return
+        self.elapsed += dt
+
+    def blits(self, image, rect):
+        """Return the (surface, rect) pairs to draw this frame in place of image"""
+        return [(image, rect)]
+
+
+class FadeTween(Tween):
+    def __init__(self, image, fade_in=True, **kwargs):
+        super().__init__(**kwargs)
+        self.variants = acquire_alpha_variants(image)
+        self.view = self.variants.view()
+        self.fade_in = fade_in
+
+    def release(self):
+        release_alpha_variants(self.variants)
+
+    def blits(self, image, rect):
+        alpha = self.progress if self.fade_in else 1.0 - self.progress
+        return [(self.variants.get(alpha, self.view), rect)]
+
+
+class DissolveTween(Tween):
+    def __init__(self, old_image, old_rect, new_image, **kwargs):
+        super().__init__(**kwargs)
+        self.old_rect = old_rect
+        self.old_variants = acquire_alpha_variants(old_image)
+        self.new_variants = acquire_alpha_variants(new_image)
+        self.old_view = self.old_variants.view()
+        self.new_view = self.new_variants.view()
+        self.old_opaque = not self.old_variants.per_pixel
+
+    def release(self):
+        release_alpha_variants(self.old_variants)
+        release_alpha_variants(self.new_variants)
+
+    def blits(self, image, rect):
+        progress = self.progress
+        # 불투명한 이전 이미지는 그대로 깔고 새 이미지만 덮는다
+        old_alpha = 1.0 if self.old_opaque else 1.0 - progress
+        return [
+            (self.old_variants.get(old_alpha, self.old_view), self.old_rect),
+            (self.new_variants.get(progress, self.new_view), rect),
+        ]
+
+
+class MoveTween(Tween):
+    def __init__(self, start, **kwargs):
+        super().__init__(**kwargs)
+        self.start = start
+
+    def blits(self, image, rect):
+        progress = self.progress
+        x = round(self.start[0] + (rect.x - self.start[0]) * progress)
+        y = round(self.start[1] + (rect.y - self.start[1]) * progress)
+        return [(image, rect.move(x - rect.x, y - rect.y))]
+
+
+class ZoomTween(Tween):
+    def __init__(self, image, start_scale, end_scale=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.variants = ScaleVariants(image, start_scale, end_scale)
+        budget.register("surface", ("zoom", id(self)), self.variants.nbytes, pinned=True)
+
+    def release(self):
+        budget.release("surface", ("zoom", id(self)))
+        self.variants = None
+
+    def blits(self, image, rect):
+        scaled = self.variants.get(self.progress)
+        return [(scaled, scaled.get_rect(center=rect.center))]
+
+
+class TweenScheduler:
+    """Drives tweens by frame time; each layer key holds at most one tween"""
+
+    def __init__(self):
+        self.tweens = {}
+        # 제거 중인 오브젝트: 페이드아웃이 끝날 때까지 따로 그린다
+        self.ghosts = {}
+
+    def add(self, key, tween):
+        self.finish(key)
+        self.tweens[key] = tween
+
+    def add_ghost(self, key, image, rect, tween):
+        self.finish(key)
+        self.ghosts[key] = (image, rect, tween)
+
+    def finish(self, key):
+        """Jump an active tween on key to its end state"""
+        tween = self.tweens.pop(key, None)
+        if tween is None:
+            ghost = self.ghosts.pop(key, None)
+            tween = ghost[2] if ghost else None
+        if tween is None:
+            return
+        tween.release()
+        if tween.on_finish:
+            tween.on_finish()
+
+    def clear(self):
+        """Drop every tween without running its on_finish"""
+        for tween in list(self.tweens.values()) + [ghost[2] for ghost in self.ghosts.values()]:
+            tween.release()
+        self.tweens.clear()
+        self.ghosts.clear()
+
+    def is_active(self):
+        return bool(self.tweens or self.ghosts)
+
+    def update(self, dt):
+        for key, tween in list(self.tweens.items()):
+            tween.update(dt)
+            if tween.done:
+                self.finish(key)
+        for key, (image, rect, tween) in list(self.ghosts.items()):
+            tween.update(dt)
+            if tween.done:
+                self.finish(key)
+
+    def blits(self, key, image, rect):
+        tween = self.tweens.get(key)
+        if tween is None:
+            return [(image, rect)]
+        return tween.blits(image, rect)
+
+    def compose(self, layers):
+        """Build one blit sequence for (key, image, rect) layers plus fading-out ghosts"""
+        sequence = []
+        for key, image, rect in layers:
+            sequence.extend(self.blits(key, image, rect))
+        for image, rect, tween in self.ghosts.values():
+            sequence.extend(tween.blits(image, rect))
+        return sequence
@@ -1,30 +1,510 @@
+from typing import NamedTuple, Optional
+
 from config import *
 import pygame
 
-class DialogRenderer:
-    def __init__(self, screen, x_res = width, y_res = height):
+from i18n import _, translator
+from memory_budget import budget, FONT_ESTIMATE
+from resource_pack import resources
+
+THEME_PATH = "data/themes/theme.json"
+CHARS_PER_SECOND = 40
+
+
+def parse_colour(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return tuple(pygame.Color(value))
+    return tuple(value)
+
+
+class Style(NamedTuple):
+    """Fully resolved, immutable style for one theme element"""
+    font_name: str
+    font_size: int
+    bold: bool
+    italic: bool
+    text_colour: tuple
+    bg_colour: Optional[tuple]
+    hovered_bg_colour: Optional[tuple]
+    border_colour: Optional[tuple]
+    padding: int
+
+
+class Theme:
+    """Resolves theme.json elements against defaults once and caches styles and fonts"""
+
+    def __init__(self, filename=THEME_PATH):
+        try:
+            self.data = resources.load_json(filename)
+        except FileNotFoundError:
+            print(f"Error: Theme file not found at {filename}")
+            self.data = {}
+        self.styles = {}
+        self.fonts = {}
+
+    def style(self, element):
+        style = self.styles.get(element)
+        if style is None:
+            defaults = self.data.get("defaults", {})
+            data = self.data.get(element, {})
+            font = {**defaults.get("font", {}), **data.get("font", {})}
+            colours = {**defaults.get("colours", {}), **data.get("colours", {})}
+            misc = {**defaults.get("misc", {}), **data.get("misc", {})}
+            font_style = font.get("style", "regular")
+            style = Style(
+                font_name=font.get("name", "Malgun Gothic"),
+                font_size=int(font.get("point_size", 14)),
+                bold="bold" in font_style,
+                italic="italic" in font_style,
+                text_colour=parse_colour(colours.get("normal_text", "#FFFFFF")),
+                bg_colour=parse_colour(colours.get("normal_bg")),
+                hovered_bg_colour=parse_colour(colours.get("hovered_bg")),
+                border_colour=parse_colour(colours.get("normal_border")),
+                padding=int(misc.get("padding", 0)),
+            )
+            self.styles[element] = style
+        return style
+
+    def font(self, style):
+        key = (style.font_name, style.font_size, style.bold, style.italic)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(style.font_name, style.font_size, style.bold, style.italic)
+            self.fonts[key] = font
+            budget.register("font", (id(self), key), FONT_ESTIMATE, lambda: self.fonts.pop(key, None))
+        else:
+            budget.touch("font", (id(self), key))
+        return font
+
+
+class Widget:
+    """Retained node: keeps its rendered surface until it or a child is invalidated"""
+
+    # True면 캐시 없이 매 프레임 대상 화면에 직접 그린다 (맵, 연출 레이어)
+    volatile = False
+
+    def __init__(self, theme, element="defaults"):
+        self.theme = theme
+        self.style = theme.style(element)
+        self.parent = None
+        self.children = []
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.dirty = True
+        self.child_dirty = False
+        self.layout_dirty = True
+        self.own_surface = None
+        self.surface = None
+
+    def add(self, child):
+        child.parent = self
+        self.children.append(child)
+        self.invalidate_layout()
+        return child
+
+    def invalidate(self):
+        """Content changed: redraw this widget and recompose its ancestors"""
+        self.dirty = True
+        parent = self.parent
+        while parent is not None and not parent.child_dirty:
+            parent.child_dirty = True
+            parent = parent.parent
+
+    def invalidate_layout(self):
+        self.layout_dirty = True
+        self.invalidate()
+
+    def layout(self, rect):
+        rect = pygame.Rect(rect)
+        if not self.layout_dirty and rect == self.rect:
+            return
+        if rect.size != self.rect.size:
+            self.dirty = True
+        self.rect = rect
+        self.arrange()
+        self.layout_dirty = False
+
+    def arrange(self):
+        """Place children inside self.rect (local coordinates); default stacks them"""
+        for child in self.children:
+            child.layout(child.rect)
+
+    def draw(self, surface):
+        style = self.style
+        if style.bg_colour:
+            surface.fill(style.bg_colour)
+        if style.border_colour:
+            pygame.draw.rect(surface, style.border_colour, surface.get_rect(), 1)
+
+    def get_surface(self):
+        if self.layout_dirty:
+            self.layout(self.rect)
+        if self.dirty:
+            self.own_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            self.draw(self.own_surface)
+        if self.dirty or self.child_dirty:
+            self.surface = self.own_surface.copy()
+            self.surface.blits([(child.get_surface(), child.rect) for child in self.children], doreturn=False)
+            self.dirty = False
+            self.child_dirty = False
+        return self.surface
+
+    def render(self, target, offset=(0, 0)):
+        position = (self.rect.x + offset[0], self.rect.y + offset[1])
+        if self.volatile:
+            self.draw(target)
+            for child in self.children:
+                child.render(target, position)
+        else:
+            target.blit(self.get_surface(), position)
+
+    def handle_event(self, event):
+        for child in reversed(self.children):
+            if child.handle_event(event):
+                return True
+        return False
+
+    def update(self, dt):
+        for child in self.children:
+            child.update(dt)
+
+    def is_animating(self):
+        return any(child.is_animating() for child in self.children)
+
+    def absolute_rect(self):
+        rect = self.rect.copy()
+        parent = self.parent
+        while parent is not None:
+            rect.move_ip(parent.rect.topleft)
+            parent = parent.parent
+        return rect
+
+
+class Root(Widget):
+    """Top of a screen's widget tree; draws nothing itself"""
+    volatile = True
+
+    def draw(self, surface):
+        pass
+
+
+class Label(Widget):
+    def __init__(self, theme, element, text="", align="center", wrap=False, localized=False):
+        super().__init__(theme, element)
+        self.text = text
+        self.align = align
+        self.wrap = wrap
+        self.visible_chars = None
+        self.wrapped = None
+        # 번역 대상이면 언어가 바뀔 때 이 라벨만 다시 그린다
+        self.localized = localized
+        if localized:
+            translator.add_listener(self)
+
+    def display_text(self):
+        return _(self.text) if self.localized else self.text
+
+    def set_text(self, text, visible_chars=None):
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+        if visible_chars != self.visible_chars:
+            self.visible_chars = visible_chars
+            self.invalidate()
+
+    def wrap_lines(self, font, width, text):
+        """Greedy per-character wrap (Hangul has no reliable break points); cached per text.
+
+        Returns (line, dropped, covered) so offsets into text are kept: the
+        space dropped at a wrap and the newline ending a paragraph count toward
+        the characters of text the line covers.
+        """
+        if self.wrapped is not None and self.wrapped[:2] == (width, text):
+            return self.wrapped[2]
+        lines = []
+        paragraphs = text.split("\n")
+        for number, paragraph in enumerate(paragraphs):
+            line, start, dropped = "", 0, 0
+            for i, char in enumerate(paragraph):
+                if line and font.size(line + char)[0] > width:
+                    lines.append((line, dropped, i - start))
+                    line, start = char.lstrip(), i
+                    # 줄바꿈한 자리의 공백은 줄 앞에 그리지 않는다
+                    dropped = len(char) - len(line)
+                else:
+                    line += char
+            newline = 1 if number < len(paragraphs) - 1 else 0
+            lines.append((line, dropped, len(paragraph) - start + newline))
+        self.wrapped = (width, text, lines)
+        return lines
+
+    def draw(self, surface):
+        super().draw(surface)
+        font = self.theme.font(self.style)
+        padding = self.style.padding
+        text = self.display_text()
+        if not self.wrap:
+            text_surf = font.render(text, True, self.style.text_colour)
+            if self.align == "left":
+                text_rect = text_surf.get_rect(midleft=(padding, surface.get_height() // 2))
+            else:
+                text_rect = text_surf.get_rect(center=surface.get_rect().center)
+            surface.blit(text_surf, text_rect)
+            return
+        remaining = len(text) if self.visible_chars is None else self.visible_chars
+        y = padding
+        for line, dropped, covered in self.wrap_lines(font, surface.get_width() - padding * 2, text):
+            if remaining <= 0:
+                break
+            # 글자 수는 원문 기준: 줄 앞에서 뺀 공백도 타자 효과의 한 글자다
+            surface.blit(font.render(line[:remaining - dropped], True, self.style.text_colour), (padding, y))
+            remaining -= covered
+            y += font.get_linesize()
+
+
+class ImageWidget(Widget):
+    def __init__(self, theme, image, element="defaults"):
+        super().__init__(theme, element)
+        self.image = image
+
+    def set_image(self, image):
+        self.image = image
+        self.invalidate()
+
+    def draw(self, surface):
+        if self.image is not None:
+            surface.blit(self.image, self.image.get_rect(center=surface.get_rect().center))
+
+
+class ButtonWidget(Label):
+    def __init__(self, theme, text, callback=None, element="button"):
+        super().__init__(theme, element, text, localized=True)
+        self.callback = callback
+        self.hovered = False
+
+    def draw(self, surface):
+        if self.hovered and self.style.hovered_bg_colour:
+            surface.fill(self.style.hovered_bg_colour)
+            font = self.theme.font(self.style)
+            text_surf = font.render(self.display_text(), True, self.style.text_colour)
+            surface.blit(text_surf, text_surf.get_rect(center=surface.get_rect().center))
+        else:
+            super().draw(surface)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            hovered = self.absolute_rect().collidepoint(event.pos)
+            if hovered != self.hovered:
+                self.hovered = hovered
+                self.invalidate()
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.absolute_rect().collidepoint(event.pos):
+                if self.callback:
+                    self.callback()
+                return True
+        return False
+
+
+class DialogRenderer(Widget):
+    """Dialogue box: speaker plate and typewriter text in the lower part of the screen"""
+
+    def __init__(self, screen, x_res = width, y_res = height, theme=None):
+        super().__init__(theme or Theme(), "text_box")
         self.screen = screen
         self.x_res = round(x_res/3)
         self.y_res = round(y_res*0.75)
-    def draw(self):
-        pass
+        self.speaker = self.add(Label(self.theme, "speaker", align="left"))
+        self.body = self.add(Label(self.theme, "text_box", wrap=True))
+        self.source = ("", "")
+        self.full_text = ""
+        self.revealed = 0.0
+        self.layout((0, self.y_res, x_res, y_res - self.y_res))
+        translator.add_callback(self.relocalize)
 
-class MenuManager:
-    def __init__(self):
-        pass
+    def arrange(self):
+        plate_height = self.theme.font(self.speaker.style).get_linesize() + self.speaker.style.padding * 2
+        self.speaker.layout((0, 0, self.x_res, plate_height))
+        self.body.layout((0, plate_height, self.rect.width, self.rect.height - plate_height))
 
-class CharacterRenderer:
-    def __init__(self):
-        pass
+    def set_line(self, speaker, text):
+        self.source = (speaker, text)
+        self.speaker.set_text(_(speaker))
+        self.full_text = _(text)
+        self.revealed = 0.0
+        self.body.set_text(self.full_text, 0)
+
+    def relocalize(self):
+        speaker, text = self.source
+        self.speaker.set_text(_(speaker))
+        self.full_text = _(text)
+        self.finish_line()
+
+    def finish_line(self):
+        self.revealed = len(self.full_text)
+        self.body.set_text(self.full_text, None)
+
+    def is_animating(self):
+        return self.revealed < len(self.full_text)
 
-class StateRenderer:
-    def __init__(self):
+    def update(self, dt):
+        if not self.is_animating():
+            return
+        self.revealed = min(len(self.full_text), self.revealed + dt * CHARS_PER_SECOND)
+        visible = int(self.revealed)
+        self.body.set_text(self.full_text, None if visible >= len(self.full_text) else visible)
+
+    def draw(self, surface):
+        # 배경은 본문 Label이 그린다
         pass
 
-class MapRenderer:
-    def __init__(self):
+
+class MenuManager(Widget):
+    """Vertical column of buttons centred on a point"""
+
+    def __init__(self, theme=None, center=(width // 2, height // 2), button_size=(200, 50), spacing=10):
+        super().__init__(theme or Theme(), "menu")
+        self.center = center
+        self.button_size = button_size
+        self.spacing = spacing
+        self.buttons = []
+
+    def add_button(self, text, callback):
+        button = self.add(ButtonWidget(self.theme, text, callback))
+        self.buttons.append(button)
+        self.invalidate_layout()
+        self.layout(self.rect)
+        return button
+
+    def clear(self):
+        for button in self.buttons:
+            self.children.remove(button)
+            button.parent = None
+        self.buttons = []
+        self.invalidate_layout()
+        self.layout(self.rect)
+
+    def arrange(self):
+        button_width, button_height = self.button_size
+        total_height = len(self.buttons) * button_height + max(0, len(self.buttons) - 1) * self.spacing
+        if self.rect.size != (button_width, total_height):
+            self.rect = pygame.Rect(0, 0, button_width, total_height)
+            self.rect.center = self.center
+            self.dirty = True
+        for i, button in enumerate(self.buttons):
+            button.layout((0, i * (button_height + self.spacing), button_width, button_height))
+
+    def draw(self, surface):
         pass
 
-class InputRenderer:
-    def __init__(self):
-        pass
\ No newline at end of file
+
+class CharacterRenderer(Widget):
+    """Background, ambient effects and placed objects; composed through the tween scheduler every frame"""
+    volatile = True
+
+    def __init__(self, theme=None, placed_objects=None, tweens=None, background_layer="__bg__", effects=None):
+        super().__init__(theme or Theme())
+        self.placed_objects = placed_objects if placed_objects is not None else {}
+        self.tweens = tweens
+        self.effects = effects
+        self.background = None
+        self.background_layer = background_layer
+
+    def draw(self, surface):
+        if self.background:
+            image, rect = self.background['image'], self.background['rect']
+            if self.tweens is None:
+                surface.blit(image, rect)
+            else:
+                surface.blits(self.tweens.blits(self.background_layer, image, rect), doreturn=False)
+        # 파티클은 배경과 캐릭터 사이에 그린다
+        if self.effects is not None:
+            self.effects.draw(surface)
+        layers = [(objname, obj['image'], obj['rect']) for objname, obj in self.placed_objects.items()]
+        if self.tweens is None:
+            surface.blits([(image, rect) for _, image, rect in layers], doreturn=False)
+        else:
+            surface.blits(self.tweens.compose(layers), doreturn=False)
+
+    def is_animating(self):
+        if self.effects is not None and self.effects.is_active():
+            return True
+        return self.tweens is not None and self.tweens.is_active()
+
+
+class StateRenderer(Widget):
+    """Stat panel; only the rows whose values changed are redrawn"""
+
+    def __init__(self, theme=None, origin=(10, 10), row_size=(180, 26)):
+        super().__init__(theme or Theme(), "stat_panel")
+        self.origin = origin
+        self.row_size = row_size
+        self.rows = {}
+        self.values = {}
+        translator.add_callback(self.relocalize)
+
+    def relocalize(self):
+        # 다음 set_values에서 모든 줄을 새 언어로 다시 쓴다
+        self.values.clear()
+
+    def set_values(self, values):
+        for name, value in values.items():
+            if self.values.get(name) == value:
+                continue
+            self.values[name] = value
+            row = self.rows.get(name)
+            if row is None:
+                row = self.add(Label(self.theme, "stat_row", align="left"))
+                self.rows[name] = row
+            row.set_text(f"{_(name)}  {value}")
+
+    def arrange(self):
+        row_width, row_height = self.row_size
+        size = (row_width, row_height * len(self.rows))
+        if self.rect.size != size:
+            self.rect = pygame.Rect(self.origin, size)
+            self.dirty = True
+        for i, row in enumerate(self.rows.values()):
+            row.layout((0, i * row_height, row_width, row_height))
+
+
+class MapRenderer(Widget):
+    """Tile map view; the chunk renderer already caches, so it draws straight to the screen"""
+    volatile = True
+
+    def __init__(self, theme=None, tile_map=None):
+        super().__init__(theme or Theme())
+        self.tile_map = tile_map
+
+    def draw(self, surface):
+        surface.fill((0, 0, 0))
+        if self.tile_map is not None:
+            self.tile_map.render(surface)
+
+
+class InputRenderer(Label):
+    """Single-line text entry"""
+
+    def __init__(self, theme=None, rect=(0, 0, 300, 40), on_submit=None, max_length=16):
+        theme = theme or Theme()
+        super().__init__(theme, "input", align="left")
+        self.on_submit = on_submit
+        self.max_length = max_length
+        self.value = ""
+        self.layout(rect)
+
+    def handle_event(self, event):
+        if event.type == pygame.TEXTINPUT:
+            if len(self.value) < self.max_length:
+                self.value = (self.value + event.text)[:self.max_length]
+                self.set_text(self.value)
+            return True
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_BACKSPACE:
+                self.value = self.value[:-1]
+                self.set_text(self.value)
+                return True
+            if event.key == pygame.K_RETURN and self.on_submit:
+                self.on_submit(self.value)
+                return True
+        return False
@@ -0,0 +1,21 @@
+import hashlib
+
+
+def fit_size(size, max_width, max_height):
+    """Largest size with the same aspect ratio that fits in max_width x max_height"""
+    original_width, original_height = size
+    scale_ratio = min(max_width / original_width, max_height / original_height)
+    return int(original_width * scale_ratio), int(original_height * scale_ratio)
+
+
+def file_hash(filename):
+    """sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def resolution_key(resolution):
+    return f"{resolution[0]}x{resolution[1]}"
@@ -0,0 +1,284 @@
+import re
+from typing import NamedTuple
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+from commands import CommandError, registry as default_registry
+
+COLON_AHEAD = re.compile(r'[ \t]*:')
+
+
+class Diagnostic(NamedTuple):
+    line: int
+    column: int
+    message: str
+    severity: str = "error"
+
+
+# ====================================================================
+# 스크립트 컴파일러
+# ====================================================================
+class VnCompiler:
+    tokens = (
+        'SCENE', 'ID', 'COLON', 'TEXT', 'LPAREN', 'RPAREN', 'ARROW',
+        'NARRATOR', 'CHOICE', 'COMMAND', 'EOL'
+    )
+
+    # 대사 본문은 줄 끝까지 TEXT로 읽는 전용 상태에서 처리한다
+    states = (
+        ('text', 'exclusive'),
+        ('dub', 'exclusive'),
+        ('args', 'exclusive'),
+    )
+
+    def t_SCENE(self, t):
+        r'@[a-zA-Z_][a-zA-Z0-9_]*:'
+        t.value = t.value[:-1]
+        return t
+
+    def t_CHOICE(self, t):
+        r'choice:'
+        return t
+
+    def t_NARRATOR(self, t):
+        r'\$:'
+        t.lexer.begin('text')
+        return t
+
+    def t_OPTION(self, t):
+        r'[^\s()\n:@][^()\n:]*?(?=[ \t]*(\([^)\n]*\))?[ \t]*->)'
+        # 선택지 줄: '->' 앞의 글자가 선택지 문구
+        t.type = 'TEXT'
+        t.value = t.value.strip()
+        return t
+
+    def t_ID(self, t):
+        r'-?[a-zA-Z0-9_가-힣][a-zA-Z0-9_./가-힣]*'
+        # 등록된 명령 이름이면 COMMAND (뒤에 ':'가 오면 같은 이름의 화자)
+        if t.value in self.registry and not COLON_AHEAD.match(t.lexer.lexdata, t.lexer.lexpos):
+            t.type = 'COMMAND'
+            # 명령 인자는 줄 끝(EOL)까지: 다음 줄의 화자 이름을 인자로 읽지 않는다
+            t.lexer.begin('args')
+        return t
+
+    def t_COLON(self, t):
+        r':'
+        t.lexer.begin('text')
+        return t
+
+    t_LPAREN = r'\('
+    t_RPAREN = r'\)'
+    t_ARROW = r'->'
+
+    t_ignore = ' \t'
+
+    def t_ignore_COMMENT(self, t):
+        r'\#.*'
+        pass
+
+    def t_newline(self, t):
+        r'\n+'
+        t.lexer.lineno += len(t.value)
+
+    def t_error(self, t):
+        self.report(t.lexer.lineno, t.lexpos, f"Illegal character '{t.value[0]}'")
+        t.lexer.skip(1)
+
+    def t_text_TEXT(self, t):
+        r'[^\n]+?(?=[ \t]*\([^()\n]*\)[ \t]*(\n|$)|[ \t]*(\n|$))'
+        t.value = t.value.strip()
+        # 줄 끝에 남은 (더빙) 부분은 dub 상태에서 토큰으로 나눈다
+        if t.lexer.lexdata[t.lexer.lexpos:t.lexer.lexpos + 1] != '\n':
+            t.lexer.begin('dub')
+        return t
+
+    t_text_ignore = ' \t'
+
+    def t_text_newline(self, t):
+        r'\n+'
+        t.lexer.lineno += len(t.value)
+        t.lexer.begin('INITIAL')
+
+    def t_text_error(self, t):
+        self.report(t.lexer.lineno, t.lexpos, f"Illegal character '{t.value[0]}'")
+        t.lexer.skip(1)
+
+    def t_dub_ID(self, t):
+        r'[a-zA-Z0-9_][a-zA-Z0-9_./]*'
+        return t
+
+    t_dub_LPAREN = r'\('
+    t_dub_RPAREN = r'\)'
+    t_dub_ignore = ' \t'
+
+    def t_dub_newline(self, t):
+        r'\n+'
+        t.lexer.lineno += len(t.value)
+        t.lexer.begin('INITIAL')
+
+    def t_dub_error(self, t):
+        self.report(t.lexer.lineno, t.lexpos, f"Illegal character '{t.value[0]}'")
+        t.lexer.skip(1)
+
+    def t_args_SCENE(self, t):
+        r'@[a-zA-Z_][a-zA-Z0-9_]*:?'
+        t.value = t.value.rstrip(':')
+        return t
+
+    def t_args_ID(self, t):
+        r'[a-zA-Z0-9_./가-힣-]+'
+        return t
+
+    t_args_ignore = ' \t'
+
+    def t_args_COMMENT(self, t):
+        r'\#.*'
+        pass
+
+    def t_args_EOL(self, t):
+        r'\n+'
+        t.lexer.lineno += len(t.value)
+        t.lexer.begin('INITIAL')
+        return t
+
+    def t_args_error(self, t):
+        self.report(t.lexer.lineno, t.lexpos, f"Illegal character '{t.value[0]}'")
+        t.lexer.skip(1)
+
+    def p_script(self, p):
+        'script : scenes'
+        p[0] = p[1]
+
+    def p_scenes_multiple(self, p):
+        'scenes : scenes scene'
+        p[0] = p[1] + [p[2]]
+
+    def p_scenes_single(self, p):
+        'scenes : scene'
+        p[0] = [p[1]]
+
+    def p_scene(self, p):
+        'scene : SCENE components'
+        p[0] = {'type': 'scene', 'name': p[1], 'components': p[2]}
+
+    def p_components_multiple(self, p):
+        'components : components component'
+        p[0] = p[1] + [p[2]]
+
+    def p_components_single(self, p):
+        'components : component'
+        p[0] = [p[1]]
+
+    def p_component(self, p):
+        '''component : dialogue
+                     | narration
+                     | command
+                     | choice'''
+        p[0] = p[1]
+
+    def p_dialogue_with_dub(self, p):
+        'dialogue : ID COLON TEXT LPAREN ID RPAREN'
+        p[0] = {'type': 'utter', 'speaker': p[1], 'utter': p[3], 'dubbing': p[5]}
+
+    def p_dialogue_no_dub(self, p):
+        'dialogue : ID COLON TEXT'
+        p[0] = {'type': 'utter', 'speaker': p[1], 'utter': p[3], 'dubbing': None}
+
+    def p_narration(self, p):
+        'narration : NARRATOR TEXT'
+        p[0] = {'type': 'utter', 'speaker': '', 'utter': p[2], 'dubbing': None}
+
+    def p_command_with_args(self, p):
+        'command : COMMAND args EOL'
+        p[0] = self.check_command(p, {'type': 'command', 'command': p[1], 'args': p[2]})
+
+    def p_command_bare(self, p):
+        'command : COMMAND EOL'
+        p[0] = self.check_command(p, {'type': 'command', 'command': p[1], 'args': []})
+
+    def p_command_goto(self, p):
+        'command : COMMAND SCENE EOL'
+        p[0] = self.check_command(p, {'type': 'command', 'command': p[1], 'args': [p[2]]})
+
+    def check_command(self, p, command):
+        """Validate and coerce arguments against the command registry once, at compile time"""
+        warnings = []
+        try:
+            command = self.registry.compile(command, warnings)
+        except CommandError as e:
+            self.report(p.lineno(1), p.lexpos(1), str(e))
+        for warning in warnings:
+            self.report(p.lineno(1), p.lexpos(1), warning, severity="warning")
+        return command
+
+    def p_args_multiple(self, p):
+        'args : args ID'
+        p[0] = p[1] + [p[2]]
+
+    def p_args_single(self, p):
+        'args : ID'
+        p[0] = [p[1]]
+
+    def p_choice(self, p):
+        'choice : CHOICE options'
+        p[0] = {'type': 'choice', 'options': p[2]}
+
+    def p_options_multiple(self, p):
+        'options : options option'
+        p[0] = p[1] + [p[2]]
+
+    def p_options_single(self, p):
+        'options : option'
+        p[0] = [p[1]]
+
+    def p_option_conditional(self, p):
+        'option : TEXT LPAREN ID ID RPAREN ARROW SCENE'
+        try:
+            value = int(p[4])
+        except ValueError:
+            value = p[4]
+        p[0] = {
+            'text': p[1],
+            'condition': {'stat': p[3], 'value': value},
+            'target': p[7]
+        }
+
+    def p_option_normal(self, p):
+        'option : TEXT ARROW SCENE'
+        p[0] = {'text': p[1], 'condition': None, 'target': p[3]}
+
+    def p_error(self, p):
+        if p:
+            self.report(p.lineno, p.lexpos, f"Syntax error at '{p.value}' (type: {p.type})")
+        else:
+            self.report(self.lexer.lineno, len(self.lexer.lexdata), "Syntax error at EOF")
+
+    def __init__(self, verbose=True, registry=None):
+        self.verbose = verbose
+        self.registry = registry or default_registry
+        self.diagnostics = []
+        self.lexer = lex.lex(module=self)
+        self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
+
+    def report(self, line, lexpos, message, severity="error"):
+        data = self.lexer.lexdata
+        column = lexpos - (data.rfind('\n', 0, lexpos) + 1) + 1
+        diagnostic = Diagnostic(line, column, message, severity)
+        self.diagnostics.append(diagnostic)
+        if self.verbose:
+            print(f"{message} on line {line}, column {column}")
+
+    @property
+    def errors(self):
+        return [diagnostic for diagnostic in self.diagnostics if diagnostic.severity == "error"]
+
+    def compile(self, script_text):
+        self.diagnostics = []
+        if not script_text.strip():
+            return []
+        if not script_text.endswith('\n'):
+            script_text += '\n'
+        self.lexer.lineno = 1
+        self.lexer.begin('INITIAL')
+        return self.parser.parse(script_text, lexer=self.lexer)